@@ -1,25 +1,3 @@
-from langgraph.graph import StateGraph
-from agent_service.agents.intent_agent import detect_intent
-from agent_service.agents.order_agent import handle_order
-
-def intent_node(state):
-    state["intent"] = detect_intent(state["query"])
-    return state
-
-def order_node(state):
-    state["result"] = handle_order(state["user_id"])
-    return state
-
-graph = StateGraph(dict)
-graph.add_node("intent", intent_node)
-graph.add_node("order", order_node)
-
-graph.set_entry_point("intent")
-graph.add_edge("intent", "order")
-
-agent_executor = graph.compile()
-
-# multiagent
 """
 agent_graph.py
 ---------------
@@ -28,9 +6,9 @@ Multi-agent workflow orchestrated using LangGraph.
 Agents included:
 ✔ Catalog Agent
 ✔ Order Agent
-✔ Return Agent
-✔ Cancel Agent
-✔ Pricing Agent (stub)
+✔ Return Agent (single line, or bulk when several orders are named)
+✔ Cancel Agent (single order, or bulk when several orders are named)
+✔ Pricing Agent (B2B quotes)
 ✔ Intent Classifier
 ✔ RAG Retriever
 
@@ -38,21 +16,26 @@ The graph determines which agent to call based on user intent
 and coordinates multi-step reasoning.
 """
 
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List
 from langgraph.graph import StateGraph, END
-from langchain_openai import ChatOpenAI
+from ai_service.llm_backend import chat_model, register_stub_responder
+from ai_service.call_policy import CallPolicy, fallback_llm, new_deadline, node_budget
+from ai_service.prompt_templates import PROMPTS
+from observability.tracer import TracedGraph, traced_node
 
 # Import agents
 from agents.catalog_agent import handle_catalog_query
 from agents.order_agent import handle_order_query
-from agents.return_agent import handle_return_request
-from agents.cancel_agent import handle_order_cancellation
+from agents.return_agent import handle_bulk_return_request, handle_return_request
+from agents.cancel_agent import handle_bulk_cancellation, handle_order_cancellation
+from agents.pricing_agent import handle_pricing_query
+from agents.entity_extractor import extract_entities, first_entity
 
 # LLM for intent detection
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0
-)
+llm = chat_model("gpt-4o-mini", temperature=0)
+llm_policy = CallPolicy("classify_intent", [llm, fallback_llm(0)])
+intent_prompt = PROMPTS.get("classify_intent")
 
 # -------------------------------------------
 # Define Shared State
@@ -62,38 +45,60 @@ class AgentState(Dict):
     Holds conversation state for multi-agent orchestration.
     """
     user_query: str
+    customer_id: str | None
     intent: str | None
     result: Dict[str, Any] | None
+    deadline_at: float | None
+    entities: List[Dict[str, Any]] | None
 
 
 # -------------------------------------------
 # Intent Classification Node
 # -------------------------------------------
+@traced_node("classify_intent")
 def classify_intent(state: AgentState):
     """
     Determine intent using LLM.
     """
 
-    prompt = f"""
-    User Query: "{state['user_query']}"
+    # Entities are extracted once here and reused by every agent node
+    state["entities"] = extract_entities(state["user_query"])
 
-    Identify the intent from categories:
-    - catalog_search
-    - order_status
-    - return_request
-    - order_cancellation
-    - pricing_query
-    - unknown
+    prompt = intent_prompt.format(user_query=state["user_query"])
 
-    Provide only the intent keyword.
-    """
+    # The request deadline starts here and is shared by every later node
+    state["deadline_at"] = state.get("deadline_at") or new_deadline()
 
-    intent = llm.invoke(prompt).content.strip()
+    with node_budget("classify_intent", state["deadline_at"]):
+        intent = llm_policy.invoke(
+            prompt,
+            renderer=lambda: keyword_intent(state["user_query"])
+        ).content.strip()
 
     state["intent"] = intent
     return state
 
 
+def keyword_intent(text: str) -> str:
+    """
+    Deterministic intent fallback used when the LLM misses its deadline.
+    """
+    text = text.lower()
+    if "cancel" in text:
+        return "order_cancellation"
+    if "return" in text or "refund" in text:
+        return "return_request"
+    if "price" in text or "quote" in text:
+        return "pricing_query"
+    if "order" in text or "track" in text:
+        return "order_status"
+    return "unknown"
+
+
+# The local stub backend answers intent prompts with the keyword intent
+register_stub_responder(intent_prompt.prefix, keyword_intent)
+
+
 # -------------------------------------------
 # Route Nodes (Decision Layer)
 # -------------------------------------------
@@ -107,30 +112,72 @@ def route_intent(state: AgentState):
 # -------------------------------------------
 # Agent Nodes
 # -------------------------------------------
+@traced_node("catalog_agent")
 def catalog_agent(state: AgentState):
-    state["result"] = handle_catalog_query(state["user_query"])
+    with node_budget("catalog_agent", state.get("deadline_at")):
+        state["result"] = handle_catalog_query(state["user_query"])
     return state
 
 
+@traced_node("order_agent")
 def order_agent(state: AgentState):
-    order_id = extract_order_id(state["user_query"])
-    state["result"] = handle_order_query(order_id)
+    order_id = extract_order_id(state)
+    if order_id is None:
+        state["result"] = missing_entity("order ID", "ORD1001")
+        return state
+    with node_budget("order_agent", state.get("deadline_at")):
+        state["result"] = handle_order_query(order_id)
     return state
 
 
+@traced_node("return_agent")
 def return_agent(state: AgentState):
-    order_id = extract_order_id(state["user_query"])
-    sku = extract_sku(state["user_query"])
-    state["result"] = handle_return_request(order_id, sku)
+    order_ids = extract_order_ids(state)
+    if len(order_ids) > 1:
+        # Several orders: one batched fetch, one bulk return request
+        with node_budget("return_agent", state.get("deadline_at")):
+            state["result"] = handle_bulk_return_request(order_ids, skus=extract_skus(state) or None)
+        return state
+
+    order_id = extract_order_id(state)
+    sku = extract_sku(state)
+    if order_id is None or sku is None:
+        state["result"] = missing_entity(
+            "order ID" if order_id is None else "product (SKU or name)",
+            "ORD1001" if order_id is None else "SKU1001"
+        )
+        return state
+    with node_budget("return_agent", state.get("deadline_at")):
+        state["result"] = handle_return_request(order_id, sku)
     return state
 
 
+@traced_node("cancel_agent")
 def cancel_agent(state: AgentState):
-    order_id = extract_order_id(state["user_query"])
-    state["result"] = handle_order_cancellation(order_id)
+    order_ids = extract_order_ids(state)
+    if len(order_ids) > 1:
+        with node_budget("cancel_agent", state.get("deadline_at")):
+            state["result"] = handle_bulk_cancellation(order_ids)
+        return state
+
+    order_id = extract_order_id(state)
+    if order_id is None:
+        state["result"] = missing_entity("order ID", "ORD1001")
+        return state
+    with node_budget("cancel_agent", state.get("deadline_at")):
+        state["result"] = handle_order_cancellation(order_id)
+    return state
+
+
+@traced_node("pricing_agent")
+def pricing_agent(state: AgentState):
+    state["result"] = handle_pricing_query(
+        state["user_query"], state.get("customer_id")
+    )
     return state
 
 
+@traced_node("unknown")
 def unknown_handler(state: AgentState):
     state["result"] = {
         "message": "I'm sorry, I couldn't understand your request."
@@ -139,24 +186,52 @@ def unknown_handler(state: AgentState):
 
 
 # -------------------------------------------
-# Helper Extraction Functions (Simplified)
+# Entity Helpers
 # -------------------------------------------
-def extract_order_id(text: str) -> str:
+def _entities(state: AgentState) -> List[Dict[str, Any]]:
+    if state.get("entities") is None:
+        state["entities"] = extract_entities(state["user_query"])
+    return state["entities"]
+
+
+def extract_order_id(state: AgentState) -> str | None:
+    """
+    First order ID mentioned in the query, if any.
+    """
+    entity = first_entity(_entities(state), "order_id")
+    return entity["value"] if entity else None
+
+
+def extract_order_ids(state: AgentState) -> List[str]:
+    """
+    Every distinct order ID mentioned in the query, in order.
+    """
+    return list(dict.fromkeys(e["value"] for e in _entities(state) if e["type"] == "order_id"))
+
+
+def extract_skus(state: AgentState) -> List[str]:
     """
-    Extract order ID from user text (dummy logic).
+    Every distinct SKU mentioned in the query (directly or by name).
     """
-    import re
-    match = re.search(r"ORD\d+", text.upper())
-    return match.group(0) if match else "ORD1001"
+    return list(dict.fromkeys(
+        e["ref"] or e["value"] for e in _entities(state) if e["type"] in ("sku", "product")
+    ))
 
 
-def extract_sku(text: str) -> str:
+def extract_sku(state: AgentState) -> str | None:
     """
-    Extract SKU from user text (dummy logic).
+    First SKU mentioned in the query, either directly or by product name.
     """
-    import re
-    match = re.search(r"SKU\d+", text.upper())
-    return match.group(0) if match else "SKU1001"
+    entity = first_entity(_entities(state), "sku", "product")
+    if entity is None:
+        return None
+    return entity["ref"] or entity["value"]
+
+
+def missing_entity(label: str, example: str) -> Dict[str, Any]:
+    return {
+        "message": f"Please provide the {label} (for example {example})."
+    }
 
 
 # -------------------------------------------
@@ -171,6 +246,7 @@ def build_agent_graph():
     workflow.add_node("order_agent", order_agent)
     workflow.add_node("return_agent", return_agent)
     workflow.add_node("cancel_agent", cancel_agent)
+    workflow.add_node("pricing_agent", pricing_agent)
     workflow.add_node("unknown", unknown_handler)
 
     # Entry Point
@@ -185,7 +261,7 @@ def build_agent_graph():
             "order_status": "order_agent",
             "return_request": "return_agent",
             "order_cancellation": "cancel_agent",
-            "pricing_query": "catalog_agent",  # placeholder
+            "pricing_query": "pricing_agent",
             "unknown": "unknown",
         }
     )
@@ -195,9 +271,19 @@ def build_agent_graph():
     workflow.add_edge("order_agent", END)
     workflow.add_edge("return_agent", END)
     workflow.add_edge("cancel_agent", END)
+    workflow.add_edge("pricing_agent", END)
     workflow.add_edge("unknown", END)
 
-    return workflow.compile()
+    return TracedGraph(workflow.compile())
+
+
+@lru_cache(maxsize=1)
+def get_agent_graph() -> TracedGraph:
+    """
+    The compiled graph shared by every request in this process (the
+    gateway's /chat; preloaded before fork by service/server.py).
+    """
+    return build_agent_graph()
 
 
 # -------------------------------------------
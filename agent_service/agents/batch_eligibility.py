@@ -0,0 +1,244 @@
+"""
+Batch Eligibility Engine
+------------------------
+Whole-order return and cancellation evaluation for multi-line B2B
+orders. Every line of one or many orders is checked in a single
+vectorized pass against the policy:
+
+✔ Status gates (returnable / cancellable order statuses)
+✔ Return window per category
+✔ Damage-only categories and B2B orders
+✔ Restocking fee and refund per line
+
+Policy decisions come from the compiled rule table
+(agents/policy_compiler.py). The agents then submit one bulk OMS request
+and render one consolidated summary instead of running once per line.
+
+Domain: eCommerce (B2C / B2B)
+"""
+
+import json
+import os
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from agents.policy_compiler import PolicyTable, load_policy_table
+from integration.circuit_breaker import SERVICE_LABELS, is_degraded
+
+PRODUCTS_PATH = os.getenv("PRODUCTS_PATH", "data/products.json")
+
+DAMAGE_REASONS = {"damaged", "defective"}
+
+# Decision reasons, in priority order
+REASON_ELIGIBLE = "eligible"
+REASON_STATUS = "status_not_eligible"
+REASON_NOT_DELIVERED = "not_delivered"
+REASON_DAMAGE_ONLY = "damage_only"
+REASON_WINDOW = "outside_return_window"
+
+
+class BatchEligibilityEngine:
+    def __init__(
+        self,
+        products: List[Dict[str, Any]],
+        policy: PolicyTable
+    ):
+        self.categories = {p["sku"]: p.get("category") for p in products}
+        self.policy = policy
+
+    @classmethod
+    def from_files(cls, products_path: str = PRODUCTS_PATH) -> "BatchEligibilityEngine":
+        with open(products_path) as f:
+            return cls(json.load(f), load_policy_table())
+
+    # -----------------------------
+    # Line flattening
+    # -----------------------------
+    def _flatten(self, orders: Iterable[Dict[str, Any]], skus: Optional[Iterable[str]] = None):
+        """
+        One Python pass turning nested orders into parallel columns.
+        """
+        wanted = set(skus) if skus else None
+        cols: Dict[str, List[Any]] = {
+            "order_id": [], "sku": [], "quantity": [], "price": [],
+            "status": [], "payment_status": [], "delivered_on": [], "category": [],
+        }
+        for order in orders:
+            delivered = order.get("delivery_date")
+            delivered_on = date.fromisoformat(delivered).toordinal() if delivered else -1
+            for item in order.get("items", []):
+                if wanted is not None and item["sku"] not in wanted:
+                    continue
+                cols["order_id"].append(order["order_id"])
+                cols["sku"].append(item["sku"])
+                cols["quantity"].append(item.get("quantity", 1))
+                cols["price"].append(item["price"])
+                cols["status"].append(order.get("status"))
+                cols["payment_status"].append(order.get("payment_status", "PAID"))
+                cols["delivered_on"].append(delivered_on)
+                cols["category"].append(self.categories.get(item["sku"]))
+        return cols
+
+    def _decisions(self, cols, tier: Optional[str]) -> List[Any]:
+        lookup = self.policy.lookup
+        return [
+            lookup(category, tier, status)
+            for category, status in zip(cols["category"], cols["status"])
+        ]
+
+    @staticmethod
+    def _summary(cols, eligible, reasons, refunds) -> Dict[str, Any]:
+        by_reason: Dict[str, int] = {}
+        for reason in reasons.tolist():
+            by_reason[reason] = by_reason.get(reason, 0) + 1
+
+        return {
+            "line_count": len(cols["sku"]),
+            "eligible_lines": int(eligible.sum()),
+            "refund_total": round(float(refunds.sum()), 2),
+            "by_reason": by_reason,
+            "lines": [
+                {
+                    "order_id": order_id,
+                    "sku": sku,
+                    "quantity": qty,
+                    "eligible": ok,
+                    "reason": reason,
+                    "refund_amount": refund,
+                }
+                for order_id, sku, qty, ok, reason, refund in zip(
+                    cols["order_id"], cols["sku"], cols["quantity"],
+                    eligible.tolist(), reasons.tolist(), refunds.tolist()
+                )
+            ],
+        }
+
+    # -----------------------------
+    # Returns
+    # -----------------------------
+    def evaluate_returns(
+        self,
+        orders: Iterable[Dict[str, Any]],
+        skus: Optional[Iterable[str]] = None,
+        reason: Optional[str] = None,
+        tier: Optional[str] = None,
+        on: Optional[date] = None
+    ) -> Dict[str, Any]:
+        cols = self._flatten(orders, skus)
+        today = (on or date.today()).toordinal()
+
+        rules = self._decisions(cols, tier)
+        status_ok = np.array([r["returnable"] for r in rules], dtype=bool)
+        window = np.array([r["return_window_days"] for r in rules], dtype=np.int64)
+        fee = np.array([r["restocking_fee_percent"] for r in rules], dtype=np.float64)
+        damage_only = np.array([r["damage_only"] for r in rules], dtype=bool)
+
+        price = np.array(cols["price"], dtype=np.float64)
+        qty = np.array(cols["quantity"], dtype=np.int64)
+        delivered_on = np.array(cols["delivered_on"], dtype=np.int64)
+
+        delivered = delivered_on >= 0
+        in_window = delivered & (today - delivered_on <= window)
+        damage_ok = ~damage_only | (reason in DAMAGE_REASONS)
+
+        reasons = np.select(
+            [~status_ok, ~delivered, ~damage_ok, ~in_window],
+            [REASON_STATUS, REASON_NOT_DELIVERED, REASON_DAMAGE_ONLY, REASON_WINDOW],
+            default=REASON_ELIGIBLE
+        )
+        eligible = reasons == REASON_ELIGIBLE
+        # Damaged / defective items are refunded without restocking fee
+        fee = np.where(reason in DAMAGE_REASONS, 0.0, fee)
+        refunds = np.where(eligible, np.round(price * qty * (1 - fee / 100), 2), 0.0)
+
+        return self._summary(cols, eligible, reasons, refunds)
+
+    # -----------------------------
+    # Cancellations
+    # -----------------------------
+    def evaluate_cancellations(
+        self,
+        orders: Iterable[Dict[str, Any]],
+        tier: Optional[str] = None
+    ) -> Dict[str, Any]:
+        cols = self._flatten(orders)
+
+        price = np.array(cols["price"], dtype=np.float64)
+        qty = np.array(cols["quantity"], dtype=np.int64)
+        status_ok = np.array(
+            [r["cancellable"] for r in self._decisions(cols, tier)], dtype=bool
+        )
+        paid = np.array(cols["payment_status"], dtype=object) == "PAID"
+
+        reasons = np.where(status_ok, REASON_ELIGIBLE, REASON_STATUS)
+        eligible = status_ok
+        refunds = np.where(eligible & paid, price * qty, 0.0)
+
+        summary = self._summary(cols, eligible, reasons, refunds)
+        summary["cancellable_orders"] = sorted({
+            line["order_id"] for line in summary["lines"] if line["eligible"]
+        })
+        return summary
+
+
+@lru_cache(maxsize=1)
+def get_batch_engine() -> BatchEligibilityEngine:
+    return BatchEligibilityEngine.from_files()
+
+
+def degraded_fetch(order_ids: List[str], fetched: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    The Degraded result when the OMS failed fast for every order (open
+    breaker / full bulkhead), else None.
+    """
+    results = [fetched.get(order_id) for order_id in dict.fromkeys(order_ids)]
+    if results and all(is_degraded(r) for r in results):
+        return results[0]
+    return None
+
+
+def degraded_note(operation: str, degraded: Dict[str, Any]) -> str:
+    label = SERVICE_LABELS.get(degraded["service"], degraded["service"])
+    retry = f"in {degraded['retry_after']:g}s" if degraded.get("retry_after") else "shortly"
+    return (
+        f"Your bulk {operation} was not submitted: the {label} service is "
+        f"temporarily unavailable. Please retry {retry}."
+    )
+
+
+def split_fetched(
+    order_ids: List[str],
+    fetched: Dict[str, Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+    """
+    Batched OMS results -> (orders in request order, ids the OMS does not
+    know (404), ids that could not be fetched: transport errors, 5xx).
+    """
+    orders, not_found, failed = [], [], []
+    for order_id in dict.fromkeys(order_ids):
+        order = fetched.get(order_id) or {"error": "missing"}
+        if "error" not in order:
+            orders.append(order)
+        elif order.get("status") == 404:
+            not_found.append(order_id)
+        else:
+            failed.append(order_id)
+    return orders, not_found, failed
+
+
+def unavailable_note(not_found: List[str], failed: List[str]) -> str:
+    """
+    Customer-facing wording for orders missing from a bulk request;
+    empty when every order was fetched.
+    """
+    notes = []
+    if not_found:
+        notes.append(f"Orders not found: {', '.join(not_found)}.")
+    if failed:
+        notes.append(
+            f"Orders that could not be retrieved right now (please try again): {', '.join(failed)}."
+        )
+    return " ".join(notes)
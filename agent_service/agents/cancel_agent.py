@@ -6,30 +6,37 @@ AI agent to handle order cancellation requests using:
 ✔ RAG-based cancellation policy
 ✔ Refund rules
 ✔ Agentic decision workflow
+✔ Bulk cancellation of many orders in one pass
 
 Domain: eCommerce (B2C / B2B)
 """
 
 from datetime import datetime
-from typing import Dict, Any
-from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, List
+from ai_service.llm_backend import chat_model
 from langchain.tools import tool
 from langchain.schema import AIMessage
+from ai_service.call_policy import CallPolicy, fallback_llm
+from ai_service.prompt_templates import PROMPTS
+from observability.tracer import traced_tool
+from agents.batch_eligibility import (
+    degraded_fetch, degraded_note, get_batch_engine, split_fetched, unavailable_note
+)
+from agents.policy_compiler import load_policy_table
+from integration.java_commerce_client import fetch_orders
 
 # --------------------------------
 # LLM CONFIG
 # --------------------------------
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.2
-)
+llm = chat_model("gpt-4o-mini", temperature=0.2)
+llm_policy = CallPolicy("cancel_agent", [llm, fallback_llm(0.2)])
 
 # --------------------------------
 # TOOLS (OMS + POLICY + PAYMENT)
 # --------------------------------
 
 @tool
+@traced_tool
 def get_order_status(order_id: str) -> Dict[str, Any]:
     """
     Simulate OMS call for order status.
@@ -46,18 +53,31 @@ def get_order_status(order_id: str) -> Dict[str, Any]:
 
 
 @tool
+@traced_tool
+def get_orders_status(order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch many OMS orders in one batched call (bulk endpoint, cached
+    orders served locally).
+    """
+    return fetch_orders(order_ids)
+
+
+@tool
+@traced_tool
 def get_cancellation_policy() -> Dict[str, Any]:
     """
-    RAG-based policy retrieval from vector DB.
+    Cancellation policy from the compiled policy table.
     """
+    table = load_policy_table()
     return {
-        "cancellable_statuses": ["ORDER_PLACED", "PROCESSING"],
-        "refund_processing_days": 5,
+        "cancellable_statuses": table.statuses_where("cancellable"),
+        "refund_processing_days": table.lookup(None, None, "PROCESSING")["refund_processing_days"],
         "restocking_fee_percent": 0  # not applicable for cancellation
     }
 
 
 @tool
+@traced_tool
 def cancel_order_in_oms(order_id: str) -> str:
     """
     Simulated OMS cancel API call.
@@ -66,6 +86,16 @@ def cancel_order_in_oms(order_id: str) -> str:
 
 
 @tool
+@traced_tool
+def cancel_orders_in_oms_bulk(order_ids: List[str]) -> str:
+    """
+    Simulated OMS bulk cancel API call (one request for many orders).
+    """
+    return f"BULK_CANCEL_REQ_{len(order_ids)}_{order_ids[0]}"
+
+
+@tool
+@traced_tool
 def calculate_refund_on_cancel(price: float, payment_status: str) -> float:
     """
     Refund calculation for cancellation.
@@ -78,38 +108,8 @@ def calculate_refund_on_cancel(price: float, payment_status: str) -> float:
 # --------------------------------
 # PROMPT TEMPLATE
 # --------------------------------
-cancel_prompt = PromptTemplate(
-    input_variables=[
-        "order_id",
-        "status",
-        "refundable",
-        "refund_amount",
-        "policy",
-        "cancel_request_id"
-    ],
-    template="""
-You are an AI Order Cancellation Assistant.
-
-Order ID: {order_id}
-Order Status: {status}
-Refund Eligible: {refundable}
-Refund Amount: ₹{refund_amount}
-
-Cancellation Policy:
-{policy}
-
-If cancellation is allowed:
-- Explain the refund amount
-- Explain the next steps
-- Provide the cancellation confirmation ID: {cancel_request_id}
-
-If cancellation is NOT allowed:
-- Politely explain why
-- Offer alternatives such as return or replacement
-
-Tone: Professional, clear, customer-friendly.
-"""
-)
+cancel_prompt = PROMPTS.get("cancel_agent")
+bulk_prompt = PROMPTS.get("bulk_order_summary")
 
 # --------------------------------
 # MAIN AGENT ORCHESTRATOR
@@ -128,11 +128,13 @@ def handle_order_cancellation(order_id: str) -> Dict[str, Any]:
     refundable = status in allowed_statuses
 
     if refundable:
-        # Step 4: Refund amount calculation
-        item = order["items"][0]
-        refund_amount = calculate_refund_on_cancel.run(
-            price=item["price"],
-            payment_status=order["payment_status"]
+        # Step 4: Refund amount calculation (every order line)
+        refund_amount = sum(
+            calculate_refund_on_cancel.run({
+                "price": item["price"] * item.get("quantity", 1),
+                "payment_status": order["payment_status"]
+            })
+            for item in order["items"]
         )
 
         # Step 5: Trigger OMS cancel request
@@ -142,7 +144,7 @@ def handle_order_cancellation(order_id: str) -> Dict[str, Any]:
         cancel_id = "NOT_APPLICABLE"
 
     # Step 6: LLM response preparation
-    response = llm.invoke(
+    response = llm_policy.invoke(
         cancel_prompt.format(
             order_id=order_id,
             status=status,
@@ -150,6 +152,13 @@ def handle_order_cancellation(order_id: str) -> Dict[str, Any]:
             refund_amount=refund_amount,
             policy=policy,
             cancel_request_id=cancel_id
+        ),
+        renderer=lambda: (
+            f"Order {order_id} has been cancelled (confirmation {cancel_id}). "
+            f"Refund of ₹{refund_amount} will be processed."
+            if refundable else
+            f"Order {order_id} is {status} and can no longer be cancelled. "
+            "You can request a return once it is delivered."
         )
     )
 
@@ -162,6 +171,75 @@ def handle_order_cancellation(order_id: str) -> Dict[str, Any]:
     }
 
 
+def handle_bulk_cancellation(order_ids: List[str]) -> Dict[str, Any]:
+    """
+    Cancel many orders at once: one eligibility pass over every line,
+    one OMS bulk request and one consolidated summary.
+    """
+
+    # Step 1: Fetch OMS orders (one batched call)
+    fetched = get_orders_status.run({"order_ids": order_ids})
+    degraded = degraded_fetch(order_ids, fetched)
+    if degraded is not None:
+        # OMS unavailable: no eligibility summary, just when to retry
+        return {
+            "cancelled_orders": [],
+            "unavailable_orders": list(dict.fromkeys(order_ids)),
+            "not_found_orders": [],
+            "failed_orders": list(dict.fromkeys(order_ids)),
+            "refund_total": 0.0,
+            "cancel_request_id": "NOT_APPLICABLE",
+            "lines": [],
+            "degraded": True,
+            "retry_after": degraded["retry_after"],
+            "message": degraded_note("cancellation", degraded)
+        }
+    orders, not_found, failed = split_fetched(order_ids, fetched)
+    unavailable = unavailable_note(not_found, failed)
+
+    # Step 2: Evaluate every line against the cancellation policy
+    decision = get_batch_engine().evaluate_cancellations(orders)
+    cancellable = decision["cancellable_orders"]
+
+    # Step 3: Single OMS bulk request
+    request_id = (
+        cancel_orders_in_oms_bulk.run({"order_ids": cancellable})
+        if cancellable else "NOT_APPLICABLE"
+    )
+
+    # Step 4: One consolidated summary
+    rejected = {r: n for r, n in decision["by_reason"].items() if r != "eligible"}
+    response = llm_policy.invoke(
+        bulk_prompt.format(
+            operation="cancellation",
+            order_ids=", ".join(order_ids),
+            line_count=decision["line_count"],
+            eligible_lines=decision["eligible_lines"],
+            refund_total=decision["refund_total"],
+            rejected_by_reason=rejected or "None",
+            unavailable_orders=unavailable or "None",
+            request_id=request_id
+        ),
+        renderer=lambda: (
+            f"{len(cancellable)} of {len(order_ids)} orders cancelled "
+            f"(request {request_id}); refund total ₹{decision['refund_total']}. "
+            f"Rejected lines: {rejected or 'none'}."
+            + (f" {unavailable}" if unavailable else "")
+        )
+    )
+
+    return {
+        "cancelled_orders": cancellable,
+        "unavailable_orders": not_found + failed,
+        "not_found_orders": not_found,
+        "failed_orders": failed,
+        "refund_total": decision["refund_total"],
+        "cancel_request_id": request_id,
+        "lines": decision["lines"],
+        "message": response.content
+    }
+
+
 # --------------------------------
 # EXAMPLE RUN
 # --------------------------------
@@ -9,24 +9,25 @@ Domain: eCommerce (B2C / B2B)
 """
 
 from typing import Dict, List, Any
-from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+from ai_service.llm_backend import chat_model
 from langchain.schema import AIMessage
 from langchain.tools import tool
+from ai_service.call_policy import CallPolicy, fallback_llm
+from ai_service.prompt_templates import PROMPTS
+from observability.tracer import traced_tool
 
 # -----------------------------
 # LLM Configuration
 # -----------------------------
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.3
-)
+llm = chat_model("gpt-4o-mini", temperature=0.3)
+llm_policy = CallPolicy("catalog_agent", [llm, fallback_llm(0.3)])
 
 # -----------------------------
 # Tools (Microservice + RAG)
 # -----------------------------
 
 @tool
+@traced_tool
 def semantic_catalog_search(query: str) -> List[Dict[str, Any]]:
     """
     Semantic search over product catalog using vector DB.
@@ -51,6 +52,7 @@ def semantic_catalog_search(query: str) -> List[Dict[str, Any]]:
 
 
 @tool
+@traced_tool
 def get_product_details(sku: str) -> Dict[str, Any]:
     """
     Fetch detailed product data from Catalog Service (Java).
@@ -65,6 +67,7 @@ def get_product_details(sku: str) -> Dict[str, Any]:
 
 
 @tool
+@traced_tool
 def get_inventory_status(sku: str) -> str:
     """
     Inventory check from Inventory microservice.
@@ -73,6 +76,7 @@ def get_inventory_status(sku: str) -> str:
 
 
 @tool
+@traced_tool
 def get_b2b_pricing(customer_id: str, sku: str) -> Dict[str, Any]:
     """
     Fetch contract-based B2B pricing.
@@ -87,32 +91,7 @@ def get_b2b_pricing(customer_id: str, sku: str) -> Dict[str, Any]:
 # -----------------------------
 # Prompt Template
 # -----------------------------
-catalog_prompt = PromptTemplate(
-    input_variables=[
-        "query",
-        "products",
-        "customer_type",
-        "pricing_info"
-    ],
-    template="""
-You are an AI Catalog Agent for an enterprise eCommerce platform.
-
-Customer Type: {customer_type}
-Search Query: "{query}"
-
-Matching Products:
-{products}
-
-Pricing Information:
-{pricing_info}
-
-Your task:
-1. Explain product differences clearly
-2. Recommend the best option based on intent
-3. Mention availability and pricing context
-4. Keep the tone concise and professional
-"""
-)
+catalog_prompt = PROMPTS.get("catalog_agent")
 
 # -----------------------------
 # Agent Orchestration Logic
@@ -155,7 +134,13 @@ def handle_catalog_query(
         pricing_info=pricing_info or "Standard pricing applies"
     )
 
-    ai_response: AIMessage = llm.invoke(prompt)
+    ai_response: AIMessage = llm_policy.invoke(
+        prompt,
+        renderer=lambda: "Matching products: " + ", ".join(
+            f"{p['name']} ({p['sku']}, ₹{p['price']}, {p['inventory']})"
+            for p in enriched_products
+        )
+    )
 
     return {
         "products": enriched_products,
@@ -0,0 +1,295 @@
+"""
+Entity Extractor
+----------------
+Single-pass multi-entity extraction for user queries.
+
+✔ One combined regex for structured IDs (ORD…, SKU…)
+✔ Aho-Corasick automaton over product names, brands and customer IDs
+  from data/*.json (case-insensitive, word-bounded, longest match wins)
+✔ Every entity returned with its character span
+✔ Incremental updates: catalog changes go into a small delta automaton
+  and removals into a tombstone set; both are folded into the main
+  automaton on compaction, which runs in the background
+
+Scanning cost is linear in the query length and independent of the
+number of catalog names.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+PRODUCTS_PATH = os.getenv("PRODUCTS_PATH", "data/products.json")
+CUSTOMERS_PATH = os.getenv("CUSTOMERS_PATH", "data/customer.json")
+CATALOG_REFRESH_INTERVAL_S = float(os.getenv("CATALOG_REFRESH_INTERVAL_S", "5"))
+COMPACT_AFTER = 1000     # delta entries before folding into the main automaton
+
+ID_PATTERN = re.compile(r"\b(?:(?P<order_id>ORD\d+)|(?P<sku>SKU\d+))\b", re.IGNORECASE)
+
+# (entity type, canonical value, reference e.g. the SKU of a product name)
+Entry = Tuple[str, str, Optional[str]]
+
+
+# -----------------------------
+# Aho-Corasick Automaton
+# -----------------------------
+class AhoCorasick:
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[List[Tuple[int, Entry]]] = [[]]
+
+    def add(self, surface: str, entry: Entry):
+        node = 0
+        for ch in surface.lower():
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            node = nxt
+        self.out[node].append((len(surface), entry))
+
+    def build(self):
+        """
+        Breadth-first failure links; outputs are merged along them.
+        """
+        queue = deque(self.goto[0].values())
+        for node in queue:
+            self.fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and ch not in self.goto[state]:
+                    state = self.fail[state]
+                fallback = self.goto[state].get(ch, 0)
+                self.fail[child] = fallback if fallback != child else 0
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Entry]]:
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text.lower()):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, entry in out[state]:
+                yield i - length + 1, i + 1, entry
+
+
+# -----------------------------
+# Gazetteer
+# -----------------------------
+def _automaton(keys: Iterable[Tuple[str, Entry]]) -> AhoCorasick:
+    automaton = AhoCorasick()
+    for surface, entry in keys:
+        automaton.add(surface, entry)
+    automaton.build()
+    return automaton
+
+
+class Gazetteer:
+    """
+    Main automaton + delta automaton + tombstones.
+
+    Readers only take `_lock` to grab the current automata. Writers
+    (update, compaction) serialise on `_write_lock`; a compaction past
+    COMPACT_AFTER runs on a background thread and swaps in when built,
+    so the catalog refresh on a request path never rebuilds the main
+    automaton.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Entry]] = ()):
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        self.entries: Dict[Tuple[str, Entry], None] = dict.fromkeys(entries)
+        self._main = AhoCorasick()
+        self._delta = AhoCorasick()
+        self._delta_entries: Set[Tuple[str, Entry]] = set()
+        self._removed: Set[Tuple[str, Entry]] = set()
+        self.compact()
+
+    def compact(self):
+        """
+        Rebuild the main automaton from all live entries. The rebuild
+        runs outside the locks; entries changed meanwhile become the
+        delta / tombstones of the new main automaton.
+        """
+        with self._write_lock:
+            snapshot = set(self.entries)
+        main = _automaton(snapshot)
+        with self._write_lock:
+            current = set(self.entries)
+            delta_entries = current - snapshot
+            delta = _automaton(delta_entries)
+            with self._lock:
+                self._main, self._delta = main, delta
+                self._delta_entries, self._removed = delta_entries, snapshot - current
+
+    def compact_in_background(self) -> threading.Thread:
+        """
+        Start a compaction unless one is already running (it picks up
+        later changes when it swaps in).
+        """
+        with self._write_lock:
+            if self._compactor is None or not self._compactor.is_alive():
+                self._compactor = threading.Thread(target=self.compact, name="gazetteer-compact", daemon=True)
+                self._compactor.start()
+            return self._compactor
+
+    def update(self, desired: Set[Tuple[str, Entry]]):
+        """
+        Apply a new catalog snapshot incrementally.
+        """
+        with self._write_lock:
+            current = set(self.entries)
+            added, removed = desired - current, current - desired
+            if not added and not removed:
+                return
+
+            entries = dict(self.entries)
+            for key in removed:
+                del entries[key]
+            for key in added:
+                entries[key] = None
+            self.entries = entries
+
+            compact = len(self._delta_entries) + len(added) > COMPACT_AFTER
+            if not compact:
+                delta_entries = (self._delta_entries | added) - removed
+                delta = _automaton(delta_entries)
+                with self._lock:
+                    self._delta, self._delta_entries = delta, delta_entries
+                    self._removed = (self._removed | removed) - added
+
+        # Large change: keep serving the current automata until the
+        # rebuilt one is swapped in
+        if compact:
+            self.compact_in_background()
+
+    def matches(self, text: str) -> Iterator[Tuple[int, int, Entry]]:
+        with self._lock:
+            main, delta, removed = self._main, self._delta, self._removed
+        for automaton in (main, delta):
+            for start, end, entry in automaton.iter_matches(text):
+                if removed and (text[start:end].lower(), entry) in removed:
+                    continue
+                yield start, end, entry
+
+
+def _bounded(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not text[start - 1].isalnum()) and (
+        end == len(text) or not text[end].isalnum()
+    )
+
+
+# -----------------------------
+# Extractor
+# -----------------------------
+class EntityExtractor:
+    def __init__(self, gazetteer: Gazetteer):
+        self.gazetteer = gazetteer
+
+    def extract(self, text: str) -> List[Dict[str, Any]]:
+        """
+        All entities in `text` with spans, leftmost-longest, non-overlapping.
+        """
+        candidates = []
+        for match in ID_PATTERN.finditer(text):
+            kind = match.lastgroup
+            candidates.append((match.start(), match.end(), (kind, match.group(0).upper(), None)))
+
+        for start, end, entry in self.gazetteer.matches(text):
+            if _bounded(text, start, end):
+                candidates.append((start, end, entry))
+
+        candidates.sort(key=lambda c: (c[0], c[0] - c[1]))
+        entities, last_end = [], -1
+        for start, end, (kind, value, ref) in candidates:
+            if start < last_end:
+                continue
+            entities.append({
+                "type": kind,
+                "value": value,
+                "ref": ref,
+                "text": text[start:end],
+                "start": start,
+                "end": end,
+            })
+            last_end = end
+        return entities
+
+
+def catalog_entries(products: List[Dict[str, Any]], customers: List[Dict[str, Any]]) -> Set[Tuple[str, Entry]]:
+    entries: Set[Tuple[str, Entry]] = set()
+    for product in products:
+        entries.add((product["name"].lower(), ("product", product["name"], product["sku"])))
+        if product.get("brand"):
+            entries.add((product["brand"].lower(), ("brand", product["brand"], None)))
+    for customer in customers:
+        entries.add((customer["customer_id"].lower(), ("customer_id", customer["customer_id"], None)))
+    return entries
+
+
+# -----------------------------
+# Process-wide Extractor
+# -----------------------------
+class _CatalogWatcher:
+    def __init__(self):
+        self.extractor: Optional[EntityExtractor] = None
+        self.stamp: Optional[Tuple[int, ...]] = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def _stat(self) -> Tuple[int, ...]:
+        return tuple(os.stat(p).st_mtime_ns for p in (PRODUCTS_PATH, CUSTOMERS_PATH))
+
+    def _load(self) -> Set[Tuple[str, Entry]]:
+        with open(PRODUCTS_PATH) as f:
+            products = json.load(f)
+        with open(CUSTOMERS_PATH) as f:
+            customers = json.load(f)
+        return catalog_entries(products, customers)
+
+    def get(self) -> EntityExtractor:
+        now = time.monotonic()
+        if self.extractor is not None and now - self.checked_at < CATALOG_REFRESH_INTERVAL_S:
+            return self.extractor
+
+        with self.lock:
+            self.checked_at = now
+            try:
+                stamp = self._stat()
+            except OSError:
+                stamp = self.stamp
+            if self.extractor is None:
+                self.extractor = EntityExtractor(Gazetteer(self._load()))
+                self.stamp = stamp
+            elif stamp != self.stamp:
+                self.extractor.gazetteer.update(self._load())
+                self.stamp = stamp
+        return self.extractor
+
+
+_watcher = _CatalogWatcher()
+
+
+def extract_entities(text: str) -> List[Dict[str, Any]]:
+    """
+    Extract all entities from a user query (reloads the gazetteer
+    incrementally when the catalog files change).
+    """
+    return _watcher.get().extract(text)
+
+
+def first_entity(entities: List[Dict[str, Any]], *kinds: str) -> Optional[Dict[str, Any]]:
+    return next((e for e in entities if e["type"] in kinds), None)
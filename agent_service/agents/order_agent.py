@@ -6,7 +6,7 @@ def handle_order(user_id):
     )
     return response.json()
 
-----
+
 """
 Order Agent
 -----------
@@ -19,24 +19,25 @@ Domain: eCommerce (B2C / B2B)
 
 from typing import Dict, Any
 from datetime import datetime, timedelta
-from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+from ai_service.llm_backend import chat_model
 from langchain.schema import AIMessage
 from langchain.tools import tool
+from ai_service.call_policy import CallPolicy, fallback_llm
+from ai_service.prompt_templates import PROMPTS
+from observability.tracer import traced_tool
 
 # -----------------------------
 # LLM Configuration
 # -----------------------------
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.2
-)
+llm = chat_model("gpt-4o-mini", temperature=0.2)
+llm_policy = CallPolicy("order_agent", [llm, fallback_llm(0.2)])
 
 # -----------------------------
 # Tools (OMS + Logistics)
 # -----------------------------
 
 @tool
+@traced_tool
 def get_order_status(order_id: str) -> Dict[str, Any]:
     """
     Fetch order status from Order Service (Java OMS).
@@ -52,6 +53,7 @@ def get_order_status(order_id: str) -> Dict[str, Any]:
 
 
 @tool
+@traced_tool
 def get_delivery_eta(carrier: str, tracking_number: str) -> str:
     """
     Get ETA from logistics provider.
@@ -60,6 +62,7 @@ def get_delivery_eta(carrier: str, tracking_number: str) -> str:
 
 
 @tool
+@traced_tool
 def get_order_exceptions(order_id: str) -> Dict[str, Any]:
     """
     Check for any delivery or payment exceptions.
@@ -73,34 +76,7 @@ def get_order_exceptions(order_id: str) -> Dict[str, Any]:
 # -----------------------------
 # Prompt Template
 # -----------------------------
-order_prompt = PromptTemplate(
-    input_variables=[
-        "order_id",
-        "status",
-        "carrier",
-        "tracking_number",
-        "eta",
-        "exception"
-    ],
-    template="""
-You are an AI Order Support Agent for an enterprise eCommerce platform.
-
-Order ID: {order_id}
-Current Status: {status}
-Carrier: {carrier}
-Tracking Number: {tracking_number}
-Estimated Delivery: {eta}
-
-Exceptions:
-{exception}
-
-Explain clearly:
-1. Current order status
-2. Delivery timeline
-3. Any action required by customer
-Use a calm, reassuring, and professional tone.
-"""
-)
+order_prompt = PROMPTS.get("order_agent")
 
 # -----------------------------
 # Agent Orchestration Logic
@@ -132,7 +108,13 @@ def handle_order_query(order_id: str) -> Dict[str, Any]:
         exception=exception_info["notes"]
     )
 
-    ai_response: AIMessage = llm.invoke(prompt)
+    ai_response: AIMessage = llm_policy.invoke(
+        prompt,
+        renderer=lambda: (
+            f"Your order {order_id} is currently {order['status']}. "
+            f"{eta}. Notes: {exception_info['notes']}."
+        )
+    )
 
     return {
         "order_id": order_id,
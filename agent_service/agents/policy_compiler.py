@@ -0,0 +1,145 @@
+"""
+Policy Compiler
+---------------
+Compiles the structured return / cancellation policy spec
+(data/return_policy.json, kept next to data/return_policy.txt) into an
+indexed rule table.
+
+✔ Rules applied in spec order, later rules override earlier ones
+✔ Every (category, tier, status) combination precomputed, including
+  "*" for unknown values -> one dict probe per lookup
+✔ Compiled table is written next to the FAISS index and carries the
+  same build version (see embeddings/embed_documents.py)
+
+Agents get policy decisions without a vector search or LLM call on the
+hot path.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+POLICY_SPEC_PATH = os.getenv("POLICY_SPEC_PATH", "data/return_policy.json")
+POLICY_TABLE_PATH = os.getenv("POLICY_TABLE_PATH", "vector_store/faiss_index/policy_table.json")
+INDEX_MANIFEST_PATH = os.getenv("INDEX_MANIFEST_PATH", "vector_store/faiss_index/manifest.json")
+
+ANY = "*"
+
+
+class PolicyTable:
+    def __init__(
+        self,
+        version: str,
+        categories: List[str],
+        tiers: List[str],
+        statuses: List[str],
+        decisions: Dict[Tuple[str, str, str], Dict[str, Any]]
+    ):
+        self.version = version
+        self.categories = frozenset(categories)
+        self.tiers = frozenset(tiers)
+        self.statuses = list(statuses)
+        self._status_set = frozenset(statuses)
+        self._decisions = {key: MappingProxyType(d) for key, d in decisions.items()}
+
+    def lookup(
+        self,
+        category: Optional[str],
+        tier: Optional[str],
+        status: Optional[str]
+    ) -> Mapping[str, Any]:
+        """
+        Constant-time policy decision; unknown values fall back to "*".
+        """
+        return self._decisions[(
+            category if category in self.categories else ANY,
+            tier if tier in self.tiers else ANY,
+            status if status in self._status_set else ANY,
+        )]
+
+    def statuses_where(self, field: str, category: str = ANY, tier: str = ANY) -> List[str]:
+        return [s for s in self.statuses if self.lookup(category, tier, s)[field]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "categories": sorted(self.categories),
+            "tiers": sorted(self.tiers),
+            "statuses": self.statuses,
+            "decisions": [[*key, dict(d)] for key, d in self._decisions.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PolicyTable":
+        decisions = {(c, t, s): d for c, t, s, d in data["decisions"]}
+        return cls(data["version"], data["categories"], data["tiers"], data["statuses"], decisions)
+
+
+# -----------------------------
+# Compiler
+# -----------------------------
+def spec_version(spec: Dict[str, Any]) -> str:
+    canonical = json.dumps(spec, sort_keys=True).encode()
+    return hashlib.sha256(canonical).hexdigest()[:12]
+
+
+def compile_policy(spec: Dict[str, Any], version: Optional[str] = None) -> PolicyTable:
+    categories = list(spec["categories"])
+    tier_types: Dict[str, str] = spec["tiers"]
+    statuses = list(spec["statuses"])
+
+    decisions: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for category, tier, status in itertools.product(
+        categories + [ANY], list(tier_types) + [ANY], statuses + [ANY]
+    ):
+        facts = {
+            "category": category,
+            "tier": tier,
+            "status": status,
+            "customer_type": tier_types.get(tier, spec.get("default_customer_type", "B2C")),
+        }
+        decision = dict(spec["defaults"])
+        applied = []
+        for rule in spec["rules"]:
+            if all(facts[dim] in allowed for dim, allowed in rule["match"].items()):
+                decision.update(rule["set"])
+                applied.append(rule["id"])
+        decision["rules"] = applied
+        decisions[(category, tier, status)] = decision
+
+    return PolicyTable(version or spec_version(spec), categories, list(tier_types), statuses, decisions)
+
+
+def write_policy_table(table: PolicyTable, path: Optional[str] = None):
+    path = path or POLICY_TABLE_PATH
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(table.to_dict(), f)
+    os.replace(tmp_path, path)
+
+
+# -----------------------------
+# Runtime Loading
+# -----------------------------
+@lru_cache(maxsize=1)
+def load_policy_table() -> PolicyTable:
+    """
+    Use the compiled table shipped with the vector index when its version
+    matches the index manifest; otherwise compile the spec in-process.
+    """
+    try:
+        with open(POLICY_TABLE_PATH) as f:
+            table = PolicyTable.from_dict(json.load(f))
+        with open(INDEX_MANIFEST_PATH) as f:
+            manifest = json.load(f)
+        if table.version == manifest.get("version"):
+            return table
+    except (OSError, ValueError, KeyError):
+        pass
+
+    with open(POLICY_SPEC_PATH) as f:
+        return compile_policy(json.load(f))
@@ -1,9 +1,35 @@
+"""
+Pricing Agent
+-------------
+AI agent responsible for B2B quotes: contract pricing, tier-based
+discounts and minimum-order-quantity checks, backed by the vectorized
+pricing engine.
+
+Prices are never generated by the LLM (see docs/guardrails.md), so the
+quote message is rendered deterministically from the engine result.
+
+Domain: eCommerce (B2B)
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from agents.pricing_engine import get_pricing_engine
+from observability.tracer import span
+
+# "50 x SKU1001", "50 units of SKU1001", "SKU1001 x 50", or a bare "SKU1001".
+# The leading \b keeps the digits of one SKU from being read as the
+# quantity of the next ("SKU1001 SKU1002").
+LINE_PATTERN = re.compile(
+    r"(?:\b(\d+)\s*(?:x|units?\s+of|pcs\s+of|of)?\s*(SKU\d+)\b)"
+    r"|(?:\b(SKU\d+)\s*x\s*(\d+)\b)"
+    r"|(?:\b(SKU\d+)\b)",
+    re.IGNORECASE
+)
+
+
 def calculate_price(customer_tier, base_price, quantity):
-    discount = 0
-    if customer_tier == "GOLD":
-        discount = 0.15
-    elif customer_tier == "SILVER":
-        discount = 0.10
+    discount = get_pricing_engine().tier_discount(customer_tier)
 
     final_price = base_price * quantity * (1 - discount)
     return {
@@ -12,3 +38,59 @@ def calculate_price(customer_tier, base_price, quantity):
         "final_price": final_price
     }
 
+
+# -----------------------------
+# Query Parsing
+# -----------------------------
+def extract_quote_lines(text: str) -> Tuple[List[str], List[int]]:
+    """
+    Pull (sku, quantity) pairs out of free text. Quantity defaults to 1.
+    """
+    skus, quantities = [], []
+    for qty, sku, sku_first, qty_after, sku_only in LINE_PATTERN.findall(text):
+        skus.append((sku or sku_first or sku_only).upper())
+        quantities.append(int(qty or qty_after or 1))
+    return skus, quantities
+
+
+# -----------------------------
+# Agent Orchestration Logic
+# -----------------------------
+def handle_pricing_query(query: str, customer_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Quote every SKU mentioned in the query for the given customer.
+    """
+    skus, quantities = extract_quote_lines(query)
+    if not skus:
+        return {
+            "quote": None,
+            "message": "Please mention the SKUs (and quantities) you would like a quote for."
+        }
+
+    with span("pricing_engine.quote", "tool", lines=len(skus)):
+        quote = get_pricing_engine().quote(customer_id, skus, quantities)
+
+    return {
+        "quote": quote,
+        "message": render_quote(quote)
+    }
+
+
+def render_quote(quote: Dict[str, Any]) -> str:
+    lines = [
+        f"{line['quantity']} x {line['sku']}: ₹{line['unit_price']:.2f} each "
+        f"({line['pricing']}{', below minimum order quantity' if line['below_moq'] else ''})"
+        for line in quote["lines"]
+        if line["pricing"] != "unknown_sku"
+    ]
+    if quote["unknown_skus"]:
+        lines.append("Not found in catalog: " + ", ".join(quote["unknown_skus"]))
+    lines.append(f"Total: ₹{quote['total']:.2f} (you save ₹{quote['discount_total']:.2f})")
+    return "\n".join(lines)
+
+
+# -----------------------------
+# Example Invocation
+# -----------------------------
+if __name__ == "__main__":
+    print(handle_pricing_query("Quote 20 x SKU1001 and 5 units of SKU2001", "B2B001"))
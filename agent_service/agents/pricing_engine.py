@@ -0,0 +1,174 @@
+"""
+Pricing Engine
+--------------
+Vectorized B2B quote engine.
+
+Tier rules come from data/pricing_rules.json, contract prices from the
+hot-reloaded contract index (integration/contract_index.py), list prices
+from data/products.json and customer tiers from data/customer.json. A cart is priced in one pass over array-backed line
+data:
+
+1. Contract override   -> valid contract price replaces list price
+2. Tier discount       -> customer tier discount on list-priced lines
+3. Min-order-qty check -> lines below the tier MOQ lose the discount
+
+Domain: eCommerce (B2B)
+"""
+
+import json
+import os
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from integration.contract_index import ContractIndex, get_contract_index
+
+PRICING_RULES_PATH = os.getenv("PRICING_RULES_PATH", "data/pricing_rules.json")
+PRODUCTS_PATH = os.getenv("PRODUCTS_PATH", "data/products.json")
+CUSTOMERS_PATH = os.getenv("CUSTOMERS_PATH", "data/customer.json")
+
+PRICING_CONTRACT, PRICING_TIER, PRICING_LIST = "contract", "tier", "list"
+PRICING_UNKNOWN = "unknown_sku"
+
+
+class PricingEngine:
+    def __init__(
+        self,
+        rules: Dict[str, Any],
+        products: List[Dict[str, Any]],
+        customers: List[Dict[str, Any]],
+        contracts: ContractIndex
+    ):
+        self.tiers: Dict[str, Dict[str, float]] = {
+            tier: {
+                "discount": rule["discount_percent"] / 100,
+                "min_order_qty": rule["min_order_qty"],
+            }
+            for tier, rule in rules.get("tier_pricing", {}).items()
+        }
+        self.customer_tiers = {c["customer_id"]: c.get("tier") for c in customers}
+
+        # Catalog columns: row i <-> sku i
+        self.skus = [p["sku"] for p in products]
+        self.sku_index = {sku: i for i, sku in enumerate(self.skus)}
+        self.list_prices = np.array([p["price"] for p in products], dtype=np.float64)
+
+        self.contracts = contracts
+
+    @classmethod
+    def from_files(
+        cls,
+        rules_path: str = PRICING_RULES_PATH,
+        products_path: str = PRODUCTS_PATH,
+        customers_path: str = CUSTOMERS_PATH
+    ) -> "PricingEngine":
+        with open(rules_path) as f:
+            rules = json.load(f)
+        with open(products_path) as f:
+            products = json.load(f)
+        with open(customers_path) as f:
+            customers = json.load(f)
+        return cls(rules, products, customers, get_contract_index())
+
+    # -----------------------------
+    # Single-line helpers
+    # -----------------------------
+    def tier_discount(self, tier: Optional[str]) -> float:
+        return self.tiers.get(tier, {}).get("discount", 0.0)
+
+    # -----------------------------
+    # Vectorized cart pricing
+    # -----------------------------
+    def contract_prices(self, customer_id: str, on: date) -> np.ndarray:
+        """
+        Contract price per catalog row (NaN where none is valid on `on`).
+        """
+        prices = np.full(len(self.skus), np.nan)
+        for sku, account in self.contracts.contracts_for(customer_id, on).items():
+            row = self.sku_index.get(sku)
+            if row is not None:
+                prices[row] = account["contract_price"]
+        return prices
+
+    def quote(
+        self,
+        customer_id: Optional[str],
+        skus: Sequence[str],
+        quantities: Sequence[int],
+        on: Optional[date] = None,
+        include_lines: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Price a whole cart. `skus` and `quantities` are parallel columns.
+        """
+        on = on or date.today()
+        tier = self.customer_tiers.get(customer_id)
+        tier_rule = self.tiers.get(tier, {"discount": 0.0, "min_order_qty": 0})
+
+        lookup = self.sku_index.get
+        rows = np.fromiter((lookup(s, -1) for s in skus), dtype=np.int64, count=len(skus))
+        qty = np.asarray(quantities, dtype=np.int64)
+        known = rows >= 0
+        safe_rows = np.where(known, rows, 0)
+
+        list_price = np.where(known, self.list_prices[safe_rows], 0.0)
+
+        # 1. Contract override
+        contract_price = self.contract_prices(customer_id, on)[safe_rows]
+        has_contract = known & ~np.isnan(contract_price)
+
+        # 2. Tier discount on list-priced lines, 3. unless below MOQ
+        below_moq = known & ~has_contract & (qty < tier_rule["min_order_qty"])
+        discount = np.where(known & ~has_contract & ~below_moq, tier_rule["discount"], 0.0)
+
+        unit_price = np.where(has_contract, contract_price, list_price * (1 - discount))
+        unit_price = np.round(unit_price, 2)
+        line_total = np.round(unit_price * qty, 2)
+        list_total = list_price * qty
+
+        total = float(line_total.sum())
+        result: Dict[str, Any] = {
+            "customer_id": customer_id,
+            "tier": tier,
+            "currency": "INR",
+            "line_count": int(len(rows)),
+            "list_total": round(float(list_total.sum()), 2),
+            "discount_total": round(float(list_total.sum()) - total, 2),
+            "total": round(total, 2),
+            "contract_lines": int(has_contract.sum()),
+            "below_moq_lines": int(below_moq.sum()),
+            "unknown_skus": [skus[i] for i in np.flatnonzero(~known)],
+        }
+
+        if include_lines:
+            pricing = np.select(
+                [~known, has_contract, discount > 0],
+                [PRICING_UNKNOWN, PRICING_CONTRACT, PRICING_TIER],
+                default=PRICING_LIST
+            )
+            result["lines"] = [
+                {
+                    "sku": sku,
+                    "quantity": q,
+                    "list_price": lp,
+                    "unit_price": up,
+                    "line_total": lt,
+                    "pricing": pr,
+                    "below_moq": bm,
+                }
+                for sku, q, lp, up, lt, pr, bm in zip(
+                    skus, qty.tolist(), list_price.tolist(), unit_price.tolist(),
+                    line_total.tolist(), pricing.tolist(), below_moq.tolist()
+                )
+            ]
+        return result
+
+
+@lru_cache(maxsize=1)
+def get_pricing_engine() -> PricingEngine:
+    """
+    Process-wide engine loaded from the data files on first use.
+    """
+    return PricingEngine.from_files()
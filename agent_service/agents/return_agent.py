@@ -3,29 +3,37 @@ Return Agent
 -------------
 Agent responsible for handling return eligibility, refund calculation,
 policy validation, and workflow orchestration using RAG + tools.
+Multi-line B2B returns are evaluated in one pass and submitted as a
+single bulk OMS request.
 
 Domain: eCommerce (B2C / B2B)
 """
 
-from typing import Dict, Any
-from langchain.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, List, Optional
+from ai_service.llm_backend import chat_model
 from langchain.schema import AIMessage
 from langchain.tools import tool
+from ai_service.call_policy import CallPolicy, fallback_llm
+from ai_service.prompt_templates import PROMPTS
+from observability.tracer import traced_tool
+from agents.batch_eligibility import (
+    degraded_fetch, degraded_note, get_batch_engine, split_fetched, unavailable_note
+)
+from agents.policy_compiler import load_policy_table
+from integration.java_commerce_client import fetch_orders
 
 # -----------------------------
 # LLM Configuration
 # -----------------------------
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.2
-)
+llm = chat_model("gpt-4o-mini", temperature=0.2)
+llm_policy = CallPolicy("return_agent", [llm, fallback_llm(0.2)])
 
 # -----------------------------
 # Tools (Microservice Wrappers)
 # -----------------------------
 
 @tool
+@traced_tool
 def get_order_details(order_id: str) -> Dict[str, Any]:
     """
     Fetch order details from Order Service (Java Microservice).
@@ -43,18 +51,32 @@ def get_order_details(order_id: str) -> Dict[str, Any]:
 
 
 @tool
+@traced_tool
+def get_orders_details(order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch many orders from the Order Service in one batched call
+    (bulk endpoint, cached orders served locally).
+    """
+    return fetch_orders(order_ids)
+
+
+@tool
+@traced_tool
 def get_return_policy(product_sku: str) -> Dict[str, Any]:
     """
-    Retrieve return policy using RAG (Vector DB).
+    Retrieve return policy from the compiled policy table.
     """
+    category = get_batch_engine().categories.get(product_sku)
+    decision = load_policy_table().lookup(category, None, "DELIVERED")
     return {
-        "return_window_days": 10,
-        "restocking_fee_percent": 5,
-        "return_type": "REFUND"
+        "return_window_days": decision["return_window_days"],
+        "restocking_fee_percent": decision["restocking_fee_percent"],
+        "return_type": decision["return_type"]
     }
 
 
 @tool
+@traced_tool
 def calculate_refund(price: float, fee_percent: int) -> float:
     """
     Calculate refund amount after restocking fee.
@@ -63,6 +85,7 @@ def calculate_refund(price: float, fee_percent: int) -> float:
 
 
 @tool
+@traced_tool
 def create_return_request(order_id: str, sku: str) -> str:
     """
     Create return request in Order Management System.
@@ -70,39 +93,20 @@ def create_return_request(order_id: str, sku: str) -> str:
     return f"RETURN-{order_id}-{sku}"
 
 
+@tool
+@traced_tool
+def create_bulk_return_request(lines: List[Dict[str, Any]]) -> str:
+    """
+    Create one bulk return request in Order Management System.
+    """
+    return f"BULK-RETURN-{len(lines)}-{lines[0]['order_id']}"
+
+
 # -----------------------------
 # Prompt Template
 # -----------------------------
-return_prompt = PromptTemplate(
-    input_variables=[
-        "order_id",
-        "sku",
-        "order_date",
-        "delivery_date",
-        "price",
-        "return_window_days",
-        "refund_amount"
-    ],
-    template="""
-You are an AI Return Management Agent for an eCommerce platform.
-
-Order ID: {order_id}
-SKU: {sku}
-Order Date: {order_date}
-Delivery Date: {delivery_date}
-Item Price: ₹{price}
-
-Return Policy:
-- Return Window: {return_window_days} days
-- Refund Amount After Fees: ₹{refund_amount}
-
-Explain clearly:
-1. Whether the return is eligible
-2. Refund amount
-3. Next steps for the customer
-Use a professional and customer-friendly tone.
-"""
-)
+return_prompt = PROMPTS.get("return_agent")
+bulk_prompt = PROMPTS.get("bulk_order_summary")
 
 # -----------------------------
 # Agent Orchestration Logic
@@ -139,7 +143,13 @@ def handle_return_request(order_id: str, sku: str) -> Dict[str, Any]:
         refund_amount=refund_amount
     )
 
-    ai_response: AIMessage = llm.invoke(prompt)
+    ai_response: AIMessage = llm_policy.invoke(
+        prompt,
+        renderer=lambda: (
+            f"Return {return_id} has been created for {sku} on order {order_id}. "
+            f"Refund after fees: ₹{refund_amount}."
+        )
+    )
 
     return {
         "return_id": return_id,
@@ -148,6 +158,85 @@ def handle_return_request(order_id: str, sku: str) -> Dict[str, Any]:
     }
 
 
+def handle_bulk_return_request(
+    order_ids: List[str],
+    skus: Optional[List[str]] = None,
+    reason: Optional[str] = None,
+    tier: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Return every line (or the given SKUs) of one or many orders:
+    one eligibility pass, one bulk OMS request, one summary.
+    """
+
+    # Step 1: Fetch order details (one batched OMS call)
+    fetched = get_orders_details.run({"order_ids": order_ids})
+    degraded = degraded_fetch(order_ids, fetched)
+    if degraded is not None:
+        # OMS unavailable: no eligibility summary, just when to retry
+        return {
+            "return_id": "NOT_APPLICABLE",
+            "eligible_lines": 0,
+            "refund_amount": 0.0,
+            "lines": [],
+            "unavailable_orders": list(dict.fromkeys(order_ids)),
+            "not_found_orders": [],
+            "failed_orders": list(dict.fromkeys(order_ids)),
+            "degraded": True,
+            "retry_after": degraded["retry_after"],
+            "message": degraded_note("return", degraded)
+        }
+    orders, not_found, failed = split_fetched(order_ids, fetched)
+    unavailable = unavailable_note(not_found, failed)
+
+    # Step 2: Evaluate all lines against the return policy
+    decision = get_batch_engine().evaluate_returns(
+        orders, skus=skus, reason=reason, tier=tier
+    )
+    eligible = [
+        {"order_id": line["order_id"], "sku": line["sku"], "quantity": line["quantity"]}
+        for line in decision["lines"] if line["eligible"]
+    ]
+
+    # Step 3: Single bulk OMS request
+    return_id = (
+        create_bulk_return_request.run({"lines": eligible})
+        if eligible else "NOT_APPLICABLE"
+    )
+
+    # Step 4: One consolidated summary
+    rejected = {r: n for r, n in decision["by_reason"].items() if r != "eligible"}
+    ai_response: AIMessage = llm_policy.invoke(
+        bulk_prompt.format(
+            operation="return",
+            order_ids=", ".join(order_ids),
+            line_count=decision["line_count"],
+            eligible_lines=decision["eligible_lines"],
+            refund_total=decision["refund_total"],
+            rejected_by_reason=rejected or "None",
+            unavailable_orders=unavailable or "None",
+            request_id=return_id
+        ),
+        renderer=lambda: (
+            f"{decision['eligible_lines']} of {decision['line_count']} lines accepted "
+            f"for return (request {return_id}); refund total ₹{decision['refund_total']}. "
+            f"Rejected lines: {rejected or 'none'}."
+            + (f" {unavailable}" if unavailable else "")
+        )
+    )
+
+    return {
+        "return_id": return_id,
+        "eligible_lines": decision["eligible_lines"],
+        "refund_amount": decision["refund_total"],
+        "lines": decision["lines"],
+        "unavailable_orders": not_found + failed,
+        "not_found_orders": not_found,
+        "failed_orders": failed,
+        "message": ai_response.content
+    }
+
+
 # -----------------------------
 # Example Invocation
 # -----------------------------
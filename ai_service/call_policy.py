@@ -0,0 +1,346 @@
+"""
+call_policy.py
+--------------
+Deadline-aware LLM invocation shared by all agents and the RAG pipeline.
+
+✔ One request deadline shared across graph nodes
+✔ Per-node share of the remaining budget
+✔ Hedged duplicate request once the observed p95 latency has passed
+✔ Fallback model tiers when the deadline is near
+✔ Cancellation of losing requests
+✔ Deterministic renderer as the last resort
+✔ Exact-match completion cache in front of the tiers (llm_cache)
+
+A slow completion can no longer stall a whole chat: every call is
+bounded by the time left on the request.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from langchain.schema import AIMessage
+from ai_service.llm_backend import chat_model, request_key
+from ai_service.llm_cache import get_llm_cache
+from observability.tracer import record_cache, record_llm_usage, span
+
+# -----------------------------
+# Configuration
+# -----------------------------
+REQUEST_DEADLINE_S = float(os.getenv("LLM_REQUEST_DEADLINE_S", "8.0"))
+DEFAULT_HEDGE_AFTER_S = float(os.getenv("LLM_HEDGE_AFTER_S", "2.0"))
+FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "gpt-3.5-turbo")
+FALLBACK_MAX_TOKENS = int(os.getenv("LLM_FALLBACK_MAX_TOKENS", "256"))
+
+HEDGE_QUANTILE = 0.95
+MIN_SAMPLES = 20            # below this, DEFAULT_HEDGE_AFTER_S is used
+FALLBACK_RESERVE_S = 1.5    # budget kept back for the next tier
+MIN_CALL_BUDGET_S = 0.25    # a tier is skipped below this budget
+
+# Fraction of the *remaining* request time a node may spend on LLM calls.
+# The last node on a path gets everything that is left.
+NODE_BUDGET_SHARE = {
+    "classify_intent": 0.25,
+    "catalog_agent": 1.0,
+    "order_agent": 1.0,
+    "return_agent": 1.0,
+    "cancel_agent": 1.0,
+    "rag": 1.0,
+}
+
+_deadline_at: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "llm_deadline_at", default=None
+)
+
+
+# -----------------------------
+# Deadlines
+# -----------------------------
+def new_deadline(seconds: Optional[float] = None) -> float:
+    """
+    Absolute (monotonic) deadline for a new request.
+    """
+    return time.monotonic() + (seconds if seconds is not None else REQUEST_DEADLINE_S)
+
+
+def remaining_budget() -> float:
+    """
+    Seconds left before the current deadline.
+    """
+    deadline_at = _deadline_at.get()
+    if deadline_at is None:
+        return REQUEST_DEADLINE_S
+    return max(deadline_at - time.monotonic(), 0.0)
+
+
+@contextmanager
+def node_budget(node: str, deadline_at: Optional[float] = None):
+    """
+    Scope LLM calls made inside a graph node to its share of the
+    request deadline.
+    """
+    outer = deadline_at or _deadline_at.get() or new_deadline()
+    now = time.monotonic()
+    share = NODE_BUDGET_SHARE.get(node, 1.0)
+    scoped = now + max(outer - now, 0.0) * share
+
+    token = _deadline_at.set(scoped)
+    try:
+        yield scoped
+    finally:
+        _deadline_at.reset(token)
+
+
+# -----------------------------
+# Latency Tracking
+# -----------------------------
+class LatencyTracker:
+    """
+    Rolling window of successful call latencies for one model.
+    """
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def quantile(self, q: float, default: float) -> float:
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < MIN_SAMPLES:
+            return default
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def tracker_for(model: str) -> LatencyTracker:
+    with _trackers_lock:
+        return _trackers.setdefault(model, LatencyTracker())
+
+
+def model_name(llm: Any) -> str:
+    return (
+        getattr(llm, "model_name", None)
+        or getattr(llm, "model", None)
+        or type(llm).__name__
+    )
+
+
+def generation_params(llm: Any) -> Dict[str, Any]:
+    """
+    Parameters that change the completion, for cache keys.
+    """
+    return {
+        "model": model_name(llm),
+        "temperature": getattr(llm, "temperature", None),
+        "max_tokens": getattr(llm, "max_tokens", None),
+    }
+
+
+def fallback_llm(temperature: float) -> Any:
+    """
+    Cheaper / faster tier used when the primary model runs out of time.
+    """
+    return chat_model(
+        FALLBACK_MODEL,
+        temperature=temperature,
+        max_tokens=FALLBACK_MAX_TOKENS
+    )
+
+
+# -----------------------------
+# Hedged Call
+# -----------------------------
+async def _timed_call(llm: Any, prompt: str, tracker: LatencyTracker):
+    model = model_name(llm)
+    with span(model, "llm") as llm_span:
+        started = time.monotonic()
+        if hasattr(llm, "ainvoke"):
+            result = await llm.ainvoke(prompt)
+        else:
+            result = await asyncio.to_thread(llm.invoke, prompt)
+        tracker.observe(time.monotonic() - started)
+        record_llm_usage(llm_span, result, model)
+    return result
+
+
+async def hedged_call(llm: Any, prompt: str, budget: float):
+    """
+    Call `llm` within `budget` seconds. A duplicate request is fired once
+    the model's p95 latency has passed (or the first attempt failed);
+    the first answer wins and the loser is cancelled.
+    """
+    tracker = tracker_for(model_name(llm))
+    hedge_after = tracker.quantile(HEDGE_QUANTILE, DEFAULT_HEDGE_AFTER_S)
+
+    started = time.monotonic()
+    tasks = [asyncio.create_task(_timed_call(llm, prompt, tracker))]
+    pending = set(tasks)
+    hedged = False
+    error: Optional[BaseException] = None
+
+    try:
+        while pending:
+            elapsed = time.monotonic() - started
+            timeout = budget - elapsed
+            if timeout <= 0:
+                break
+            if not hedged:
+                timeout = min(timeout, max(hedge_after - elapsed, 0.0))
+
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+
+            if not hedged and (not pending or time.monotonic() - started >= hedge_after):
+                task = asyncio.create_task(_timed_call(llm, prompt, tracker))
+                tasks.append(task)
+                pending.add(task)
+                hedged = True
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    if error is not None and not pending:
+        raise error
+    raise TimeoutError(f"LLM call exceeded {budget:.2f}s budget")
+
+
+# -----------------------------
+# Call Policy
+# -----------------------------
+class CallPolicy:
+    """
+    LLM call policy for one call site: ordered model tiers plus an
+    optional deterministic renderer.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        tiers: Sequence[Any],
+        renderer: Optional[Callable[[], str]] = None,
+        cacheable: bool = True
+    ):
+        self.name = name
+        self.tiers = list(tiers)
+        self.renderer = renderer
+        self.cacheable = cacheable
+
+    def invoke(self, prompt: str, renderer: Optional[Callable[[], str]] = None) -> AIMessage:
+        """
+        Synchronous entrypoint used by the agents.
+        """
+        return _run_on_llm_loop(self.ainvoke(prompt, renderer, remaining_budget()))
+
+    async def ainvoke(
+        self,
+        prompt: str,
+        renderer: Optional[Callable[[], str]] = None,
+        budget: Optional[float] = None
+    ) -> AIMessage:
+        render = renderer or self.renderer
+
+        cache = get_llm_cache() if self.cacheable and self.tiers else None
+        cache_key = None
+        if cache is not None:
+            primary = self.tiers[0]
+            cache_key = request_key(model_name(primary), generation_params(primary), prompt)
+            content = cache.get(cache_key)
+            record_cache("llm.completion", content is not None)
+            if content is not None:
+                return AIMessage(
+                    content=content,
+                    response_metadata={"cache": "hit", "policy": self.name}
+                )
+
+        deadline_at = time.monotonic() + (
+            budget if budget is not None else remaining_budget()
+        )
+        error: Optional[BaseException] = None
+
+        for position, llm in enumerate(self.tiers):
+            has_next_tier = position < len(self.tiers) - 1
+            reserve = FALLBACK_RESERVE_S if has_next_tier else 0.0
+            tier_budget = deadline_at - time.monotonic() - reserve
+
+            # Too close to the deadline for this tier -> try a faster one
+            if tier_budget < MIN_CALL_BUDGET_S:
+                continue
+            expected = tracker_for(model_name(llm)).quantile(0.5, 0.0)
+            if has_next_tier and expected > tier_budget:
+                continue
+
+            try:
+                result = await hedged_call(llm, prompt, tier_budget)
+            except Exception as ex:
+                error = ex
+                continue
+            if cache_key is not None and position == 0:
+                cache.put(cache_key, model_name(llm), result.content)
+            return result
+
+        if render is not None:
+            return AIMessage(
+                content=render(),
+                response_metadata={"fallback": "renderer", "policy": self.name}
+            )
+        raise error or TimeoutError(f"No LLM tier fits the deadline for {self.name}")
+
+
+# -----------------------------
+# Background Event Loop
+# -----------------------------
+# Async clients keep pooled connections bound to the loop that created
+# them, so all sync callers share one long-lived loop.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _llm_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="llm-call-policy", daemon=True
+            ).start()
+        return _loop
+
+
+def _reset_after_fork():
+    # The loop thread does not survive fork; workers start their own
+    global _loop, _loop_lock
+    _loop, _loop_lock = None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _run_on_llm_loop(coro):
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    loop = _llm_loop()
+    if running is loop:
+        raise RuntimeError("CallPolicy.invoke called from the LLM loop; use ainvoke")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
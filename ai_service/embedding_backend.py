@@ -0,0 +1,200 @@
+"""
+embedding_backend.py
+--------------------
+Selectable sentence encoder for query (run_rag) and document
+(embeddings/embed_documents.py) embedding.
+
+✔ EMBEDDING_BACKEND=torch: SentenceTransformer on PyTorch (default)
+✔ EMBEDDING_BACKEND=onnx: the same model exported to ONNX and int8
+  dynamically quantized (embeddings/export_onnx.py), run on
+  onnxruntime's CPU provider with the `tokenizers` fast tokenizer;
+  no torch import at serving time
+✔ EMBEDDING_BACKEND=stub: deterministic feature-hashing encoder with no
+  model weights, for tests and ingestion dry runs
+✔ All expose `encode(texts, batch_size=...) -> float32 ndarray`, so
+  callers do not care which one they hold
+
+The ONNX encoder reproduces the SentenceTransformer head (mean pooling
+over the attention mask, then L2 normalisation when the source model
+has a Normalize module) from the encoder.json written at export time.
+onnxruntime and tokenizers are optional dependencies.
+"""
+
+import json
+import os
+import re
+import threading
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+EMBEDDING_ONNX_DIR = os.getenv("EMBEDDING_ONNX_DIR", f"vector_store/onnx/{EMBEDDING_MODEL}")
+# 0 lets onnxruntime use every physical core
+EMBEDDING_ONNX_THREADS = int(os.getenv("EMBEDDING_ONNX_THREADS", "0"))
+
+ONNX_MODEL_FILE = "model_int8.onnx"
+ONNX_CONFIG_FILE = "encoder.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+# -----------------------------
+# Pooling
+# -----------------------------
+def mean_pool(hidden: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """
+    Token embeddings (batch, seq, dim) -> sentence embeddings (batch, dim),
+    averaging only over real (non-padding) tokens.
+    """
+    mask = attention_mask[..., None].astype(np.float32)
+    summed = (hidden * mask).sum(axis=1)
+    return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+def cosine_parity(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """
+    Row-wise cosine similarity between two encoders' embeddings of the
+    same texts: {"min": ..., "mean": ...}.
+    """
+    cosine = (l2_normalize(reference) * l2_normalize(candidate)).sum(axis=1)
+    return {"min": round(float(cosine.min()), 5), "mean": round(float(cosine.mean()), 5)}
+
+
+# -----------------------------
+# ONNX Encoder
+# -----------------------------
+class OnnxEncoder:
+    def __init__(self, model_dir: str = EMBEDDING_ONNX_DIR, threads: int = EMBEDDING_ONNX_THREADS):
+        from tokenizers import Tokenizer  # optional dependency
+
+        with open(os.path.join(model_dir, ONNX_CONFIG_FILE)) as f:
+            self.config: Dict[str, Any] = json.load(f)
+        self.model_path = os.path.join(model_dir, self.config.get("model_file", ONNX_MODEL_FILE))
+        self.max_length = int(self.config.get("max_seq_length", 256))
+        self.normalize = bool(self.config.get("normalize", True))
+        self.threads = threads
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.max_length)
+        self.tokenizer.enable_padding(pad_id=int(self.config.get("pad_token_id", 0)))
+
+        self._session = None
+        self._session_pid: Optional[int] = None
+        self._input_names: List[str] = []
+        self._lock = threading.Lock()
+
+    def session(self):
+        """
+        InferenceSession of the current process. onnxruntime's thread pool
+        does not survive fork, so a preloaded encoder re-opens the session
+        in each worker on first use.
+        """
+        with self._lock:
+            if self._session is None or self._session_pid != os.getpid():
+                import onnxruntime as ort  # optional dependency
+
+                options = ort.SessionOptions()
+                options.intra_op_num_threads = self.threads
+                options.inter_op_num_threads = 1
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                self._session = ort.InferenceSession(
+                    self.model_path, options, providers=["CPUExecutionProvider"]
+                )
+                self._session_pid = os.getpid()
+                self._input_names = [i.name for i in self._session.get_inputs()]
+            return self._session
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        session = self.session()
+        encodings = self.tokenizer.encode_batch(texts)
+        feeds = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        (hidden,) = session.run(None, {name: feeds[name] for name in self._input_names})[:1]
+        return mean_pool(hidden, feeds["attention_mask"])
+
+    def encode(self, texts, batch_size: int = 32, normalize_embeddings: Optional[bool] = None, **_) -> np.ndarray:
+        """
+        Same call shape as SentenceTransformer.encode for the arguments
+        this repo uses; a single string returns a 1-D vector.
+        """
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if not texts:
+            return np.zeros((0, int(self.config.get("dimension", 0))), dtype=np.float32)
+
+        # Sorting by length keeps padding per batch small
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out = None
+        for start in range(0, len(texts), batch_size):
+            rows = order[start:start + batch_size]
+            vectors = self._encode_batch([texts[i] for i in rows])
+            if out is None:
+                out = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            out[rows] = vectors
+
+        normalize = self.normalize if normalize_embeddings is None else normalize_embeddings
+        if normalize:
+            out = l2_normalize(out)
+        return out[0] if single else out
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.config["dimension"])
+
+
+# -----------------------------
+# Stub Encoder
+# -----------------------------
+class StubEncoder:
+    """
+    Bag of hashed words; stable across processes (crc32, not hash()).
+    """
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def encode(self, texts, batch_size: int = 32, **_) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        out = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"\w+", text.lower()):
+                out[row, zlib.crc32(word.encode()) % self.dimension] += 1.0
+        out = l2_normalize(out)
+        return out[0] if single else out
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+
+# -----------------------------
+# Selection
+# -----------------------------
+def load_encoder(backend: Optional[str] = None, model: str = EMBEDDING_MODEL,
+                 threads: Optional[int] = None):
+    """
+    Encoder for EMBEDDING_BACKEND (or `backend`): "torch" | "onnx" | "stub".
+    `threads` caps the intra-op thread pool (default: library / env).
+    """
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+
+        if threads is not None:
+            import torch
+            torch.set_num_threads(threads)
+        return SentenceTransformer(model)
+    if backend == "onnx":
+        return OnnxEncoder(threads=EMBEDDING_ONNX_THREADS if threads is None else threads)
+    if backend == "stub":
+        return StubEncoder()
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {backend}")
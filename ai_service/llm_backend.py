@@ -0,0 +1,261 @@
+"""
+llm_backend.py
+--------------
+Pluggable chat-model backend used by every LLM call site.
+
+LLM_BACKEND selects the implementation:
+
+✔ openai  - ChatOpenAI (default)
+✔ stub    - fast deterministic local model, synthetic latency and
+            token rates (LLM_STUB_TTFT_MS, LLM_STUB_TOKENS_PER_S,
+            LLM_STUB_OUTPUT_TOKENS); no network, no API key
+✔ record  - ChatOpenAI, every completion appended to a cassette
+            (LLM_CASSETTE_PATH, JSONL)
+✔ replay  - completions served from the cassette, optionally with the
+            recorded latency (LLM_REPLAY_LATENCY=recorded)
+
+All backends return AIMessage with usage_metadata, so CallPolicy,
+tracing and cost accounting work unchanged.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langchain.schema import AIMessage
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", "tests/cassettes/llm.jsonl")
+LLM_REPLAY_LATENCY = os.getenv("LLM_REPLAY_LATENCY", "none")
+STUB_TTFT_MS = float(os.getenv("LLM_STUB_TTFT_MS", "0"))
+STUB_TOKENS_PER_S = float(os.getenv("LLM_STUB_TOKENS_PER_S", "0"))
+STUB_OUTPUT_TOKENS = int(os.getenv("LLM_STUB_OUTPUT_TOKENS", "40"))
+
+
+def _prompt_text(prompt: Any) -> str:
+    return prompt if isinstance(prompt, str) else str(prompt)
+
+
+def request_key(model: str, params: Dict[str, Any], prompt: Any) -> str:
+    """
+    Stable hash of model, generation parameters and rendered prompt.
+    """
+    payload = json.dumps(
+        {"model": model, "params": params, "prompt": _prompt_text(prompt)},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _usage(prompt: str, content: str) -> Dict[str, int]:
+    input_tokens = max(len(prompt) // 4, 1)
+    output_tokens = max(len(content) // 4, 1)
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": input_tokens + output_tokens,
+    }
+
+
+# -----------------------------
+# Stub
+# -----------------------------
+# (prompt prefix, responder(variable part of prompt) -> content)
+_stub_responders: List[Tuple[str, Callable[[str], str]]] = []
+
+
+def register_stub_responder(prefix: str, responder: Callable[[str], str]):
+    """
+    Let a call site give the stub a meaningful answer for its prompt,
+    e.g. the intent classifier returns a keyword intent.
+    """
+    _stub_responders.append((prefix, responder))
+
+
+class StubChatModel:
+    """
+    Deterministic local model: same prompt -> same answer.
+    Latency = ttft + output tokens / tokens_per_s.
+    """
+
+    def __init__(
+        self,
+        model: str = "stub",
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        ttft_ms: float = STUB_TTFT_MS,
+        tokens_per_s: float = STUB_TOKENS_PER_S,
+        output_tokens: int = STUB_OUTPUT_TOKENS
+    ):
+        self.model_name = f"stub:{model}"
+        self.temperature = temperature
+        self.ttft_ms = ttft_ms
+        self.tokens_per_s = tokens_per_s
+        self.output_tokens = min(output_tokens, max_tokens or output_tokens)
+
+    def _content(self, prompt: str) -> str:
+        for prefix, responder in _stub_responders:
+            if prompt.startswith(prefix):
+                return responder(prompt[len(prefix):])
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:8]
+        words = ["Stub", f"answer {digest}:"] + ["lorem"] * max(self.output_tokens - 3, 0)
+        return " ".join(words)
+
+    def _respond(self, prompt: Any) -> Tuple[AIMessage, float]:
+        text = _prompt_text(prompt)
+        content = self._content(text)
+        usage = _usage(text, content)
+        delay = self.ttft_ms / 1000
+        if self.tokens_per_s > 0:
+            delay += usage["output_tokens"] / self.tokens_per_s
+        return AIMessage(content=content, usage_metadata=usage), delay
+
+    async def ainvoke(self, prompt: Any) -> AIMessage:
+        message, delay = self._respond(prompt)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return message
+
+    def invoke(self, prompt: Any) -> AIMessage:
+        message, delay = self._respond(prompt)
+        if delay > 0:
+            time.sleep(delay)
+        return message
+
+
+# -----------------------------
+# Record / Replay
+# -----------------------------
+class Cassette:
+    """
+    JSONL file of recorded completions keyed by request_key.
+    """
+
+    def __init__(self, path: str = LLM_CASSETTE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(key)
+
+    def add(self, entry: Dict[str, Any]):
+        with self._lock:
+            self.entries[entry["key"]] = entry
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+class CassetteMiss(KeyError):
+    pass
+
+
+class RecordingChatModel:
+    def __init__(self, inner: Any, params: Dict[str, Any], cassette: Cassette):
+        self.inner = inner
+        self.model_name = getattr(inner, "model_name", None) or params["model"]
+        self.params = params
+        self.cassette = cassette
+
+    def _record(self, prompt: Any, message: AIMessage, latency_s: float):
+        self.cassette.add({
+            "key": request_key(self.model_name, self.params, prompt),
+            "model": self.model_name,
+            "prompt": _prompt_text(prompt),
+            "content": message.content,
+            "usage_metadata": dict(message.usage_metadata or {}),
+            "latency_s": round(latency_s, 4),
+        })
+
+    async def ainvoke(self, prompt: Any) -> AIMessage:
+        started = time.monotonic()
+        message = await self.inner.ainvoke(prompt)
+        self._record(prompt, message, time.monotonic() - started)
+        return message
+
+    def invoke(self, prompt: Any) -> AIMessage:
+        started = time.monotonic()
+        message = self.inner.invoke(prompt)
+        self._record(prompt, message, time.monotonic() - started)
+        return message
+
+
+class ReplayChatModel:
+    def __init__(self, params: Dict[str, Any], cassette: Cassette, replay_latency: str = LLM_REPLAY_LATENCY):
+        self.model_name = params["model"]
+        self.params = params
+        self.cassette = cassette
+        self.replay_latency = replay_latency == "recorded"
+
+    def _lookup(self, prompt: Any) -> Tuple[AIMessage, float]:
+        entry = self.cassette.get(request_key(self.model_name, self.params, prompt))
+        if entry is None:
+            raise CassetteMiss(f"No recorded completion for this {self.model_name} prompt")
+        message = AIMessage(
+            content=entry["content"],
+            usage_metadata=entry.get("usage_metadata") or _usage(_prompt_text(prompt), entry["content"]),
+            response_metadata={"replayed": True},
+        )
+        return message, entry.get("latency_s", 0.0) if self.replay_latency else 0.0
+
+    async def ainvoke(self, prompt: Any) -> AIMessage:
+        message, delay = self._lookup(prompt)
+        if delay:
+            await asyncio.sleep(delay)
+        return message
+
+    def invoke(self, prompt: Any) -> AIMessage:
+        message, delay = self._lookup(prompt)
+        if delay:
+            time.sleep(delay)
+        return message
+
+
+# -----------------------------
+# Factory
+# -----------------------------
+_cassettes: Dict[str, Cassette] = {}
+
+
+def _cassette(path: str) -> Cassette:
+    if path not in _cassettes:
+        _cassettes[path] = Cassette(path)
+    return _cassettes[path]
+
+
+def chat_model(
+    model: Optional[str],
+    temperature: float = 0.0,
+    max_tokens: Optional[int] = None,
+    backend: Optional[str] = None
+) -> Any:
+    """
+    Chat model for one call site on the configured backend.
+    """
+    backend = backend or LLM_BACKEND
+    model = model or "gpt-4o-mini"
+    params = {"model": model, "temperature": temperature, "max_tokens": max_tokens}
+
+    if backend == "stub":
+        return StubChatModel(model, temperature, max_tokens)
+    if backend == "replay":
+        return ReplayChatModel(params, _cassette(LLM_CASSETTE_PATH))
+
+    from langchain_openai import ChatOpenAI
+
+    kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+    llm = ChatOpenAI(model=model, temperature=temperature, **kwargs)
+    if backend == "record":
+        return RecordingChatModel(llm, params, _cassette(LLM_CASSETTE_PATH))
+    return llm
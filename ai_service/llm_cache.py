@@ -0,0 +1,174 @@
+"""
+llm_cache.py
+------------
+Persistent exact-match cache for LLM completions (SQLite).
+
+✔ Key = hash of model, generation parameters and rendered prompt
+  (llm_backend.request_key); prompts embed the live order / catalog
+  state, so a changed order naturally misses
+✔ Entries are tagged with the upstream data version (vector index
+  manifest); when the version changes, older entries are dropped
+✔ Size-bounded: least recently used rows are evicted past
+  LLM_CACHE_MAX_ENTRIES, plus an optional TTL
+✔ Shared across workers on the same host (SQLite WAL)
+
+Only answers from a policy's primary tier are stored; fallback tiers
+and deterministic renderers are never cached.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", "86400"))
+INDEX_MANIFEST_PATH = os.getenv("INDEX_MANIFEST_PATH", "vector_store/faiss_index/manifest.json")
+
+VERSION_CHECK_INTERVAL_S = 5.0
+EVICT_EVERY = 100           # puts between size checks
+
+
+def manifest_version(path: str = INDEX_MANIFEST_PATH) -> str:
+    """
+    Data version of the vector index / compiled policies, plus an
+    optional manual bump (LLM_CACHE_VERSION).
+    """
+    try:
+        with open(path) as f:
+            version = json.load(f).get("version", "")
+    except (OSError, ValueError):
+        version = ""
+    return f"{version}:{os.getenv('LLM_CACHE_VERSION', '')}"
+
+
+class LLMCache:
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        max_entries: int = LLM_CACHE_MAX_ENTRIES,
+        ttl_s: float = LLM_CACHE_TTL_S,
+        version_fn: Callable[[], str] = manifest_version,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.version_fn = version_fn
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._version: Optional[str] = None
+        self._version_checked_at = float("-inf")
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            " key TEXT PRIMARY KEY, version TEXT, model TEXT, content TEXT,"
+            " created REAL, accessed REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS completions_accessed ON completions (accessed)")
+
+    # -----------------------------
+    # Data Version
+    # -----------------------------
+    def version(self) -> str:
+        """
+        Current data version; re-read at most every few seconds. Rows of
+        older versions are purged when it changes.
+        """
+        now = time.monotonic()
+        if now - self._version_checked_at < VERSION_CHECK_INTERVAL_S:
+            return self._version
+        self._version_checked_at = now
+        version = self.version_fn()
+        if version != self._version:
+            with self._lock:
+                self._db.execute("DELETE FROM completions WHERE version != ?", (version,))
+            self._version = version
+        return version
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def get(self, key: str) -> Optional[str]:
+        version = self.version()
+        now = self.clock()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content, created FROM completions WHERE key = ? AND version = ?",
+                (key, version)
+            ).fetchone()
+            if row is None:
+                return None
+            content, created = row
+            if self.ttl_s and now - created > self.ttl_s:
+                self._db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE completions SET accessed = ? WHERE key = ?", (now, key))
+        return content
+
+    def put(self, key: str, model: str, content: str):
+        version = self.version()
+        now = self.clock()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?)",
+                (key, version, model, content, now, now)
+            )
+            self._puts += 1
+            if self._puts % EVICT_EVERY == 0 or self.max_entries < EVICT_EVERY:
+                self._evict()
+
+    def _evict(self):
+        (count,) = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM completions WHERE key IN ("
+                " SELECT key FROM completions ORDER BY accessed LIMIT ?)",
+                (excess,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM completions")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (count,) = self._db.execute("SELECT COUNT(*) FROM completions").fetchone()
+        return {"entries": count, "max_entries": self.max_entries, "version": self._version}
+
+
+_llm_cache: Optional[LLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    # SQLite connections must not cross fork; each worker opens its own
+    global _llm_cache, _llm_cache_lock
+    _llm_cache, _llm_cache_lock = None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Process-wide cache, or None when LLM_CACHE_ENABLED is off.
+    """
+    global _llm_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+        return _llm_cache
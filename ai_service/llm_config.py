@@ -1,8 +1,4 @@
 import os
-from langchain_openai import ChatOpenAI
-
-llm = ChatOpenAI(
-    model=os.getenv("MODEL_NAME"),
-    temperature=0.2
-)
+from ai_service.llm_backend import chat_model
 
+llm = chat_model(os.getenv("MODEL_NAME"), temperature=0.2)
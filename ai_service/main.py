@@ -1,9 +1,27 @@
-from fastapi import FastAPI
-from ai_service.rag_pipeline import run_rag
+from typing import Optional
+from fastapi import APIRouter, FastAPI, Header
+from api_gateway.admission import run_admitted
+from ai_service.prompt_templates import PROMPTS
+from service.lazy import lazy_import
 
-app = FastAPI()
+# torch / sentence-transformers / FAISS / LLM clients load on first use
+run_rag = lazy_import("ai_service.rag_pipeline", "run_rag")
+
+router = APIRouter()
 
-@app.get("/ask")
-def ask_ai(q: str):
-    return {"response": run_rag(q)}
+@router.get("/ask")
+async def ask_ai(
+    q: str,
+    x_api_key: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None)
+):
+    response = await run_admitted(run_rag, q, x_api_key=x_api_key, authorization=authorization)
+    return {"response": response}
 
+@router.get("/prompts/tokens")
+def prompt_tokens():
+    return PROMPTS.token_report()
+
+# Standalone RAG service; service/app.py mounts `router` in the unified app
+app = FastAPI()
+app.include_router(router)
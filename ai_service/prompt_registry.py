@@ -0,0 +1,144 @@
+"""
+prompt_registry.py
+------------------
+Registry of precompiled prompt templates.
+
+✔ Templates parsed once at import time, not per request
+✔ Static instructions first -> byte-identical prefix for provider-side
+  prompt caching; per-request fields always come last
+✔ Prompt token counts per template (static prefix + rendered average);
+  renders only add up characters, one in PROMPT_TOKEN_SAMPLE_EVERY is
+  tokenized to calibrate tokens per character
+"""
+
+import os
+import threading
+from string import Formatter
+from typing import Any, Dict, List, Optional
+
+# Exact tokenization of one render in N (the first always)
+TOKEN_SAMPLE_EVERY = max(int(os.getenv("PROMPT_TOKEN_SAMPLE_EVERY", "32")), 1)
+
+# -----------------------------
+# Token Counting
+# -----------------------------
+_encoding = None
+_encoding_loaded = False
+
+
+def count_tokens(text: str) -> int:
+    """
+    Token count using the gpt-4o tokenizer when tiktoken is available,
+    otherwise a ~4 chars/token estimate.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _encoding = None
+        _encoding_loaded = True
+
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return max(len(text) // 4, 1) if text else 0
+
+
+# -----------------------------
+# Compiled Prompt
+# -----------------------------
+class CompiledPrompt:
+    """
+    A prompt split into a static instruction prefix and a variable
+    section. `format` keeps the PromptTemplate call signature.
+    """
+
+    def __init__(self, name: str, instructions: str, template: str):
+        self.name = name
+        self.prefix = instructions.strip() + "\n\n"
+        self.template = template.strip() + "\n"
+        self._parts = list(Formatter().parse(self.template))
+        self.input_variables: List[str] = [
+            field for _, field, _, _ in self._parts if field
+        ]
+
+        if any(field for _, field, _, _ in Formatter().parse(self.prefix)):
+            raise ValueError(f"Prompt '{name}' has variables in its static prefix")
+
+        self._prefix_tokens: Optional[int] = None
+        self._lock = threading.Lock()
+        self._renders = 0
+        self._variable_chars = 0
+        self._sampled_chars = 0
+        self._sampled_tokens = 0
+
+    @property
+    def prefix_tokens(self) -> int:
+        # Counted on first use so importing the registry does not load tiktoken
+        if self._prefix_tokens is None:
+            self._prefix_tokens = count_tokens(self.prefix)
+        return self._prefix_tokens
+
+    def format(self, **values: Any) -> str:
+        chunks = []
+        for literal, field, spec, _ in self._parts:
+            chunks.append(literal)
+            if field is not None:
+                chunks.append(format(values[field], spec or ""))
+        variable_part = "".join(chunks)
+
+        # Hot path: count characters; tokenize only a sample
+        with self._lock:
+            sample = self._renders % TOKEN_SAMPLE_EVERY == 0
+            self._renders += 1
+            self._variable_chars += len(variable_part)
+        if sample:
+            tokens = count_tokens(variable_part)
+            with self._lock:
+                self._sampled_chars += len(variable_part)
+                self._sampled_tokens += tokens
+
+        return self.prefix + variable_part
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            renders = self._renders
+            tokens_per_char = self._sampled_tokens / self._sampled_chars if self._sampled_chars else 0.0
+            average = self._variable_chars * tokens_per_char / renders if renders else 0.0
+        return {
+            "prefix_tokens": self.prefix_tokens,
+            "avg_variable_tokens": round(average, 1),
+            "avg_prompt_tokens": round(self.prefix_tokens + average, 1),
+            "renders": renders,
+            "sampled_renders": (renders + TOKEN_SAMPLE_EVERY - 1) // TOKEN_SAMPLE_EVERY,
+        }
+
+
+# -----------------------------
+# Registry
+# -----------------------------
+class PromptRegistry:
+    def __init__(self):
+        self._prompts: Dict[str, CompiledPrompt] = {}
+
+    def register(self, name: str, instructions: str, template: str) -> CompiledPrompt:
+        prompt = CompiledPrompt(name, instructions, template)
+        self._prompts[name] = prompt
+        return prompt
+
+    def get(self, name: str) -> CompiledPrompt:
+        return self._prompts[name]
+
+    def names(self) -> List[str]:
+        return sorted(self._prompts)
+
+    def token_report(self, name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Prompt token counts per template.
+        """
+        names = [name] if name else self.names()
+        return {n: self._prompts[n].stats() for n in names}
+
+
+PROMPTS = PromptRegistry()
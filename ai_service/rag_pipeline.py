@@ -1,24 +1,51 @@
-import faiss
-from sentence_transformers import SentenceTransformer
-from langchain.prompts import PromptTemplate
+import threading
 from ai_service.llm_config import llm
-from ai_service.prompt_templates import RAG_PROMPT
+from ai_service.call_policy import CallPolicy, fallback_llm, node_budget
+from ai_service.prompt_templates import PROMPTS
+
+INDEX_PATH = "vector_store/faiss_index/index.bin"
+
+llm_policy = CallPolicy(
+    "rag",
+    [llm, fallback_llm(0.2)],
+    renderer=lambda: "Information not available"
+)
+rag_prompt = PROMPTS.get("rag")
+
+# Embedding model and FAISS index: loaded once per process and shared by
+# every caller (/ask, agents in the unified service)
+_resources = None
+_resources_lock = threading.Lock()
+
+
+def rag_resources():
+    """
+    (query encoder, FAISS index), loaded on first use or at warm-up.
+    The encoder follows EMBEDDING_BACKEND (ai_service/embedding_backend.py).
+    """
+    global _resources
+    with _resources_lock:
+        if _resources is None:
+            import faiss
+            from ai_service.embedding_backend import load_encoder
+
+            _resources = (load_encoder(), faiss.read_index(INDEX_PATH))
+        return _resources
+
+
+def warm_up():
+    model, _ = rag_resources()
+    model.encode(["warm-up"])
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
-index = faiss.read_index("vector_store/faiss_index/index.bin")
 
 def run_rag(query):
+    model, index = rag_resources()
     query_vec = model.encode([query])
     _, idx = index.search(query_vec, 5)
 
     context = "Retrieved enterprise data based on similarity search"
 
-    prompt = PromptTemplate(
-        template=RAG_PROMPT,
-        input_variables=["context", "question"]
-    )
-
-    return llm.invoke(
-        prompt.format(context=context, question=query)
-    ).content
-
+    with node_budget("rag"):
+        return llm_policy.invoke(
+            rag_prompt.format(context=context, question=query)
+        ).content
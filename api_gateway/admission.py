@@ -0,0 +1,296 @@
+"""
+admission.py
+------------
+Admission control for the gateway's LLM-backed endpoints.
+
+✔ Bounded concurrency: at most GATEWAY_MAX_IN_FLIGHT workflows run at once,
+  on a dedicated worker pool (health checks never wait behind them)
+✔ Bounded queueing: a request waits at most its lane's queue budget,
+  and the queue itself is capped
+✔ Priority lanes: a freed slot goes to the highest-priority waiter
+  (CSR / admin before internal agents before mobile customers, per ROLE_MAP)
+✔ Early 503 with Retry-After instead of an unbounded backlog
+✔ In-flight / queue depth exported as gateway_* gauges
+
+Callers over their rate limit or LLM-token quota (rate_limit.py) are
+rejected with 429 before they take a queue position.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from api_gateway.auth import identify_caller
+from api_gateway.rate_limit import RateLimited, rate_limiter
+from observability.exporters import PrometheusExporter
+from observability.tracer import get_exporter, meter_llm_usage
+
+MAX_IN_FLIGHT = int(os.getenv("GATEWAY_MAX_IN_FLIGHT", "16"))
+MAX_QUEUE = int(os.getenv("GATEWAY_MAX_QUEUE", "64"))
+
+# Lane -> (priority, max queue wait seconds); lower priority value wins
+LANES = {
+    "csr": (0, float(os.getenv("GATEWAY_CSR_MAX_WAIT_S", "5.0"))),
+    "internal": (1, float(os.getenv("GATEWAY_INTERNAL_MAX_WAIT_S", "3.0"))),
+    "customer": (2, float(os.getenv("GATEWAY_CUSTOMER_MAX_WAIT_S", "1.0"))),
+}
+DEFAULT_LANE = "customer"
+
+ROLE_LANES = {
+    "ADMIN": "csr",
+    "CSR": "csr",
+    "AI_AGENT": "internal",
+    "CUSTOMER": "customer",
+}
+
+
+def lane_for_caller(caller: Dict[str, Any]) -> str:
+    """
+    Best lane among the caller's roles; unknown callers get the lowest.
+    """
+    lanes = [ROLE_LANES[role] for role in caller["roles"] if role in ROLE_LANES]
+    return min(lanes, key=lambda lane: LANES[lane][0], default=DEFAULT_LANE)
+
+
+def lane_for_headers(x_api_key: Optional[str], authorization: Optional[str]) -> str:
+    return lane_for_caller(identify_caller(x_api_key, authorization))
+
+
+class Overloaded(Exception):
+    def __init__(self, lane: str, retry_after: int):
+        super().__init__(f"Gateway overloaded ({lane} lane)")
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Slot-based admission with a priority queue of waiters. A released
+    slot is handed directly to the next waiter, so a burst cannot
+    barge ahead of requests already queued.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        max_queue: int = MAX_QUEUE,
+        lanes: Dict[str, tuple] = LANES
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.lanes = lanes
+        self.in_flight = 0
+        self._waiters: List[list] = []     # heap of [priority, seq, future]
+        self._queued = 0
+        self._seq = itertools.count()
+        self._service_s = 1.0              # EWMA of admitted request time
+        self.admitted = 0
+        self.shed: Dict[str, int] = {lane: 0 for lane in lanes}
+        self.draining = False
+
+    # -----------------------------
+    # Slots
+    # -----------------------------
+    async def acquire(self, lane: str):
+        priority, max_wait_s = self.lanes.get(lane, self.lanes[DEFAULT_LANE])
+
+        if self.draining:
+            self._reject(lane)
+        if self.in_flight < self.max_in_flight and not self._queued:
+            self.in_flight += 1
+            self.admitted += 1
+            self._export()
+            return
+        if self._queued >= self.max_queue:
+            self._reject(lane)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = [priority, next(self._seq), future]
+        heapq.heappush(self._waiters, entry)
+        self._queued += 1
+        self._export()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), max_wait_s)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # Slot handed over just as the wait expired: give it back
+                self.release()
+            else:
+                future.cancel()
+                self._queued -= 1
+            self._reject(lane)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                future.cancel()
+                self._queued -= 1
+            raise
+        self.admitted += 1
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            # The slot passes to the waiter; in_flight is unchanged
+            self._queued -= 1
+            future.set_result(None)
+            self._export()
+            return
+        self.in_flight -= 1
+        self._export()
+
+    def _reject(self, lane: str):
+        self.shed[lane] = self.shed.get(lane, 0) + 1
+        self._export()
+        raise Overloaded(lane, self.retry_after())
+
+    def retry_after(self) -> int:
+        """
+        Seconds until the current backlog should have drained.
+        """
+        backlog = self._queued + self.in_flight
+        return max(1, math.ceil(backlog / self.max_in_flight * self._service_s))
+
+    def observe(self, seconds: float):
+        self._service_s = 0.8 * self._service_s + 0.2 * seconds
+
+    @asynccontextmanager
+    async def admit(self, lane: str):
+        await self.acquire(lane)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - started)
+            self.release()
+
+    async def drain(self, timeout_s: float) -> bool:
+        """
+        Stop admitting new work and wait for admitted / queued requests
+        to finish. Returns False if the timeout expired first.
+        """
+        self.draining = True
+        deadline = time.monotonic() + timeout_s
+        while self.pending and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        return not self.pending
+
+    @property
+    def pending(self) -> int:
+        """
+        Admitted plus queued requests.
+        """
+        return self.in_flight + self._queued
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self._queued,
+            "max_in_flight": self.max_in_flight,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "draining": self.draining,
+        }
+
+    def _export(self):
+        exporter = get_exporter(PrometheusExporter)
+        if exporter is not None:
+            exporter.set_gauge("gateway_in_flight", self.in_flight)
+            exporter.set_gauge("gateway_queue_depth", self._queued)
+
+
+# -----------------------------
+# Worker Pool
+# -----------------------------
+# Workflows are sync (agents, CallPolicy.invoke); they run here rather than
+# on the framework threadpool so admitted work is capped at MAX_IN_FLIGHT.
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def shutdown_worker_pool():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def _reset_after_fork():
+    global _executor, _executor_lock
+    _executor, _executor_lock = None, threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _worker_pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(MAX_IN_FLIGHT, thread_name_prefix="gateway-worker")
+        return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_worker_pool(), fn, *args)
+
+
+admission = AdmissionController()
+
+
+def _metered(caller: Dict[str, Any], fn: Callable[..., Any], *args: Any) -> Any:
+    # Charged even when the workflow fails: the tokens were spent
+    with meter_llm_usage() as usage:
+        try:
+            return fn(*args)
+        finally:
+            rate_limiter.charge(caller, usage["prompt_tokens"] + usage["completion_tokens"])
+
+
+async def run_admitted(
+    fn: Callable[..., Any],
+    *args: Any,
+    x_api_key: Optional[str] = None,
+    authorization: Optional[str] = None
+) -> Any:
+    """
+    Run a blocking workflow under rate limits and admission control:
+    429 when the caller is over its rate / quota, 503 when the gateway
+    is saturated, both with Retry-After.
+    """
+    caller = identify_caller(x_api_key, authorization)
+    try:
+        rate_limiter.check(caller)
+    except RateLimited as ex:
+        raise HTTPException(
+            status_code=429,
+            detail=str(ex),
+            headers={"Retry-After": str(ex.retry_after)}
+        )
+
+    try:
+        async with admission.admit(lane_for_caller(caller)):
+            return await run_blocking(_metered, caller, fn, *args)
+    except Overloaded as ex:
+        raise HTTPException(
+            status_code=503,
+            detail=str(ex),
+            headers={"Retry-After": str(ex.retry_after)}
+        )
@@ -9,15 +9,23 @@ Supports:
 ✔ Role-Based Access Control (RBAC)
 ✔ Token Expiry Enforcement
 ✔ Secure Error Responses
+✔ Verified-token cache (claims reused until the token's exp)
+✔ Hashed API-key index with constant-time comparison
+✔ RBAC decisions as precomputed role bitsets
 
 Used by: AI Gateway, Agent Services, RAG APIs
 """
 
+import hashlib
+import hmac
 import os
+import threading
+import time
 import jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Header
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 
 # -----------------------------
 # Secret Keys & Configurations
@@ -37,6 +45,27 @@ ROLE_MAP = {
     "mobile-app": ["CUSTOMER"]
 }
 
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_MAX_TTL_S = float(os.getenv("AUTH_TOKEN_CACHE_MAX_TTL_S", "300"))
+
+
+def _digest(value: str) -> bytes:
+    return hashlib.sha256(value.encode()).digest()
+
+
+# sha256(key) -> (client, key): O(1) lookup, no early-exit scan over keys
+API_KEY_INDEX = {_digest(key): (client, key) for client, key in API_KEYS.items()}
+
+# Role bitsets: one bit per role, one mask per client
+ROLE_BITS = {
+    role: 1 << i
+    for i, role in enumerate(sorted({r for roles in ROLE_MAP.values() for r in roles}))
+}
+CLIENT_ROLE_MASKS = {
+    client: sum(ROLE_BITS[role] for role in roles)
+    for client, roles in ROLE_MAP.items()
+}
+
 # -----------------------------
 # JWT Utility Functions
 # -----------------------------
@@ -53,16 +82,66 @@ def generate_jwt(user_id: str, role: str, expires_in_minutes: int = 60) -> str:
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+class VerifiedTokenCache:
+    """
+    LRU of verified claims keyed by token digest. An entry is only
+    served until the token's own exp (capped at TOKEN_CACHE_MAX_TTL_S),
+    so expiry is enforced exactly as by a full verification.
+    """
+
+    def __init__(self, max_entries: int = TOKEN_CACHE_MAX_ENTRIES, max_ttl_s: float = TOKEN_CACHE_MAX_TTL_S):
+        self.max_entries = max_entries
+        self.max_ttl_s = max_ttl_s
+        self._entries: "OrderedDict[bytes, Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Dict]:
+        key = _digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, valid_until = entry
+            if valid_until <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(claims)
+
+    def put(self, token: str, claims: Dict):
+        valid_until = time.time() + self.max_ttl_s
+        if "exp" in claims:
+            valid_until = min(valid_until, float(claims["exp"]))
+        key = _digest(token)
+        with self._lock:
+            self._entries[key] = (dict(claims), valid_until)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache()
+
+
 def decode_jwt(token: str) -> Dict:
     """
-    Decode and validate JWT token.
+    Decode and validate JWT token (signature checked once per token).
     """
+    claims = verified_tokens.get(token)
+    if claims is not None:
+        return claims
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    verified_tokens.put(token, claims)
+    return claims
 
 
 # -----------------------------
@@ -75,11 +154,24 @@ def validate_api_key(x_api_key: Optional[str] = Header(None)) -> str:
     if x_api_key is None:
         raise HTTPException(status_code=401, detail="Missing API key")
 
-    for client_name, key in API_KEYS.items():
-        if x_api_key == key:
-            return client_name
+    client_name = client_for_api_key(x_api_key)
+    if client_name is None:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    return client_name
 
-    raise HTTPException(status_code=401, detail="Invalid API key")
+
+def client_for_api_key(x_api_key: str) -> Optional[str]:
+    """
+    Client owning the key, or None. The index is keyed by digest and the
+    final check is constant-time, so timing does not reveal key prefixes.
+    """
+    entry = API_KEY_INDEX.get(_digest(x_api_key))
+    if entry is None:
+        return None
+    client_name, key = entry
+    if not hmac.compare_digest(x_api_key.encode(), key.encode()):
+        return None
+    return client_name
 
 # -----------------------------
 # Authorization (RBAC)
@@ -88,14 +180,16 @@ def authorize_role(client_name: str, required_role: str):
     """
     Ensure the calling client has the required role.
     """
-    allowed_roles = ROLE_MAP.get(client_name, [])
-
-    if required_role not in allowed_roles:
+    if not has_role(client_name, required_role):
         raise HTTPException(
             status_code=403,
             detail=f"Access denied. Role '{required_role}' required."
         )
 
+
+def has_role(client_name: str, role: str) -> bool:
+    return bool(CLIENT_ROLE_MASKS.get(client_name, 0) & ROLE_BITS.get(role, 0))
+
 # -----------------------------
 # Combined Authentication Wrapper
 # -----------------------------
@@ -125,6 +219,42 @@ def authenticate_request(
     raise HTTPException(status_code=401, detail="Unauthorized request")
 
 
+# -----------------------------
+# Caller Identity (non-enforcing)
+# -----------------------------
+def client_for_role(role: Optional[str]) -> str:
+    """
+    Client an end-user JWT is attributed to, e.g. CSR -> csr-portal.
+    """
+    for client_name, roles in ROLE_MAP.items():
+        if role in roles:
+            return client_name
+    return "anonymous"
+
+
+def identify_caller(
+    x_api_key: Optional[str] = None,
+    authorization: Optional[str] = None
+) -> Dict:
+    """
+    Best-effort identity used for scheduling and rate limiting.
+    Never raises; unknown callers are "anonymous".
+    """
+    if x_api_key:
+        client_name = client_for_api_key(x_api_key)
+        if client_name is not None:
+            return {"client_name": client_name, "user_id": None, "roles": ROLE_MAP[client_name]}
+    if authorization:
+        try:
+            payload = decode_jwt(authorization.replace("Bearer ", ""))
+        except HTTPException:
+            payload = None
+        if payload:
+            role = payload.get("role")
+            return {"client_name": client_for_role(role), "user_id": payload.get("user_id"), "roles": [role]}
+    return {"client_name": "anonymous", "user_id": None, "roles": []}
+
+
 # -----------------------------
 # Example Usage
 # -----------------------------
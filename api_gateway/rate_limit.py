@@ -0,0 +1,293 @@
+"""
+rate_limit.py
+-------------
+Per-client and per-user rate limits and daily LLM-token quotas.
+
+✔ Token bucket per client (auth.API_KEYS / ROLE_MAP) and per end user:
+  O(1) state per key (tokens, last refill)
+✔ Daily LLM-token quota per client and per user, charged with the
+  tokens a request actually consumed (observability.meter_llm_usage)
+✔ 429 with Retry-After (bucket refill or next UTC midnight)
+✔ Pluggable store: in-process (default, used in tests) or Redis shared
+  across workers (GATEWAY_RATE_STORE=redis://...)
+✔ Current usage exposed per caller (GET /usage) and as the
+  gateway_llm_tokens_today gauge
+
+Limits are overridable per client: GATEWAY_RATE_<CLIENT>="rps,burst",
+GATEWAY_QUOTA_<CLIENT>=<tokens/day> (CLIENT upper-cased, "-" -> "_").
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from observability.exporters import PrometheusExporter
+from observability.tracer import get_exporter
+
+RATE_STORE = os.getenv("GATEWAY_RATE_STORE", "local")
+
+# client -> (requests per second, burst)
+RATE_LIMITS = {
+    "internal-ai-service": (50.0, 100),
+    "csr-portal": (20.0, 40),
+    "mobile-app": (30.0, 60),
+    "anonymous": (2.0, 5),
+}
+USER_RATE_LIMIT = (1.0, 5)
+
+# client -> LLM tokens per UTC day
+DAILY_TOKEN_QUOTAS = {
+    "internal-ai-service": 20_000_000,
+    "csr-portal": 5_000_000,
+    "mobile-app": 2_000_000,
+    "anonymous": 100_000,
+}
+USER_DAILY_TOKEN_QUOTA = int(os.getenv("GATEWAY_USER_DAILY_TOKENS", "200000"))
+
+DAY_S = 86400
+
+
+def _env_name(client: str) -> str:
+    return client.upper().replace("-", "_")
+
+
+def rate_limit(client: str) -> Tuple[float, int]:
+    override = os.getenv(f"GATEWAY_RATE_{_env_name(client)}")
+    if override:
+        rate, burst = override.split(",")
+        return float(rate), int(burst)
+    return RATE_LIMITS.get(client, RATE_LIMITS["anonymous"])
+
+
+def daily_quota(client: str) -> int:
+    override = os.getenv(f"GATEWAY_QUOTA_{_env_name(client)}")
+    if override:
+        return int(override)
+    return DAILY_TOKEN_QUOTAS.get(client, DAILY_TOKEN_QUOTAS["anonymous"])
+
+
+class RateLimited(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+# ---------------------------------------------------------
+# Stores
+# ---------------------------------------------------------
+
+class LocalStore:
+    """
+    In-process store; the stand-in for the shared one. Like the Redis
+    keys, idle state expires: buckets once they have refilled (a full
+    bucket is the same as no bucket) and counters past their TTL, swept
+    at most every SWEEP_INTERVAL_S.
+    """
+
+    SWEEP_INTERVAL_S = 60.0
+
+    def __init__(self):
+        self._buckets: Dict[str, list] = {}      # key -> [tokens, updated, full_at]
+        self._counters: Dict[str, list] = {}     # key -> [value, expires_at]
+        self._lock = threading.Lock()
+        self._next_sweep = float("-inf")
+
+    def _refill(self, key: str, rate: float, burst: int, now: float) -> list:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(burst), now, now]
+        bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        return bucket
+
+    def take_many(self, buckets: List[Tuple[str, float, int]], now: float) -> Tuple[float, int]:
+        """
+        Take one token from every (key, rate, burst) bucket, or from none.
+        Returns (0, -1) when allowed, else (seconds until a token is
+        available, index of the bucket that is short).
+        """
+        with self._lock:
+            self._maybe_sweep(now)
+            refilled = [self._refill(key, rate, burst, now) for key, rate, burst in buckets]
+            for index, (bucket, (_, rate, _)) in enumerate(zip(refilled, buckets)):
+                if bucket[0] < 1:
+                    return (1 - bucket[0]) / rate, index
+            for bucket, (_, rate, burst) in zip(refilled, buckets):
+                bucket[0] -= 1
+                bucket[2] = now + (burst - bucket[0]) / rate
+            return 0.0, -1
+
+    def take(self, key: str, rate: float, burst: int, now: float) -> float:
+        """
+        Take one token; returns 0 when allowed, else seconds until a
+        token is available.
+        """
+        return self.take_many([(key, rate, burst)], now)[0]
+
+    def incr(self, key: str, amount: int, ttl_s: float, now: float) -> int:
+        with self._lock:
+            self._maybe_sweep(now)
+            counter = self._counters.get(key)
+            if counter is None or counter[1] <= now:
+                counter = self._counters[key] = [0, now + ttl_s]
+            counter[0] += amount
+            return counter[0]
+
+    def get(self, key: str, now: float) -> int:
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or counter[1] <= now:
+                self._counters.pop(key, None)
+                return 0
+            return counter[0]
+
+    def _maybe_sweep(self, now: float):
+        # Caller holds _lock
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.SWEEP_INTERVAL_S
+        for key in [k for k, b in self._buckets.items() if b[2] <= now]:
+            del self._buckets[key]
+        for key in [k for k, c in self._counters.items() if c[1] <= now]:
+            del self._counters[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets) + len(self._counters)
+
+
+class RedisStore:
+    """
+    Shared across workers. The bucket refill runs as one Lua script so
+    concurrent workers cannot over-spend a bucket.
+    """
+
+    # ARGV = now, rate1, burst1, rate2, burst2, ...; all buckets or none
+    TAKE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local tokens = {}
+for i, key in ipairs(KEYS) do
+  local rate, burst = tonumber(ARGV[2 * i]), tonumber(ARGV[2 * i + 1])
+  local t = tonumber(redis.call('HGET', key, 't') or burst)
+  local u = tonumber(redis.call('HGET', key, 'u') or now)
+  tokens[i] = math.min(burst, t + (now - u) * rate)
+  if tokens[i] < 1 then return {i - 1, tostring((1 - tokens[i]) / rate)} end
+end
+for i, key in ipairs(KEYS) do
+  local rate, burst = tonumber(ARGV[2 * i]), tonumber(ARGV[2 * i + 1])
+  redis.call('HSET', key, 't', tokens[i] - 1, 'u', now)
+  redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+return {-1, '0'}
+"""
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        import redis  # optional dependency
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(self.TAKE_SCRIPT)
+
+    def take_many(self, buckets: List[Tuple[str, float, int]], now: float) -> Tuple[float, int]:
+        args: List[float] = [now]
+        for _, rate, burst in buckets:
+            args += [rate, burst]
+        index, wait = self._take(keys=[self.prefix + key for key, _, _ in buckets], args=args)
+        return float(wait), int(index)
+
+    def take(self, key: str, rate: float, burst: int, now: float) -> float:
+        return self.take_many([(key, rate, burst)], now)[0]
+
+    def incr(self, key: str, amount: int, ttl_s: float, now: float) -> int:
+        pipe = self.client.pipeline()
+        pipe.incrby(self.prefix + key, amount)
+        pipe.expire(self.prefix + key, int(ttl_s) + 1)
+        return int(pipe.execute()[0])
+
+    def get(self, key: str, now: float) -> int:
+        return int(self.client.get(self.prefix + key) or 0)
+
+
+def store_from_env(spec: str = RATE_STORE):
+    if spec.startswith(("redis://", "rediss://")):
+        return RedisStore(spec)
+    return LocalStore()
+
+
+# ---------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------
+
+class RateLimiter:
+    def __init__(self, store=None, clock: Callable[[], float] = time.time):
+        self.store = store if store is not None else LocalStore()
+        self.clock = clock
+
+    def _day(self, now: float) -> str:
+        return datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+
+    def _until_midnight(self, now: float) -> int:
+        today = datetime.fromtimestamp(now, timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        return max(int((today + timedelta(days=1)).timestamp() - now), 1)
+
+    def _scopes(self, caller: Dict[str, Any]):
+        """
+        (scope key, (rps, burst), daily quota) for the client and, if
+        known, the end user.
+        """
+        client = caller["client_name"]
+        yield f"client:{client}", rate_limit(client), daily_quota(client)
+        if caller.get("user_id"):
+            yield f"user:{caller['user_id']}", USER_RATE_LIMIT, USER_DAILY_TOKEN_QUOTA
+
+    def check(self, caller: Dict[str, Any]):
+        """
+        Admit one request or raise RateLimited.
+        """
+        now = self.clock()
+        day = self._day(now)
+        scopes = list(self._scopes(caller))
+
+        for scope, _, quota in scopes:
+            if self.store.get(f"tokens:{day}:{scope}", now) >= quota:
+                raise RateLimited(f"Daily LLM token quota exhausted for {scope}", self._until_midnight(now))
+        # Client and user buckets are spent together: a throttled user must
+        # not drain the bucket shared by everyone on the same client
+        wait, index = self.store.take_many(
+            [(f"bucket:{scope}", rate, burst) for scope, (rate, burst), _ in scopes], now
+        )
+        if index >= 0:
+            raise RateLimited(f"Rate limit exceeded for {scopes[index][0]}", max(int(wait + 0.999), 1))
+
+    def charge(self, caller: Dict[str, Any], tokens: int):
+        """
+        Add the LLM tokens a finished request consumed.
+        """
+        if tokens <= 0:
+            return
+        now = self.clock()
+        day = self._day(now)
+        exporter = get_exporter(PrometheusExporter)
+        for scope, _, _ in self._scopes(caller):
+            total = self.store.incr(f"tokens:{day}:{scope}", tokens, DAY_S, now)
+            if exporter is not None and scope.startswith("client:"):
+                exporter.set_gauge("gateway_llm_tokens_today", total, client=caller["client_name"])
+
+    def usage(self, caller: Dict[str, Any]) -> Dict[str, Any]:
+        now = self.clock()
+        day = self._day(now)
+        report = {"day": day}
+        for scope, (rate, burst), quota in self._scopes(caller):
+            used = self.store.get(f"tokens:{day}:{scope}", now)
+            report[scope] = {
+                "llm_tokens_used": used,
+                "llm_token_quota": quota,
+                "llm_tokens_remaining": max(quota - used, 0),
+                "requests_per_s": rate,
+                "burst": burst,
+            }
+        return report
+
+
+rate_limiter = RateLimiter(store_from_env())
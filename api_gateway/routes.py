@@ -1,9 +1,90 @@
-from fastapi import FastAPI
-from agent_service.agent_graph import agent_executor
+from typing import List, Optional
+from fastapi import APIRouter, FastAPI, Header
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from api_gateway.admission import admission, run_admitted
+from api_gateway.auth import identify_caller
+from api_gateway.rate_limit import rate_limiter
+from observability.exporters import PrometheusExporter
+from observability.tracer import get_exporter
+from service.lazy import lazy_import
+
+# langgraph / langchain / agents and numpy load on first use (or warm-up);
+# agent_executor is the multi-agent graph from build_agent_graph()
+agent_executor = lazy_import("agent_service.agent_graph", "get_agent_graph", call=True)
+get_pricing_engine = lazy_import("agents.pricing_engine", "get_pricing_engine")
+
+router = APIRouter()
+
+
+class ChatRequest(BaseModel):
+    user_query: str = Field(min_length=1)
+    customer_id: Optional[str] = None
+
+
+class QuoteLine(BaseModel):
+    sku: str = Field(min_length=1)
+    # Strict: "5" or 2.5 are rejected rather than coerced into the engine
+    quantity: int = Field(1, gt=0, strict=True)
 
-app = FastAPI()
 
-@app.post("/chat")
-def chat(payload: dict):
-    return agent_executor.invoke(payload)
+class QuoteRequest(BaseModel):
+    customer_id: Optional[str] = None
+    lines: List[QuoteLine] = Field(min_length=1)
+    include_lines: bool = True
 
+
+@router.get("/health")
+async def health():
+    # 503 while draining so load balancers stop routing here
+    if admission.draining:
+        return JSONResponse({"status": "draining", "admission": admission.stats()}, status_code=503)
+    return {"status": "ok", "admission": admission.stats()}
+
+@router.post("/chat")
+async def chat(
+    payload: ChatRequest,
+    x_api_key: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None)
+):
+    # Initial AgentState; the graph fills in intent, entities and result
+    state = {"user_query": payload.user_query, "customer_id": payload.customer_id}
+    return await run_admitted(
+        agent_executor.invoke, state,
+        x_api_key=x_api_key, authorization=authorization
+    )
+
+@router.get("/usage")
+async def usage(
+    x_api_key: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None)
+):
+    caller = identify_caller(x_api_key, authorization)
+    return {"client_name": caller["client_name"], **rate_limiter.usage(caller)}
+
+@router.post("/quote")
+async def quote(
+    payload: QuoteRequest,
+    x_api_key: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None)
+):
+    # Malformed lines (missing SKU, non-positive or non-integer quantity) get a 422;
+    # valid ones share /chat's rate limits, admission lanes and worker pool
+    return await run_admitted(
+        lambda: get_pricing_engine().quote(
+            payload.customer_id,
+            [line.sku for line in payload.lines],
+            [line.quantity for line in payload.lines],
+            include_lines=payload.include_lines
+        ),
+        x_api_key=x_api_key, authorization=authorization
+    )
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    exporter = get_exporter(PrometheusExporter)
+    return exporter.render() if exporter else ""
+
+# Standalone gateway; service/app.py mounts `router` in the unified app
+app = FastAPI()
+app.include_router(router)
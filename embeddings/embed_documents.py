@@ -1,26 +1,376 @@
-from sentence_transformers import SentenceTransformer
-import faiss
+"""
+embed_documents.py
+------------------
+Encode the catalog / pricing / policy sources into the FAISS index and
+write the build manifest.
+
+✔ Documents are streamed from the sources in one pass: .jsonl line by
+  line, top-level .json arrays element by element (other .json
+  documents are small config files and are read whole)
+✔ Embeddings are written row-block by row-block into a raw float32
+  file (EMBEDDINGS_PATH) and read back as a memmap; the row count is
+  not needed up front, so the corpus is never parsed twice
+✔ --workers N: chunks are fed through a bounded queue to N spawned
+  encoder processes, each pinned to one core and started with
+  single-threaded BLAS / OpenMP / onnxruntime; every worker writes its
+  rows at their offset in the shared file
+✔ Memory stays bounded by (workers x queue depth x chunk size) texts
+  plus one model per worker; the FAISS index is filled from the memmap
+  in blocks
+
+    PYTHONPATH=.:agent_service python -m embeddings.embed_documents --workers 8
+"""
+
+import argparse
+import hashlib
+import itertools
 import json
+import multiprocessing
 import os
+import queue
+import sys
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+from agents.policy_compiler import (
+    INDEX_MANIFEST_PATH, POLICY_SPEC_PATH, compile_policy, write_policy_table
+)
+from ai_service.embedding_backend import EMBEDDING_BACKEND, load_encoder
+
+SOURCES = ["data/products.json", "data/pricing_rules.json", "data/return_policy.txt"]
+INDEX_PATH = "vector_store/faiss_index/index.bin"
+# Raw row-major float32; shape is recorded in the index manifest
+EMBEDDINGS_PATH = os.getenv("EMBEDDINGS_PATH", "vector_store/faiss_index/embeddings.f32")
+
+INGEST_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "256"))
+INGEST_QUEUE_DEPTH = int(os.getenv("INGEST_QUEUE_DEPTH", "2"))     # chunks in flight per worker
+INDEX_ADD_BLOCK = 65536
+JSON_READ_BLOCK = 1 << 16
+EMBEDDING_DTYPE = np.float32
+
+# Worker processes get one core each; nested thread pools would oversubscribe.
+# Set in the environment the workers are spawned with, so it is in place
+# before they import numpy / torch / onnxruntime.
+WORKER_THREAD_ENV = {
+    "OMP_NUM_THREADS": "1",
+    "MKL_NUM_THREADS": "1",
+    "OPENBLAS_NUM_THREADS": "1",
+    "TOKENIZERS_PARALLELISM": "false",
+    "EMBEDDING_ONNX_THREADS": "1",
+}
+
+
+# -----------------------------
+# Sources
+# -----------------------------
+def iter_json_array(f: TextIO, block_size: int = JSON_READ_BLOCK) -> Iterator[Any]:
+    """
+    Elements of a top-level JSON array, decoded incrementally; holds at
+    most one element plus one read block in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = f.read(block_size).lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("not a JSON array")
+    pos, eof = 1, False
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = f.read(block_size), 0
+            eof = not buffer
+        if pos >= len(buffer):
+            raise ValueError("unterminated JSON array")
+        if buffer[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            if end == len(buffer) and not eof:
+                # A number or literal may continue in the next block
+                raise ValueError("element may be truncated")
+        except ValueError:
+            if eof:
+                raise
+            more = f.read(block_size)
+            eof = not more
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        yield item
+        pos = end
+
+
+def iter_json(f: TextIO) -> Iterator[Any]:
+    head = f.read(JSON_READ_BLOCK)
+    if head.lstrip().startswith("["):
+        f.seek(0)
+        yield from iter_json_array(f)
+    else:
+        yield from json.loads(head + f.read())
+
+
+def iter_documents(sources: List[str] = SOURCES) -> Iterator[Any]:
+    for file in sources:
+        with open(file) as f:
+            if file.endswith(".jsonl"):
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+            elif file.endswith(".json"):
+                yield from iter_json(f)
+            else:
+                yield {"content": f.read()}
+
+
+def iter_chunks(sources: List[str], chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+    """
+    (first row, texts) per chunk, in source order.
+    """
+    texts = (str(doc) for doc in iter_documents(sources))
+    start = 0
+    while True:
+        chunk = list(itertools.islice(texts, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+# -----------------------------
+# Output File
+# -----------------------------
+def write_rows(f, start: int, vectors: np.ndarray):
+    vectors = np.ascontiguousarray(vectors, dtype=EMBEDDING_DTYPE)
+    f.seek(start * vectors.shape[1] * vectors.itemsize)
+    f.write(vectors.tobytes())
+
+
+def open_embeddings(path: str, rows: int, dimension: int) -> np.ndarray:
+    if rows == 0:
+        return np.zeros((0, dimension), dtype=EMBEDDING_DTYPE)
+    return np.memmap(path, dtype=EMBEDDING_DTYPE, mode="r", shape=(rows, dimension))
+
+
+# -----------------------------
+# Serial Encoding
+# -----------------------------
+def encode_serial(sources: List[str], path: str, backend: str, chunk_size: int) -> np.ndarray:
+    encoder = load_encoder(backend)
+    dimension = encoder.get_sentence_embedding_dimension()
+    rows = 0
+    with open(path, "wb") as f:
+        for start, texts in iter_chunks(sources, chunk_size):
+            write_rows(f, start, encoder.encode(texts, batch_size=min(chunk_size, 64)))
+            rows = start + len(texts)
+    return open_embeddings(path, rows, dimension)
+
+
+# -----------------------------
+# Parallel Encoding
+# -----------------------------
+def pin_to_core(core: Optional[int]):
+    if core is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {core})
+
+
+def encoder_worker(index: int, core: Optional[int], backend: str, path: str, tasks, results):
+    """
+    Encode chunks from `tasks` into their rows of the file at `path`;
+    reports ("ready", dimension), ("done", rows) or ("error", traceback).
+    """
+    try:
+        pin_to_core(core)
+        encoder = load_encoder(backend, threads=1)
+        results.put(("ready", encoder.get_sentence_embedding_dimension()))
+
+        with open(path, "r+b") as f:
+            while True:
+                task = tasks.get()
+                if task is None:
+                    break
+                start, texts = task
+                write_rows(f, start, encoder.encode(texts, batch_size=min(len(texts), 64)))
+                results.put(("done", len(texts)))
+    except BaseException:
+        results.put(("error", f"worker {index}: {traceback.format_exc()}"))
+
+
+def available_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+@contextmanager
+def child_environ(overrides: Dict[str, str]):
+    """
+    Environment inherited by processes started inside the block.
+    """
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+class _Pool:
+    def __init__(self, workers: int, backend: str, path: str, queue_depth: int):
+        ctx = multiprocessing.get_context("spawn")
+        cores = available_cores()
+        self.tasks = ctx.Queue(maxsize=workers * queue_depth)
+        self.results = ctx.Queue()
+        self.done = 0
+        self.processes = [
+            ctx.Process(
+                target=encoder_worker,
+                args=(i, cores[i % len(cores)], backend, path, self.tasks, self.results),
+                daemon=True,
+            )
+            for i in range(workers)
+        ]
+        with child_environ(WORKER_THREAD_ENV):
+            for process in self.processes:
+                process.start()
+
+    def poll(self, timeout: float) -> Optional[Tuple[str, Any]]:
+        try:
+            message = self.results.get(timeout=timeout)
+        except queue.Empty:
+            if any(p.exitcode not in (None, 0) for p in self.processes):
+                raise RuntimeError("encoder worker died")
+            return None
+        kind, value = message
+        if kind == "error":
+            raise RuntimeError(value)
+        if kind == "done":
+            self.done += value
+        return message
+
+    def put(self, task):
+        # Blocks while the queue is full (backpressure on the reader),
+        # draining progress messages meanwhile
+        while True:
+            try:
+                self.tasks.put(task, timeout=0.1)
+                return
+            except queue.Full:
+                self.poll(0)
+
+    def close(self):
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+
+def encode_parallel(sources: List[str], path: str, backend: str, workers: int,
+                    chunk_size: int = INGEST_CHUNK_SIZE,
+                    queue_depth: int = INGEST_QUEUE_DEPTH) -> np.ndarray:
+    # Workers write at row offsets; the file grows as rows land
+    open(path, "wb").close()
+    pool = _Pool(workers, backend, path, queue_depth)
+    try:
+        dimension = None
+        ready = 0
+        while ready < workers:
+            message = pool.poll(1.0)
+            if message and message[0] == "ready":
+                dimension, ready = message[1], ready + 1
+
+        rows = 0
+        for start, texts in iter_chunks(sources, chunk_size):
+            pool.put((start, texts))
+            rows = start + len(texts)
+        for _ in pool.processes:
+            pool.put(None)
+        while pool.done < rows:
+            pool.poll(1.0)
+    finally:
+        pool.close()
+    return open_embeddings(path, rows, dimension)
+
+
+def encode_corpus(sources: List[str] = SOURCES, path: str = EMBEDDINGS_PATH,
+                  backend: str = EMBEDDING_BACKEND, workers: int = 1,
+                  chunk_size: int = INGEST_CHUNK_SIZE) -> np.ndarray:
+    """
+    Embeddings of every document in source order, as a read-only memmap.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if workers <= 1:
+        return encode_serial(sources, path, backend, chunk_size)
+    return encode_parallel(sources, path, backend, workers, chunk_size)
+
+
+# -----------------------------
+# Index + Manifest
+# -----------------------------
+def build_index(embeddings: np.ndarray, path: str = INDEX_PATH):
+    import faiss
+
+    index = faiss.IndexFlatL2(embeddings.shape[1])
+    for start in range(0, len(embeddings), INDEX_ADD_BLOCK):
+        index.add(np.ascontiguousarray(embeddings[start:start + INDEX_ADD_BLOCK]))
+    faiss.write_index(index, path)
+
+
+def write_manifest(sources: List[str], embeddings: np.ndarray, backend: str,
+                   embeddings_path: str = EMBEDDINGS_PATH):
+    # Build version shared by the FAISS index and the compiled policy table
+    digest = hashlib.sha256()
+    for file in sources + [POLICY_SPEC_PATH]:
+        with open(file, "rb") as f:
+            digest.update(f.read())
+    version = digest.hexdigest()[:12]
+
+    with open(POLICY_SPEC_PATH) as f:
+        write_policy_table(compile_policy(json.load(f), version=version))
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
+    with open(INDEX_MANIFEST_PATH, "w") as f:
+        json.dump({
+            "version": version,
+            "sources": sources + [POLICY_SPEC_PATH],
+            "documents": len(embeddings),
+            "embedding_backend": backend,
+            "embeddings": {
+                "path": embeddings_path,
+                "shape": list(embeddings.shape),
+                "dtype": np.dtype(EMBEDDING_DTYPE).name,
+            },
+        }, f)
 
-docs = []
-sources = ["data/products.json", "data/pricing_rules.json", "data/return_policy.txt"]
 
-for file in sources:
-    with open(file) as f:
-        if file.endswith(".json"):
-            docs.extend(json.load(f))
-        else:
-            docs.append({"content": f.read()})
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sources", nargs="+", default=SOURCES)
+    parser.add_argument("--backend", default=EMBEDDING_BACKEND,
+                        help="torch | onnx (int8 export, embeddings/export_onnx.py) | stub")
+    parser.add_argument("--workers", type=int, default=1, help="encoder processes (1 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=INGEST_CHUNK_SIZE)
+    parser.add_argument("--embeddings", default=EMBEDDINGS_PATH)
+    args = parser.parse_args()
 
-texts = [str(doc) for doc in docs]
-embeddings = model.encode(texts)
+    started = time.perf_counter()
+    embeddings = encode_corpus(args.sources, args.embeddings, args.backend, args.workers, args.chunk_size)
+    elapsed = time.perf_counter() - started
+    print(f"Encoded {len(embeddings)} documents in {elapsed:.1f}s "
+          f"({len(embeddings) / max(elapsed, 1e-9):.0f} docs/s, {args.workers} workers)")
 
-index = faiss.IndexFlatL2(len(embeddings[0]))
-index.add(embeddings)
+    build_index(embeddings)
+    write_manifest(args.sources, embeddings, args.backend, args.embeddings)
+    print("Embeddings created successfully")
+    return 0
 
-faiss.write_index(index, "vector_store/faiss_index/index.bin")
-print("Embeddings created successfully")
 
+if __name__ == "__main__":
+    sys.exit(main())
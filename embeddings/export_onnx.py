@@ -0,0 +1,154 @@
+"""
+export_onnx.py
+--------------
+Export the sentence encoder to ONNX and quantize it to int8 for the
+onnx embedding backend (EMBEDDING_BACKEND=onnx).
+
+✔ Loads the SentenceTransformer from the local Hugging Face cache (or a
+  local directory) with hub access disabled; --online allows a download
+✔ Exports the transformer body (token embeddings) with dynamic batch and
+  sequence axes; pooling / normalisation stay in numpy
+  (ai_service/embedding_backend.py) and are read from encoder.json
+✔ Dynamic int8 quantization of the weights (onnxruntime.quantization);
+  activations stay float, so no calibration data is needed
+✔ --check compares the export against the PyTorch encoder on the
+  catalog documents and reports cosine similarity
+
+    PYTHONPATH=.:agent_service python -m embeddings.export_onnx --check
+
+Needs torch, sentence-transformers, onnx and onnxruntime at export time;
+serving only needs onnxruntime and tokenizers.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from ai_service.embedding_backend import (
+    EMBEDDING_MODEL, EMBEDDING_ONNX_DIR, ONNX_CONFIG_FILE, ONNX_MODEL_FILE, TOKENIZER_FILE,
+    OnnxEncoder, cosine_parity
+)
+
+OPSET = 14
+ONNX_INPUTS = ("input_ids", "attention_mask", "token_type_ids")
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_sentence_transformer(model: str, online: bool = False):
+    if not online:
+        # Must be set before transformers / huggingface_hub are imported
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model, device="cpu")
+
+
+def export(model: str = EMBEDDING_MODEL, out_dir: str = EMBEDDING_ONNX_DIR,
+           online: bool = False, keep_fp32: bool = False) -> dict:
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    st = load_sentence_transformer(model, online)
+    pooling = [m for m in st if type(m).__name__ == "Pooling"]
+    if not pooling or pooling[0].get_pooling_mode_str() != "mean":
+        raise SystemExit(f"{model}: only mean pooling is supported by the onnx backend")
+    normalize = any(type(m).__name__ == "Normalize" for m in st)
+
+    tokenizer = st.tokenizer
+    names = [n for n in ONNX_INPUTS if n in tokenizer.model_input_names]
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self, body):
+            super().__init__()
+            self.body = body
+
+        def forward(self, *inputs):
+            return self.body(**dict(zip(names, inputs)))[0]
+
+    os.makedirs(out_dir, exist_ok=True)
+    fp32_path = os.path.join(out_dir, "model_fp32.onnx")
+    int8_path = os.path.join(out_dir, ONNX_MODEL_FILE)
+
+    body = TokenEmbeddings(st[0].auto_model).eval()
+    sample = tokenizer(["export sample", "a longer export sample sentence"], padding=True, return_tensors="pt")
+    axes = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            body,
+            tuple(sample[n] for n in names),
+            fp32_path,
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={**{n: axes for n in names}, "last_hidden_state": axes},
+            opset_version=OPSET,
+            do_constant_folding=True,
+        )
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    tokenizer.backend_tokenizer.save(os.path.join(out_dir, TOKENIZER_FILE))
+    config = {
+        "model": model,
+        "model_file": ONNX_MODEL_FILE,
+        "sha256": _sha256(int8_path),
+        "dimension": st.get_sentence_embedding_dimension(),
+        "max_seq_length": st.max_seq_length,
+        "pooling": "mean",
+        "normalize": normalize,
+        "pad_token_id": tokenizer.pad_token_id,
+        "opset": OPSET,
+        "fp32_mb": round(os.path.getsize(fp32_path) / 2**20, 1),
+        "int8_mb": round(os.path.getsize(int8_path) / 2**20, 1),
+    }
+    with open(os.path.join(out_dir, ONNX_CONFIG_FILE), "w") as f:
+        json.dump(config, f, indent=2)
+    if not keep_fp32:
+        os.remove(fp32_path)
+    return config
+
+
+def catalog_texts():
+    """
+    The texts embed_documents.py indexes, plus a few customer queries.
+    """
+    with open("data/products.json") as f:
+        texts = [str(doc) for doc in json.load(f)]
+    return texts + [
+        "Where is my order ORD1001?",
+        "Can I return a laptop after 30 days?",
+        "bulk pricing for 500 units of SKU1001",
+    ]
+
+
+def check(model: str = EMBEDDING_MODEL, out_dir: str = EMBEDDING_ONNX_DIR, online: bool = False) -> dict:
+    texts = catalog_texts()
+    reference = load_sentence_transformer(model, online).encode(texts, convert_to_numpy=True)
+    return cosine_parity(reference, OnnxEncoder(out_dir).encode(texts))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=EMBEDDING_MODEL, help="model name in the HF cache or a local directory")
+    parser.add_argument("--out", default=EMBEDDING_ONNX_DIR)
+    parser.add_argument("--online", action="store_true", help="allow downloading weights from the hub")
+    parser.add_argument("--keep-fp32", action="store_true")
+    parser.add_argument("--check", action="store_true", help="report cosine parity with the PyTorch encoder")
+    args = parser.parse_args()
+
+    print(json.dumps(export(args.model, args.out, args.online, args.keep_fp32), indent=2))
+    if args.check:
+        print("cosine parity:", check(args.model, args.out, args.online))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""
+async_commerce_client.py
+------------------------
+
+Async counterpart of java_commerce_client.py for the agent layer.
+
+✔ One keep-alive connection pool per backend service
+  (catalog, OMS, pricing, inventory, shipping)
+✔ Per-service bulkhead and circuit breaker, so a slow OMS cannot
+  starve catalog
+✔ Configurable connect / read timeouts
+✔ Optional HTTP/2 (needs the `h2` package)
+✔ Identical concurrent GETs coalesced into one request
+✔ Catalog, inventory and pricing reads go through the response cache
+✔ load_product / load_inventory / load_order batch the keys requested in
+  one tick into a single bulk request (DataLoader)
+✔ Same response contract as the sync `http_call`:
+  parsed JSON on success, {"error": ..., "url": ...} on failure
+
+Many backend calls can be awaited concurrently (asyncio.gather) without
+tying up one thread per request.
+"""
+
+import asyncio
+import os
+import weakref
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from integration.circuit_breaker import AsyncBulkhead, aprotected_call, bulkhead_limit, service_for
+from integration.contract_index import get_contract_index
+from integration.batch_loader import DataLoader
+from integration.java_commerce_client import (
+    BASE_URL,
+    BULK_ENDPOINTS,
+    BULK_MAX_KEYS,
+    bulk_unsupported,
+    split_bulk_response,
+)
+from integration.response_cache import response_cache
+from integration.single_flight import AsyncSingleFlight
+
+
+# ---------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------
+
+CONNECT_TIMEOUT_S = float(os.getenv("COMMERCE_CONNECT_TIMEOUT_S", "1"))
+READ_TIMEOUT_S = {
+    "GET": float(os.getenv("COMMERCE_READ_TIMEOUT_S", "4")),
+    "POST": float(os.getenv("COMMERCE_WRITE_TIMEOUT_S", "5")),
+    "PUT": float(os.getenv("COMMERCE_WRITE_TIMEOUT_S", "5")),
+}
+HTTP2_ENABLED = os.getenv("COMMERCE_HTTP2", "false").lower() == "true"
+
+# Retries mirror the sync session (3 retries, 0.5s backoff on 5xx)
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = {500, 502, 503, 504}
+
+# Pool size per backend service; the in-flight limit is the service's
+# bulkhead (circuit_breaker.BULKHEAD_LIMITS)
+SERVICE_LIMITS = {
+    "catalog": {"max_connections": 50, "max_keepalive": 20},
+    "oms": {"max_connections": 30, "max_keepalive": 10},
+    "pricing": {"max_connections": 30, "max_keepalive": 10},
+    "inventory": {"max_connections": 30, "max_keepalive": 10},
+    "shipping": {"max_connections": 20, "max_keepalive": 5},
+    "default": {"max_connections": 10, "max_keepalive": 5},
+}
+
+
+def service_limits(service: str) -> Dict[str, int]:
+    """
+    Limits for one service; COMMERCE_<SERVICE>_<LIMIT> overrides the default.
+    """
+    limits = dict(SERVICE_LIMITS.get(service, SERVICE_LIMITS["default"]))
+    for key in limits:
+        override = os.getenv(f"COMMERCE_{service.upper()}_{key.upper()}")
+        if override:
+            limits[key] = int(override)
+    return limits
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# ---------------------------------------------------------
+# Client
+# ---------------------------------------------------------
+
+class AsyncCommerceClient:
+    """
+    Pools and bulkheads are created lazily per service and belong to the
+    event loop the client is first used on. Circuit breakers are shared
+    with the sync client.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        http2: bool = HTTP2_ENABLED,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url
+        self.http2 = http2 and _http2_available()
+        self._transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._bulkheads: Dict[str, AsyncBulkhead] = {}
+        self._get_flight = AsyncSingleFlight()
+        self._bulk_supported: Dict[str, bool] = {}
+        self._loaders = {
+            name: DataLoader(lambda keys, name=name: self._load_batch(name, keys), BULK_MAX_KEYS)
+            for name in BULK_ENDPOINTS
+        }
+
+    def _pool(self, service: str):
+        client = self._clients.get(service)
+        if client is None:
+            limits = service_limits(service)
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=limits["max_connections"],
+                    max_keepalive_connections=limits["max_keepalive"],
+                ),
+                timeout=httpx.Timeout(READ_TIMEOUT_S["GET"], connect=CONNECT_TIMEOUT_S),
+            )
+            self._clients[service] = client
+            self._bulkheads[service] = AsyncBulkhead(bulkhead_limit(service))
+        return client, self._bulkheads[service]
+
+    async def http_call(self, method: str, url: str, payload: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Async version of java_commerce_client.http_call.
+        """
+        if method not in READ_TIMEOUT_S:
+            return {"error": "Unsupported HTTP method", "url": url}
+
+        client, bulkhead = self._pool(service_for(url))
+
+        async def send():
+            return await aprotected_call(url, lambda: self._send(client, method, url, payload), bulkhead)
+
+        if method == "GET":
+            return await self._get_flight.do(url, send)
+        return await send()
+
+    async def _send(self, client, method: str, url: str, payload: Optional[Dict] = None) -> Dict[str, Any]:
+        timeout = httpx.Timeout(READ_TIMEOUT_S[method], connect=CONNECT_TIMEOUT_S)
+        try:
+            for attempt in range(MAX_RETRIES + 1):
+                resp = await client.request(
+                    method, url, json=payload if method != "GET" else None, timeout=timeout
+                )
+                if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    break
+                await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+
+            resp.raise_for_status()  # throws error if >= 400
+            return resp.json()
+
+        except httpx.TimeoutException:
+            return {"error": "Timeout", "url": url}
+
+        except httpx.HTTPStatusError as ex:
+            return {"error": str(ex), "status": ex.response.status_code, "url": url}
+
+        except httpx.TransportError:
+            return {"error": "ConnectionError", "url": url}
+
+        except Exception as ex:
+            return {"error": str(ex), "url": url}
+
+    async def aclose(self):
+        clients, self._clients, self._bulkheads = self._clients, {}, {}
+        await asyncio.gather(*(client.aclose() for client in clients.values()))
+
+    # -----------------------------------------------------
+    # CATALOG SERVICE
+    # -----------------------------------------------------
+
+    async def _cached_get(self, endpoint: str, url: str) -> Dict[str, Any]:
+        return await response_cache.aget_or_load(endpoint, url, lambda: self.http_call("GET", url))
+
+    async def fetch_product_by_sku(self, sku: str) -> Dict[str, Any]:
+        return await self._cached_get("product", f"{self.base_url}/catalog/product/{sku}")
+
+    async def search_catalog(self, query: str) -> Dict[str, Any]:
+        return await self._cached_get("search", f"{self.base_url}/catalog/search?q={query}")
+
+    # -----------------------------------------------------
+    # ORDER MANAGEMENT SERVICE (OMS)
+    # -----------------------------------------------------
+
+    async def fetch_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.http_call("GET", f"{self.base_url}/oms/order/{order_id}")
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        return await self.http_call("POST", f"{self.base_url}/oms/order/{order_id}/cancel")
+
+    async def create_bulk_returns(self, lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return await self.http_call("POST", f"{self.base_url}/oms/returns/bulk", {"lines": lines})
+
+    async def cancel_orders_bulk(self, order_ids: List[str]) -> Dict[str, Any]:
+        return await self.http_call(
+            "POST", f"{self.base_url}/oms/orders/cancel/bulk", {"order_ids": order_ids}
+        )
+
+    async def fetch_order_items(self, order_id: str) -> Dict[str, Any]:
+        return await self.http_call("GET", f"{self.base_url}/oms/order/{order_id}/items")
+
+    async def fetch_order_exceptions(self, order_id: str) -> Dict[str, Any]:
+        return await self.http_call("GET", f"{self.base_url}/oms/order/{order_id}/exceptions")
+
+    # -----------------------------------------------------
+    # PRICING SERVICE (B2B + CONTRACTS)
+    # -----------------------------------------------------
+
+    async def fetch_price(self, customer_id: str, sku: str) -> Dict[str, Any]:
+        contract = get_contract_index().lookup(customer_id, sku)
+        if contract is not None:
+            return {**contract, "source": "contract_index"}
+        return await self._cached_get("price", f"{self.base_url}/pricing/contract/{customer_id}/{sku}")
+
+    async def fetch_bulk_pricing(self, sku: str, quantity: int) -> Dict[str, Any]:
+        return await self.http_call("GET", f"{self.base_url}/pricing/bulk?sku={sku}&qty={quantity}")
+
+    # -----------------------------------------------------
+    # INVENTORY SERVICE
+    # -----------------------------------------------------
+
+    async def fetch_inventory(self, sku: str) -> Dict[str, Any]:
+        return await self._cached_get("inventory", f"{self.base_url}/inventory/{sku}")
+
+    # -----------------------------------------------------
+    # SHIPPING SERVICE
+    # -----------------------------------------------------
+
+    async def fetch_shipping_eta(self, tracking_no: str) -> Dict[str, Any]:
+        return await self.http_call("GET", f"{self.base_url}/shipping/eta/{tracking_no}")
+
+    # -----------------------------------------------------
+    # BATCHED READS
+    # -----------------------------------------------------
+
+    async def _load(self, name: str, key: str) -> Dict[str, Any]:
+        single_url = self.base_url + BULK_ENDPOINTS[name][3].format(key)
+        if name in response_cache.ttls:
+            cached = response_cache.apeek(name, single_url, lambda: self.http_call("GET", single_url))
+            if cached is not None:
+                return cached
+        return await self._loaders[name].load(key)
+
+    async def _load_batch(self, name: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        One bulk request for the batch, or parallel single calls when the
+        service has no bulk endpoint.
+        """
+        bulk_path, request_field, _, _ = BULK_ENDPOINTS[name]
+        if self._bulk_supported.get(name, True):
+            response = await self.http_call("POST", self.base_url + bulk_path, {request_field: keys})
+            if not bulk_unsupported(response):
+                return split_bulk_response(name, self.base_url, keys, response)
+            self._bulk_supported[name] = False
+
+        single = {
+            "product": self.fetch_product_by_sku,
+            "inventory": self.fetch_inventory,
+            "order": self.fetch_order,
+        }[name]
+        return dict(zip(keys, await asyncio.gather(*(single(key) for key in keys))))
+
+    async def load_product(self, sku: str) -> Dict[str, Any]:
+        return await self._load("product", sku)
+
+    async def load_inventory(self, sku: str) -> Dict[str, Any]:
+        return await self._load("inventory", sku)
+
+    async def load_order(self, order_id: str) -> Dict[str, Any]:
+        return await self._load("order", order_id)
+
+
+# ---------------------------------------------------------
+# One client per event loop
+# ---------------------------------------------------------
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncCommerceClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_client() -> AsyncCommerceClient:
+    """
+    Shared client for the running event loop (httpx pools cannot be
+    shared across loops).
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = AsyncCommerceClient()
+    return client
+
+
+# ---------------------------------------------------------
+# QUICK SELF-TEST
+# ---------------------------------------------------------
+
+if __name__ == "__main__":
+    async def main():
+        client = get_async_client()
+        print(await asyncio.gather(
+            client.fetch_order("ORD1001"),
+            client.fetch_inventory("SKU1001"),
+            client.fetch_price("CUST32", "SKU8823"),
+        ))
+        await client.aclose()
+
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+batch_loader.py
+---------------
+
+DataLoader-style batching for per-key backend lookups.
+
+✔ Keys requested within one event-loop tick are collected into one batch
+✔ Duplicate keys in a batch are fetched once
+✔ Batches are split at `max_batch_size`
+✔ Results (or the batch's exception) are fanned back out to every caller
+
+The commerce clients plug in one batch function per service that calls
+the bulk endpoint, or falls back to parallel single calls when the service
+has no bulk endpoint.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+BatchFn = Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+
+
+class DataLoader:
+    def __init__(self, batch_fn: BatchFn, max_batch_size: int = 100, wait_s: float = 0.0):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.wait_s = wait_s
+        self._queue: Dict[Hashable, List[asyncio.Future]] = {}
+        self._handle: Optional[asyncio.Handle] = None
+        self._tasks: set = set()
+
+    def load(self, key: Hashable) -> "asyncio.Future[Any]":
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.setdefault(key, []).append(future)
+        if self._handle is None:
+            # Dispatch after every task that is already runnable has queued its keys
+            if self.wait_s > 0:
+                self._handle = loop.call_later(self.wait_s, self._dispatch)
+            else:
+                self._handle = loop.call_soon(self._dispatch)
+        return future
+
+    async def load_many(self, keys: List[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self):
+        queue, self._queue, self._handle = self._queue, {}, None
+        keys = list(queue)
+        for start in range(0, len(keys), self.max_batch_size):
+            chunk = keys[start:start + self.max_batch_size]
+            task = asyncio.ensure_future(self._run(chunk, queue))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, keys: List[Hashable], queue: Dict[Hashable, List[asyncio.Future]]):
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as ex:
+            for key in keys:
+                for future in queue[key]:
+                    if not future.done():
+                        future.set_exception(ex)
+            return
+
+        for key in keys:
+            for future in queue[key]:
+                if not future.done():
+                    future.set_result(results.get(key))
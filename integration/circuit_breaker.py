@@ -0,0 +1,338 @@
+"""
+circuit_breaker.py
+------------------
+
+Per-service circuit breakers and bulkheads for the Java microservices.
+
+✔ One breaker per backend service (catalog, OMS, pricing, inventory, shipping)
+✔ CLOSED -> OPEN when the error rate over a rolling window crosses a
+  threshold; OPEN -> HALF_OPEN after a cool-down; HALF_OPEN lets a few
+  probe calls through and closes again on success
+✔ Bulkhead: bounded concurrency per service, with a short wait before
+  rejecting, so one slow dependency cannot hold every worker thread
+✔ Fail-fast `Degraded` result (still an http_call error dict) that agents
+  can detect with `is_degraded` and render around
+✔ Breaker state exported as the `commerce_circuit_state` gauge
+  (0 closed, 1 half-open, 2 open)
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from observability.exporters import PrometheusExporter
+from observability.tracer import get_exporter
+
+SERVICES = ("catalog", "oms", "pricing", "inventory", "shipping")
+
+WINDOW_S = float(os.getenv("CIRCUIT_WINDOW_S", "30"))
+MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "10"))
+ERROR_RATE = float(os.getenv("CIRCUIT_ERROR_RATE", "0.5"))
+OPEN_FOR_S = float(os.getenv("CIRCUIT_OPEN_FOR_S", "15"))
+HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "2"))
+BULKHEAD_WAIT_S = float(os.getenv("BULKHEAD_WAIT_S", "0.5"))
+
+# Max concurrent calls per service (COMMERCE_<SERVICE>_MAX_IN_FLIGHT overrides)
+BULKHEAD_LIMITS = {
+    "catalog": 50,
+    "oms": 30,
+    "pricing": 30,
+    "inventory": 30,
+    "shipping": 20,
+    "default": 10,
+}
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_GAUGE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+SERVICE_LABELS = {
+    "catalog": "product catalog",
+    "oms": "order management",
+    "pricing": "pricing",
+    "inventory": "inventory",
+    "shipping": "shipping",
+}
+
+
+def service_for(url: str) -> str:
+    """
+    Backend service of a commerce URL (first path segment).
+    """
+    segment = urlsplit(url).path.strip("/").split("/", 1)[0]
+    return segment if segment in SERVICES else "default"
+
+
+def bulkhead_limit(service: str) -> int:
+    override = os.getenv(f"COMMERCE_{service.upper()}_MAX_IN_FLIGHT")
+    return int(override) if override else BULKHEAD_LIMITS.get(service, BULKHEAD_LIMITS["default"])
+
+
+# ---------------------------------------------------------
+# Degraded Result
+# ---------------------------------------------------------
+
+class Degraded(dict):
+    """
+    Fail-fast result returned instead of calling an unhealthy service.
+    Keeps the http_call error contract ({"error", "url"}).
+    """
+
+    def __init__(self, service: str, reason: str, url: str, retry_after: float = 0.0):
+        label = SERVICE_LABELS.get(service, service)
+        super().__init__(
+            error=reason,
+            degraded=True,
+            service=service,
+            retry_after=round(retry_after, 1),
+            url=url,
+            message=f"The {label} service is temporarily unavailable. Please try again shortly.",
+        )
+
+
+def is_degraded(result: Any) -> bool:
+    return isinstance(result, dict) and result.get("degraded") is True
+
+
+def is_failure(result: Any) -> bool:
+    """
+    Outcomes that count against the breaker: transport errors and 5xx.
+    4xx responses mean the service is healthy.
+    """
+    if not isinstance(result, dict) or "error" not in result:
+        return False
+    status = result.get("status")
+    return status is None or status >= 500
+
+
+# ---------------------------------------------------------
+# Circuit Breaker
+# ---------------------------------------------------------
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        service: str,
+        window_s: float = WINDOW_S,
+        min_calls: int = MIN_CALLS,
+        error_rate: float = ERROR_RATE,
+        open_for_s: float = OPEN_FOR_S,
+        half_open_probes: int = HALF_OPEN_PROBES,
+        clock=time.monotonic
+    ):
+        self.service = service
+        self.window_s = window_s
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.open_for_s = open_for_s
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        # One-second buckets: [second, calls, failures]
+        self._buckets: deque = deque()
+        self._lock = threading.Lock()
+        self._export()
+
+    def _export(self):
+        exporter = get_exporter(PrometheusExporter)
+        if exporter is not None:
+            exporter.set_gauge("commerce_circuit_state", STATE_GAUGE[self.state], service=self.service)
+
+    def _transition(self, state: str):
+        self.state = state
+        if state == OPEN:
+            self.opened_at = self.clock()
+        if state != CLOSED:
+            self._probes_in_flight = self._probe_successes = 0
+        else:
+            self._buckets.clear()
+        self._export()
+
+    def _window_counts(self, now: float):
+        horizon = now - self.window_s
+        while self._buckets and self._buckets[0][0] <= horizon:
+            self._buckets.popleft()
+        calls = sum(b[1] for b in self._buckets)
+        failures = sum(b[2] for b in self._buckets)
+        return calls, failures
+
+    def retry_after(self) -> float:
+        return max(self.opened_at + self.open_for_s - self.clock(), 0.0)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.open_for_s:
+                    return False
+                self._transition(HALF_OPEN)
+
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    return False
+                self._probes_in_flight += 1
+            return True
+
+    def record(self, ok: bool):
+        with self._lock:
+            now = self.clock()
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+                if not ok:
+                    self._transition(OPEN)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._transition(CLOSED)
+                return
+
+            second = int(now)
+            if not self._buckets or self._buckets[-1][0] != second:
+                self._buckets.append([second, 0, 0])
+            self._buckets[-1][1] += 1
+            self._buckets[-1][2] += 0 if ok else 1
+
+            if self.state == CLOSED and not ok:
+                calls, failures = self._window_counts(now)
+                if calls >= self.min_calls and failures / calls >= self.error_rate:
+                    self._transition(OPEN)
+
+
+# ---------------------------------------------------------
+# Bulkheads
+# ---------------------------------------------------------
+
+class Bulkhead:
+    """
+    Thread bulkhead; `try_acquire` waits at most `wait_s` (default:
+    BULKHEAD_WAIT_S, read at call time).
+    """
+
+    def __init__(self, limit: int, wait_s: Optional[float] = None):
+        self._slots = threading.BoundedSemaphore(limit)
+        self.wait_s = wait_s
+
+    def timeout(self) -> float:
+        return BULKHEAD_WAIT_S if self.wait_s is None else self.wait_s
+
+    def try_acquire(self) -> bool:
+        return self._slots.acquire(timeout=self.timeout())
+
+    def release(self):
+        self._slots.release()
+
+
+class AsyncBulkhead:
+    def __init__(self, limit: int, wait_s: Optional[float] = None):
+        self._slots = asyncio.Semaphore(limit)
+        self.wait_s = wait_s
+
+    def timeout(self) -> float:
+        return BULKHEAD_WAIT_S if self.wait_s is None else self.wait_s
+
+    async def try_acquire(self) -> bool:
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.timeout())
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def release(self):
+        self._slots.release()
+
+
+# ---------------------------------------------------------
+# Registry
+# ---------------------------------------------------------
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_bulkheads: Dict[str, Bulkhead] = {}
+_registry_lock = threading.Lock()
+
+
+def breaker_for(service: str) -> CircuitBreaker:
+    """
+    Process-wide breaker per service, shared by the sync and async clients.
+    """
+    breaker = _breakers.get(service)
+    if breaker is None:
+        with _registry_lock:
+            breaker = _breakers.setdefault(service, CircuitBreaker(service))
+    return breaker
+
+
+def bulkhead_for(service: str) -> Bulkhead:
+    bulkhead = _bulkheads.get(service)
+    if bulkhead is None:
+        with _registry_lock:
+            bulkhead = _bulkheads.setdefault(service, Bulkhead(bulkhead_limit(service)))
+    return bulkhead
+
+
+def breaker_states() -> Dict[str, str]:
+    return {service: breaker.state for service, breaker in _breakers.items()}
+
+
+def reset_breakers():
+    with _registry_lock:
+        _breakers.clear()
+        _bulkheads.clear()
+
+
+def protected_call(url: str, send: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Run `send` inside the service's bulkhead and breaker; returns a
+    Degraded result instead of calling an unhealthy or saturated service.
+    """
+    service = service_for(url)
+    bulkhead = bulkhead_for(service)
+    if not bulkhead.try_acquire():
+        return Degraded(service, "BulkheadFull", url)
+    try:
+        breaker = breaker_for(service)
+        if not breaker.allow():
+            return Degraded(service, "CircuitOpen", url, breaker.retry_after())
+        try:
+            result = send()
+        except BaseException:
+            breaker.record(ok=False)
+            raise
+        breaker.record(ok=not is_failure(result))
+        return result
+    finally:
+        bulkhead.release()
+
+
+async def aprotected_call(
+    url: str,
+    send: Callable[[], Awaitable[Dict[str, Any]]],
+    bulkhead: AsyncBulkhead
+) -> Dict[str, Any]:
+    """
+    Async version of protected_call; bulkheads are per event loop, the
+    breakers are shared with the sync client.
+    """
+    service = service_for(url)
+    if not await bulkhead.try_acquire():
+        return Degraded(service, "BulkheadFull", url)
+    try:
+        breaker = breaker_for(service)
+        if not breaker.allow():
+            return Degraded(service, "CircuitOpen", url, breaker.retry_after())
+        try:
+            result = await send()
+        except BaseException:
+            breaker.record(ok=False)
+            raise
+        breaker.record(ok=not is_failure(result))
+        return result
+    finally:
+        bulkhead.release()
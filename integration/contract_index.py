@@ -0,0 +1,182 @@
+"""
+contract_index.py
+-----------------
+
+In-memory B2B contract-price index keyed by (customer_id, sku).
+
+✔ Validity intervals (valid_from / valid_until) per contract
+✔ Atomic load from a snapshot file (contract_pricing.ACCOUNTS)
+✔ Hot reload when the file changes, without pausing readers
+✔ O(1) dictionary probe on the pricing hot path
+
+The remote pricing service is only consulted on a miss
+(see fetch_price in java_commerce_client.py).
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_right
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+CONTRACT_SNAPSHOT_PATH = os.getenv("CONTRACT_SNAPSHOT_PATH", "data/pricing_rules.json")
+CONTRACT_RELOAD_INTERVAL_S = float(os.getenv("CONTRACT_RELOAD_INTERVAL_S", "5"))
+
+# One contract interval: (valid_from ordinal, valid_until ordinal, account)
+Interval = Tuple[int, int, Dict[str, Any]]
+
+
+class ContractSnapshot:
+    """
+    Immutable view of one loaded snapshot file.
+    """
+
+    def __init__(self, accounts: List[Dict[str, Any]], version: str):
+        self.version = version
+        table: Dict[Tuple[str, str], List[Interval]] = {}
+        by_customer: Dict[str, List[Interval]] = {}
+
+        for account in accounts:
+            valid_from = date.fromisoformat(account.get("valid_from", "0001-01-01")).toordinal()
+            valid_until = date.fromisoformat(account.get("valid_until", "9999-12-31")).toordinal()
+            interval = (valid_from, valid_until, account)
+            table.setdefault((account["customer_id"], account["sku"]), []).append(interval)
+            by_customer.setdefault(account["customer_id"], []).append(interval)
+
+        for intervals in (*table.values(), *by_customer.values()):
+            intervals.sort(key=lambda i: i[0])
+
+        self.table = table
+        self.by_customer = by_customer
+        self._starts = {key: [i[0] for i in intervals] for key, intervals in table.items()}
+
+    def lookup(self, customer_id: str, sku: str, on: date) -> Optional[Dict[str, Any]]:
+        key = (customer_id, sku)
+        intervals = self.table.get(key)
+        if not intervals:
+            return None
+
+        day = on.toordinal()
+        # Latest contract that started on or before `day` and is still valid
+        position = bisect_right(self._starts[key], day) - 1
+        while position >= 0:
+            valid_from, valid_until, account = intervals[position]
+            if valid_until >= day:
+                return account
+            position -= 1
+        return None
+
+
+class ContractIndex:
+    def __init__(self, path: str = CONTRACT_SNAPSHOT_PATH):
+        self.path = path
+        self._snapshot = ContractSnapshot([], version="empty")
+        self._stamp: Optional[Tuple[float, int]] = None
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+
+    @property
+    def version(self) -> str:
+        return self._snapshot.version
+
+    # -----------------------------
+    # Loading
+    # -----------------------------
+    def load(self) -> bool:
+        """
+        Build a new snapshot from the file and swap it in. Readers keep
+        using the previous snapshot until the single reference swap; a
+        broken file leaves the current snapshot in place.
+        """
+        with self._reload_lock:
+            try:
+                stat = os.stat(self.path)
+                with open(self.path) as f:
+                    data = json.load(f)
+                accounts = data.get("contract_pricing", {}).get("ACCOUNTS", [])
+                snapshot = ContractSnapshot(accounts, version=f"{stat.st_mtime_ns}-{stat.st_size}")
+            except (OSError, ValueError, KeyError):
+                return False
+
+            self._snapshot = snapshot
+            self._stamp = (stat.st_mtime_ns, stat.st_size)
+            return True
+
+    def reload_if_changed(self) -> bool:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) == self._stamp:
+            return False
+        return self.load()
+
+    def start_watching(self, interval: float = CONTRACT_RELOAD_INTERVAL_S):
+        """
+        Poll the snapshot file in a daemon thread and hot-swap on change.
+        """
+        if self._watcher is not None or interval <= 0:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=watch, name="contract-index-watch", daemon=True)
+        self._watcher.start()
+
+    # -----------------------------
+    # Lookups (lock-free)
+    # -----------------------------
+    def lookup(self, customer_id: str, sku: str, on: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        return self._snapshot.lookup(customer_id, sku, on or date.today())
+
+    def contracts_for(self, customer_id: str, on: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        All contracts of one customer valid on `on`, keyed by SKU. When
+        intervals overlap, the most recently started contract wins.
+        """
+        snapshot = self._snapshot
+        day = (on or date.today()).toordinal()
+        valid: Dict[str, Dict[str, Any]] = {}
+        for valid_from, valid_until, account in snapshot.by_customer.get(customer_id, []):
+            if valid_from <= day <= valid_until:
+                valid[account["sku"]] = account
+        return valid
+
+
+_index: Optional[ContractIndex] = None
+_index_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    # Keep a preloaded snapshot but restart its watcher thread in the child
+    global _index_lock
+    _index_lock = threading.Lock()
+    if _index is not None:
+        _index._reload_lock = threading.Lock()
+        if _index._watcher is not None:
+            _index._watcher = None
+            _index.start_watching()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_contract_index() -> ContractIndex:
+    """
+    Process-wide index, loaded and watched on first use.
+    """
+    global _index
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is None:
+            _index = ContractIndex()
+            _index.load()
+            _index.start_watching()
+        return _index
@@ -9,14 +9,23 @@ This is a production-grade HTTP client with:
 ✔ Timeout & retry logic
 ✔ Centralized request handler
 ✔ Consistent response format
+✔ Circuit breaker + bulkhead per service (fail fast when degraded)
+✔ Single-flight coalescing of identical concurrent GETs
+✔ Read-through caching of catalog, inventory and pricing reads
+✔ Bulk reads for many SKUs / orders in one request
 ✔ Exception handling
 ✔ Extensible for future microservices
 """
 
 import os
 import requests
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from requests.adapters import HTTPAdapter, Retry
+from integration.circuit_breaker import protected_call
+from integration.contract_index import get_contract_index
+from integration.response_cache import response_cache
+from integration.single_flight import SingleFlight
 
 
 # ---------------------------------------------------------
@@ -25,6 +34,15 @@ from requests.adapters import HTTPAdapter, Retry
 
 BASE_URL = os.getenv("JAVA_COMMERCE_BASE_URL", "http://localhost:8080")
 
+# Bulk read endpoints:
+# name -> (bulk path, request field, response field, single-item path)
+BULK_ENDPOINTS = {
+    "product": ("/catalog/products/bulk", "skus", "products", "/catalog/product/{}"),
+    "inventory": ("/inventory/bulk", "skus", "inventory", "/inventory/{}"),
+    "order": ("/oms/orders/bulk", "order_ids", "orders", "/oms/order/{}"),
+}
+BULK_MAX_KEYS = int(os.getenv("COMMERCE_BULK_MAX_KEYS", "100"))
+
 
 # ---------------------------------------------------------
 # Session with Retry & Timeout Handling
@@ -42,6 +60,9 @@ adapter = HTTPAdapter(max_retries=retry_strategy)
 session.mount("http://", adapter)
 session.mount("https://", adapter)
 
+# Identical concurrent GETs share one upstream request
+get_flight = SingleFlight()
+
 
 # ---------------------------------------------------------
 # Helper: Unified HTTP Wrapper
@@ -51,6 +72,13 @@ def http_call(method: str, url: str, payload: Optional[Dict] = None) -> Dict[str
     """
     A unified HTTP handler used by all commerce API calls.
     """
+    send = lambda: protected_call(url, lambda: _send(method, url, payload))
+    if method == "GET":
+        return get_flight.do(url, send)
+    return send()
+
+
+def _send(method: str, url: str, payload: Optional[Dict] = None) -> Dict[str, Any]:
     try:
         if method == "GET":
             resp = session.get(url, timeout=4)
@@ -67,6 +95,9 @@ def http_call(method: str, url: str, payload: Optional[Dict] = None) -> Dict[str
     except requests.exceptions.Timeout:
         return {"error": "Timeout", "url": url}
 
+    except requests.exceptions.HTTPError as ex:
+        return {"error": str(ex), "status": ex.response.status_code, "url": url}
+
     except requests.exceptions.ConnectionError:
         return {"error": "ConnectionError", "url": url}
 
@@ -80,12 +111,12 @@ def http_call(method: str, url: str, payload: Optional[Dict] = None) -> Dict[str
 
 def fetch_product_by_sku(sku: str) -> Dict[str, Any]:
     url = f"{BASE_URL}/catalog/product/{sku}"
-    return http_call("GET", url)
+    return response_cache.get_or_load("product", url, lambda: http_call("GET", url))
 
 
 def search_catalog(query: str) -> Dict[str, Any]:
     url = f"{BASE_URL}/catalog/search?q={query}"
-    return http_call("GET", url)
+    return response_cache.get_or_load("search", url, lambda: http_call("GET", url))
 
 
 # ---------------------------------------------------------
@@ -102,6 +133,19 @@ def cancel_order(order_id: str) -> Dict[str, Any]:
     return http_call("POST", url)
 
 
+def create_bulk_returns(lines: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    One OMS request for many return lines ({order_id, sku, quantity}).
+    """
+    url = f"{BASE_URL}/oms/returns/bulk"
+    return http_call("POST", url, {"lines": lines})
+
+
+def cancel_orders_bulk(order_ids: List[str]) -> Dict[str, Any]:
+    url = f"{BASE_URL}/oms/orders/cancel/bulk"
+    return http_call("POST", url, {"order_ids": order_ids})
+
+
 def fetch_order_items(order_id: str) -> Dict[str, Any]:
     url = f"{BASE_URL}/oms/order/{order_id}/items"
     return http_call("GET", url)
@@ -119,9 +163,15 @@ def fetch_order_exceptions(order_id: str) -> Dict[str, Any]:
 def fetch_price(customer_id: str, sku: str) -> Dict[str, Any]:
     """
     B2B contract pricing lookup.
+    Served from the local contract index; the pricing service is only
+    called on a miss (through the response cache).
     """
+    contract = get_contract_index().lookup(customer_id, sku)
+    if contract is not None:
+        return {**contract, "source": "contract_index"}
+
     url = f"{BASE_URL}/pricing/contract/{customer_id}/{sku}"
-    return http_call("GET", url)
+    return response_cache.get_or_load("price", url, lambda: http_call("GET", url))
 
 
 def fetch_bulk_pricing(sku: str, quantity: int) -> Dict[str, Any]:
@@ -138,7 +188,7 @@ def fetch_bulk_pricing(sku: str, quantity: int) -> Dict[str, Any]:
 
 def fetch_inventory(sku: str) -> Dict[str, Any]:
     url = f"{BASE_URL}/inventory/{sku}"
-    return http_call("GET", url)
+    return response_cache.get_or_load("inventory", url, lambda: http_call("GET", url))
 
 
 # ---------------------------------------------------------
@@ -150,6 +200,104 @@ def fetch_shipping_eta(tracking_no: str) -> Dict[str, Any]:
     return http_call("GET", url)
 
 
+# ---------------------------------------------------------
+# BULK READS
+# ---------------------------------------------------------
+
+def bulk_unsupported(response: Dict[str, Any]) -> bool:
+    """
+    The service has no bulk endpoint (older deployments).
+    """
+    return "error" in response and response.get("status") in (404, 405)
+
+
+def split_bulk_response(name: str, base_url: str, keys: List[str], response: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fan a bulk response out to per-key results with the single-call
+    contract: the item, a 404 error for missing keys, or the batch error.
+    """
+    _, _, field, single_path = BULK_ENDPOINTS[name]
+    if "error" in response:
+        return {key: response for key in keys}
+
+    items = response.get(field) or {}
+    results = {}
+    for key in keys:
+        single_url = base_url + single_path.format(key)
+        item = items.get(key)
+        results[key] = item if item is not None else {"error": "404 Not Found", "status": 404, "url": single_url}
+        if name in response_cache.ttls:
+            response_cache.prime(name, single_url, results[key])
+    return results
+
+
+_bulk_supported: Dict[str, bool] = {}
+_fallback_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="commerce-fallback")
+
+
+def _reset_after_fork():
+    global _fallback_pool
+    _fallback_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="commerce-fallback")
+    session.close()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def fetch_many(name: str, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch many products / inventory records / orders: cached keys are
+    served locally, the rest in one bulk request per BULK_MAX_KEYS, or as
+    parallel single calls when the service has no bulk endpoint.
+    """
+    bulk_path, request_field, _, single_path = BULK_ENDPOINTS[name]
+    results: Dict[str, Dict[str, Any]] = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        cached = None
+        if name in response_cache.ttls:
+            url = BASE_URL + single_path.format(key)
+            # Stale hits are served and refreshed in the background
+            cached = response_cache.peek(name, url, lambda url=url: http_call("GET", url))
+        if cached is not None:
+            results[key] = cached
+        else:
+            missing.append(key)
+
+    for start in range(0, len(missing), BULK_MAX_KEYS):
+        chunk = missing[start:start + BULK_MAX_KEYS]
+        if _bulk_supported.get(name, True):
+            response = http_call("POST", BASE_URL + bulk_path, {request_field: chunk})
+            if not bulk_unsupported(response):
+                results.update(split_bulk_response(name, BASE_URL, chunk, response))
+                continue
+            _bulk_supported[name] = False
+
+        single = SINGLE_FETCHERS[name]
+        results.update(zip(chunk, _fallback_pool.map(single, chunk)))
+    return results
+
+
+def fetch_products_by_sku(skus: List[str]) -> Dict[str, Dict[str, Any]]:
+    return fetch_many("product", skus)
+
+
+def fetch_inventory_many(skus: List[str]) -> Dict[str, Dict[str, Any]]:
+    return fetch_many("inventory", skus)
+
+
+def fetch_orders(order_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    return fetch_many("order", order_ids)
+
+
+SINGLE_FETCHERS = {
+    "product": fetch_product_by_sku,
+    "inventory": fetch_inventory,
+    "order": fetch_order,
+}
+
+
 # ---------------------------------------------------------
 # QUICK SELF-TEST
 # ---------------------------------------------------------
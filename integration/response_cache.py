@@ -0,0 +1,268 @@
+"""
+response_cache.py
+-----------------
+
+Read-through cache for commerce GET calls (catalog, inventory, pricing).
+
+✔ TTL per endpoint (products barely change, inventory may be seconds stale)
+✔ Stale-while-revalidate: an expired entry is still served for a grace
+  period while one background refresh fetches the new value
+✔ Negative caching of 404s
+✔ Bounded memory with LRU eviction (local backend)
+✔ Pluggable backend: in-process LRU (default, used in tests) or Redis
+  shared across workers (COMMERCE_CACHE_BACKEND=redis://...)
+
+Hits / misses are reported per endpoint through observability.record_cache.
+Cached values are shared between callers and must be treated as read-only.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from observability.tracer import record_cache
+
+CACHE_BACKEND = os.getenv("COMMERCE_CACHE_BACKEND", "local")
+CACHE_MAX_ENTRIES = int(os.getenv("COMMERCE_CACHE_MAX_ENTRIES", "10000"))
+NEGATIVE_TTL_S = float(os.getenv("COMMERCE_CACHE_NEGATIVE_TTL_S", "30"))
+
+# endpoint -> (ttl seconds, stale-while-revalidate seconds)
+ENDPOINT_TTLS = {
+    "product": (300.0, 600.0),
+    "search": (60.0, 120.0),
+    "inventory": (5.0, 10.0),
+    "price": (60.0, 300.0),
+}
+
+# Cache entry: {"value": ..., "fresh_until": t, "stale_until": t}
+Entry = Dict[str, Any]
+
+
+# ---------------------------------------------------------
+# Backends
+# ---------------------------------------------------------
+
+class LocalBackend:
+    """
+    In-process LRU; the stand-in for the shared backend.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["stale_until"] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Shared across workers; Redis expiry bounds each entry's lifetime and
+    the server's maxmemory-policy (allkeys-lru) bounds total memory.
+    """
+
+    def __init__(self, url: str, prefix: str = "commerce:"):
+        import redis  # optional dependency
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Entry]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, entry: Entry):
+        ttl = max(int(entry["stale_until"] - time.time()) + 1, 1)
+        self.client.set(self.prefix + key, json.dumps(entry), ex=ttl)
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+
+def backend_from_env(spec: str = CACHE_BACKEND):
+    if spec.startswith(("redis://", "rediss://")):
+        return RedisBackend(spec)
+    return LocalBackend()
+
+
+# ---------------------------------------------------------
+# Read-through Cache
+# ---------------------------------------------------------
+
+def _is_not_found(response: Dict[str, Any]) -> bool:
+    return isinstance(response, dict) and response.get("status") == 404
+
+
+def _is_error(response: Any) -> bool:
+    return isinstance(response, dict) and "error" in response
+
+
+class ReadThroughCache:
+    def __init__(self, backend=None, ttls: Optional[Dict[str, tuple]] = None):
+        self.backend = backend if backend is not None else LocalBackend()
+        self.ttls = ttls or ENDPOINT_TTLS
+        self._refreshing: set = set()
+        self._refresh_lock = threading.Lock()
+        self._tasks: set = set()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+
+    def _store(self, endpoint: str, key: str, response: Any):
+        """
+        Cache successful responses and 404s; other errors are not cached.
+        """
+        ttl, swr = self.ttls[endpoint]
+        if _is_not_found(response):
+            ttl, swr = NEGATIVE_TTL_S, 0.0
+        elif _is_error(response):
+            return
+        now = time.time()
+        self.backend.set(key, {"value": response, "fresh_until": now + ttl, "stale_until": now + ttl + swr})
+
+    def _claim_refresh(self, key: str) -> bool:
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def _release_refresh(self, key: str):
+        with self._refresh_lock:
+            self._refreshing.discard(key)
+
+    def _lookup(self, endpoint: str, key: str):
+        entry = self.backend.get(key)
+        if entry is None:
+            record_cache(f"commerce.{endpoint}", hit=False)
+            return None, False
+        record_cache(f"commerce.{endpoint}", hit=True)
+        return entry["value"], entry["fresh_until"] <= time.time()
+
+    # -----------------------------
+    # Sync
+    # -----------------------------
+    def get_or_load(self, endpoint: str, key: str, loader: Callable[[], Any]) -> Any:
+        value, stale = self._lookup(endpoint, key)
+        if value is None:
+            value = loader()
+            self._store(endpoint, key, value)
+            return value
+
+        if stale:
+            self._refresh(endpoint, key, loader)
+        return value
+
+    def _refresh(self, endpoint: str, key: str, loader: Callable[[], Any]):
+        """
+        One background reload per stale key (stale-while-revalidate).
+        """
+        if not self._claim_refresh(key):
+            return
+
+        def refresh():
+            try:
+                self._store(endpoint, key, loader())
+            finally:
+                self._release_refresh(key)
+
+        self._executor.submit(refresh)
+
+    # -----------------------------
+    # Async
+    # -----------------------------
+    async def aget_or_load(self, endpoint: str, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value, stale = self._lookup(endpoint, key)
+        if value is None:
+            value = await loader()
+            self._store(endpoint, key, value)
+            return value
+
+        if stale:
+            self._arefresh(endpoint, key, loader)
+        return value
+
+    def _arefresh(self, endpoint: str, key: str, loader: Callable[[], Awaitable[Any]]):
+        if not self._claim_refresh(key):
+            return
+
+        async def refresh():
+            try:
+                self._store(endpoint, key, await loader())
+            finally:
+                self._release_refresh(key)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # -----------------------------
+    # Batch loaders
+    # -----------------------------
+    def peek(self, endpoint: str, key: str, loader: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Cached value (fresh or stale) without loading; None on a miss.
+        A stale hit schedules the same background refresh as get_or_load.
+        """
+        value, stale = self._lookup(endpoint, key)
+        if value is not None and stale and loader is not None:
+            self._refresh(endpoint, key, loader)
+        return value
+
+    def apeek(self, endpoint: str, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        peek for async callers; the refresh runs on the current loop.
+        """
+        value, stale = self._lookup(endpoint, key)
+        if value is not None and stale:
+            self._arefresh(endpoint, key, loader)
+        return value
+
+    def prime(self, endpoint: str, key: str, response: Any):
+        """
+        Store one result of a bulk request under its single-item key.
+        """
+        self._store(endpoint, key, response)
+
+    def invalidate(self, key: str):
+        self.backend.delete(key)
+
+
+response_cache = ReadThroughCache(backend_from_env())
+
+
+def _reset_after_fork():
+    # Refresh threads (and any lock they held) do not survive fork
+    response_cache._refreshing = set()
+    response_cache._refresh_lock = threading.Lock()
+    response_cache._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,93 @@
+"""
+single_flight.py
+----------------
+
+Request coalescing for identical in-flight backend calls.
+
+✔ Concurrent callers with the same key share one upstream call
+✔ Every caller gets the same result (or the same exception)
+✔ Sync (threads) and async (asyncio) variants
+✔ Nothing is cached: the key is released as soon as the call finishes
+
+Used by the commerce clients for GET requests, so a spike of chats about
+the same order / SKU / shipment sends one request to the Java services.
+Shared results must be treated as read-only.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from observability.tracer import record_cache
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-based single-flight group.
+    """
+
+    def __init__(self, name: str = "commerce.singleflight"):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        record_cache(self.name, hit=not leader)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    asyncio single-flight group; bound to one event loop.
+
+    The shared call runs as its own task, so a caller being cancelled
+    does not cancel the request for everybody else.
+    """
+
+    def __init__(self, name: str = "commerce.singleflight"):
+        self.name = name
+        self._tasks: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        record_cache(self.name, hit=task is not None)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
@@ -0,0 +1,34 @@
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.springframework.web.bind.annotation.*;
+import org.springframework.http.ResponseEntity;
+
+@RestController
+@RequestMapping("/catalog")
+public class CatalogController {
+
+    private static final Map<String, Map<String, Object>> PRODUCTS = Map.of(
+        "SKU1001", Map.of("sku", "SKU1001", "name", "Noise Cancelling Headphones", "brand", "SoundMax", "price", 2999),
+        "SKU1002", Map.of("sku", "SKU1002", "name", "Wireless Earbuds Pro", "brand", "EarTech", "price", 1999)
+    );
+
+    @GetMapping("/product/{sku}")
+    public ResponseEntity<Map<String, Object>> getProduct(@PathVariable String sku) {
+        Map<String, Object> product = PRODUCTS.get(sku);
+        return product == null ? ResponseEntity.notFound().build() : ResponseEntity.ok(product);
+    }
+
+    // {"skus": [...]} -> {"products": {sku: product}}; unknown SKUs are omitted
+    @PostMapping("/products/bulk")
+    public Map<String, Object> getProducts(@RequestBody Map<String, List<String>> body) {
+        Map<String, Object> found = new HashMap<>();
+        for (String sku : body.getOrDefault("skus", List.of())) {
+            if (PRODUCTS.containsKey(sku)) {
+                found.put(sku, PRODUCTS.get(sku));
+            }
+        }
+        return Map.of("products", found);
+    }
+}
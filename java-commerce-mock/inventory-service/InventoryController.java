@@ -0,0 +1,33 @@
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.springframework.web.bind.annotation.*;
+
+@RestController
+@RequestMapping("/inventory")
+public class InventoryController {
+
+    private Map<String, Object> stock(String sku) {
+        return Map.of(
+            "sku", sku,
+            "available", Math.abs(sku.hashCode()) % 200,
+            "warehouse", "BLR-1"
+        );
+    }
+
+    @GetMapping("/{sku}")
+    public Map<String, Object> getInventory(@PathVariable String sku) {
+        return stock(sku);
+    }
+
+    // {"skus": [...]} -> {"inventory": {sku: stock}}
+    @PostMapping("/bulk")
+    public Map<String, Object> getInventoryBulk(@RequestBody Map<String, List<String>> body) {
+        Map<String, Object> levels = new HashMap<>();
+        for (String sku : body.getOrDefault("skus", List.of())) {
+            levels.put(sku, stock(sku));
+        }
+        return Map.of("inventory", levels);
+    }
+}
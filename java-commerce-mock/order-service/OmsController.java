@@ -0,0 +1,33 @@
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+import org.springframework.web.bind.annotation.*;
+
+@RestController
+@RequestMapping("/oms")
+public class OmsController {
+
+    private Map<String, Object> order(String orderId) {
+        return Map.of(
+            "order_id", orderId,
+            "status", "SHIPPED",
+            "delivery_date", "2025-10-25"
+        );
+    }
+
+    @GetMapping("/order/{orderId}")
+    public Map<String, Object> getOrder(@PathVariable String orderId) {
+        return order(orderId);
+    }
+
+    // {"order_ids": [...]} -> {"orders": {order_id: order}}
+    @PostMapping("/orders/bulk")
+    public Map<String, Object> getOrders(@RequestBody Map<String, List<String>> body) {
+        Map<String, Object> orders = new HashMap<>();
+        for (String orderId : body.getOrDefault("order_ids", List.of())) {
+            orders.put(orderId, order(orderId));
+        }
+        return Map.of("orders", orders);
+    }
+}
@@ -0,0 +1,95 @@
+"""
+auth_benchmark.py
+-----------------
+
+Microbenchmark of per-request gateway auth cost.
+
+✔ "before": the original path (HS256 verification on every call, linear
+  scan over API_KEYS with ==, role list membership)
+✔ "after": api_gateway.auth (verified-token cache, hashed key index with
+  constant-time compare, RBAC bitsets)
+
+    PYTHONPATH=. python -m load_tests.auth_benchmark --iterations 200000
+
+JWT checks dominate (a full HMAC verification + JSON decode per call).
+The API-key path is not faster after the change: it pays one SHA-256
+for a lookup whose timing no longer depends on how much of a key matched.
+"""
+
+import argparse
+import json
+import timeit
+from typing import Callable, Dict
+
+import jwt
+
+from api_gateway import auth
+
+
+# -----------------------------
+# Original implementation
+# -----------------------------
+def before_decode_jwt(token: str) -> Dict:
+    return jwt.decode(token, auth.JWT_SECRET, algorithms=[auth.JWT_ALGORITHM])
+
+
+def before_validate_api_key(x_api_key: str) -> str:
+    for client_name, key in auth.API_KEYS.items():
+        if x_api_key == key:
+            return client_name
+    raise ValueError("Invalid API key")
+
+
+def before_has_role(client_name: str, role: str) -> bool:
+    return role in auth.ROLE_MAP.get(client_name, [])
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+def per_call_ns(fn: Callable[[], object], iterations: int) -> float:
+    fn()  # warm caches
+    best = min(timeit.repeat(fn, number=iterations, repeat=3))
+    return best / iterations * 1e9
+
+
+def run(iterations: int) -> Dict[str, Dict[str, float]]:
+    token = auth.generate_jwt("U1001", "CSR")
+    api_key = auth.API_KEYS["mobile-app"]  # last key: worst case for the scan
+
+    cases = {
+        "jwt": (lambda: before_decode_jwt(token), lambda: auth.decode_jwt(token)),
+        "api_key": (lambda: before_validate_api_key(api_key), lambda: auth.validate_api_key(api_key)),
+        "rbac": (lambda: before_has_role("csr-portal", "ADMIN"), lambda: auth.has_role("csr-portal", "ADMIN")),
+    }
+    results = {}
+    for name, (before, after) in cases.items():
+        # JWT verification is orders of magnitude slower; fewer iterations
+        n = max(iterations // 50, 1) if name == "jwt" else iterations
+        before_ns = per_call_ns(before, n)
+        after_ns = per_call_ns(after, n)
+        results[name] = {
+            "before_ns": round(before_ns, 1),
+            "after_ns": round(after_ns, 1),
+            "speedup": round(before_ns / after_ns, 1),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'check':<10}{'before ns':>12}{'after ns':>12}{'speedup':>10}")
+    for name, row in results.items():
+        print(f"{name:<10}{row['before_ns']:>12}{row['after_ns']:>12}{row['speedup']:>9}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+embedding_benchmark.py
+----------------------
+
+Throughput of the embedding backends on the same texts.
+
+✔ "torch": SentenceTransformer on PyTorch (the original encoder)
+✔ "onnx": int8 ONNX export on onnxruntime (embeddings/export_onnx.py)
+✔ Single-query latency (run_rag path) and batch throughput
+  (embed_documents.py path), plus cosine parity against torch
+
+    PYTHONPATH=.:agent_service python -m load_tests.embedding_benchmark --threads 4
+
+Both backends are given the same thread count so the comparison is per
+core, not per node.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from ai_service.embedding_backend import OnnxEncoder, cosine_parity
+from embeddings.export_onnx import catalog_texts, load_sentence_transformer
+
+
+def timed(fn: Callable[[], object], repeat: int) -> List[float]:
+    fn()  # warm-up: lazy sessions, allocator, caches
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def run(threads: int, batch_size: int, documents: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    import torch
+
+    torch.set_num_threads(threads)
+    encoders = {
+        "torch": load_sentence_transformer(OnnxEncoder().config["model"]),
+        "onnx": OnnxEncoder(threads=threads),
+    }
+
+    texts = catalog_texts()
+    corpus = (texts * (documents // len(texts) + 1))[:documents]
+    query = "Can I return a laptop after 30 days?"
+
+    results = {}
+    for name, encoder in encoders.items():
+        single = timed(lambda: encoder.encode([query]), repeat * 20)
+        batch = timed(lambda: encoder.encode(corpus, batch_size=batch_size), repeat)
+        results[name] = {
+            "query_p50_ms": round(statistics.median(single) * 1e3, 2),
+            "docs_per_s": round(documents / min(batch), 1),
+        }
+
+    parity = cosine_parity(encoders["torch"].encode(texts), encoders["onnx"].encode(texts))
+    results["onnx"].update({"cosine_min": parity["min"], "cosine_mean": parity["mean"]})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = run(args.threads, args.batch_size, args.documents, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'backend':<10}{'query p50 ms':>14}{'docs/s':>10}")
+    for name, row in results.items():
+        print(f"{name:<10}{row['query_p50_ms']:>14}{row['docs_per_s']:>10}")
+    speedup = results["onnx"]["docs_per_s"] / results["torch"]["docs_per_s"]
+    print(f"onnx vs torch: {speedup:.1f}x docs/s, cosine min {results['onnx']['cosine_min']}")
+
+
+if __name__ == "__main__":
+    main()
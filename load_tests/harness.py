@@ -0,0 +1,410 @@
+"""
+harness.py
+----------
+
+Open-loop load generator for the AI gateway, the RAG service and the agent
+graph.
+
+✔ Fixed arrival rate (constant or Poisson), independent of response times
+✔ Latency measured from each request's *intended* start time, so queueing
+  behind slow requests is counted (coordinated-omission correction);
+  service time (actual send -> response) is reported alongside
+✔ Realistic intent mix (load_tests/workload.py)
+✔ Stub LLM and the local commerce simulator for in-process runs
+✔ Per-intent p50/p95/p99, throughput and error reports as JSON, with a
+  `compare` command for before/after runs
+
+In-process (stub LLM + simulator, no network):
+    PYTHONPATH=.:agent_service python -m load_tests.harness run --mode in-process --rate 20 --duration 60 \
+        --out load_tests/reports/baseline.json
+
+Against running services:
+    python -m load_tests.harness run --gateway-url http://localhost:8001 \
+        --ai-url http://localhost:8000 --rate 50 --duration 120
+
+    python -m load_tests.harness compare baseline.json candidate.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from load_tests.histogram import LatencyHistogram
+from load_tests.workload import DEFAULT_MIX, Workload
+
+
+# ---------------------------------------------------------
+# Recording
+# ---------------------------------------------------------
+
+class IntentStats:
+    def __init__(self):
+        self.response = LatencyHistogram()   # from intended start (CO-corrected)
+        self.service = LatencyHistogram()    # from actual send
+        self.errors: Dict[str, int] = {}
+
+    def record(self, response_ms: float, service_ms: float, error: Optional[str]):
+        self.response.record(response_ms)
+        self.service.record(service_ms)
+        if error:
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    def merge(self, other: "IntentStats"):
+        self.response.merge(other.response)
+        self.service.merge(other.service)
+        for error, count in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+
+    def report(self, duration_s: float) -> Dict[str, Any]:
+        count = self.response.count
+        error_count = sum(self.errors.values())
+        return {
+            "count": count,
+            "throughput_rps": round(count / duration_s, 2) if duration_s else 0.0,
+            "error_rate": round(error_count / count, 4) if count else 0.0,
+            "errors": dict(sorted(self.errors.items(), key=lambda e: -e[1])),
+            "latency_ms": self.response.summary(),
+            "service_time_ms": self.service.summary(),
+            "histogram": self.response.to_dict(),
+        }
+
+
+class Recorder:
+    def __init__(self):
+        self.intents: Dict[str, IntentStats] = {}
+
+    def record(self, intent: str, response_ms: float, service_ms: float, error: Optional[str]):
+        self.intents.setdefault(intent, IntentStats()).record(response_ms, service_ms, error)
+
+    def report(self, duration_s: float) -> Dict[str, Any]:
+        overall = IntentStats()
+        for stats in self.intents.values():
+            overall.merge(stats)
+        return {
+            "intents": {name: s.report(duration_s) for name, s in sorted(self.intents.items())},
+            "overall": overall.report(duration_s),
+        }
+
+
+# ---------------------------------------------------------
+# Targets
+# ---------------------------------------------------------
+
+def _http_error(response: httpx.Response) -> Optional[str]:
+    return f"HTTP {response.status_code}" if response.status_code >= 400 else None
+
+
+def _chat_payload(request: Dict[str, Any]) -> Dict[str, Any]:
+    # /chat takes the graph's initial AgentState
+    return {"user_query": request["query"], "customer_id": request["customer_id"]}
+
+
+def _chat_error(response: httpx.Response) -> Optional[str]:
+    """
+    An answer without the graph's intent / result is not an agent flow;
+    count it as an error rather than record its latency as one.
+    """
+    error = _http_error(response)
+    if error is None and not {"intent", "result"} <= set(response.json()):
+        return "unexpected /chat response (not the agent graph)"
+    return error
+
+
+def _auth_headers(api_key: Optional[str]) -> Dict[str, str]:
+    # The gateway rate-limits per client; anonymous callers get a tiny budget
+    return {"X-API-Key": api_key} if api_key else {}
+
+
+class HttpTarget:
+    """
+    Running services; agent flows go through the gateway's /chat.
+    """
+
+    def __init__(self, gateway_url: str, ai_url: str, timeout_s: float = 30.0, api_key: Optional[str] = None):
+        self.gateway_url = gateway_url.rstrip("/")
+        self.ai_url = ai_url.rstrip("/")
+        self.client = httpx.AsyncClient(
+            timeout=timeout_s,
+            limits=httpx.Limits(max_connections=1000),
+            headers=_auth_headers(api_key)
+        )
+
+    async def send(self, request: Dict[str, Any]) -> Optional[str]:
+        if request["channel"] == "ask":
+            return _http_error(await self.client.get(f"{self.ai_url}/ask", params={"q": request["query"]}))
+        return _chat_error(await self.client.post(f"{self.gateway_url}/chat", json=_chat_payload(request)))
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class InProcessTarget:
+    """
+    Gateway and RAG apps over ASGI transports and the agent graph invoked
+    directly, all in this process. Apps that fail to import (e.g. missing
+    FAISS index) are reported as errors for their channel.
+    """
+
+    def __init__(self, timeout_s: float = 30.0, api_key: Optional[str] = None):
+        self.unavailable: Dict[str, str] = {}
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        for channel, module in (("chat", "api_gateway.routes"), ("ask", "ai_service.main")):
+            try:
+                app = __import__(module, fromlist=["app"]).app
+            except Exception as ex:
+                self.unavailable[channel] = f"unavailable: {type(ex).__name__}"
+                continue
+            self.clients[channel] = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://inprocess", timeout=timeout_s,
+                headers=_auth_headers(api_key)
+            )
+
+        from agent_service.agent_graph import build_agent_graph
+        self.graph = build_agent_graph()
+
+    async def send(self, request: Dict[str, Any]) -> Optional[str]:
+        channel = request["channel"]
+        if channel in self.unavailable:
+            return self.unavailable[channel]
+        if channel == "agent":
+            await asyncio.to_thread(self.graph.invoke, _chat_payload(request))
+            return None
+        if channel == "ask":
+            return _http_error(await self.clients["ask"].get("/ask", params={"q": request["query"]}))
+        return _chat_error(await self.clients["chat"].post("/chat", json=_chat_payload(request)))
+
+    async def aclose(self):
+        await asyncio.gather(*(c.aclose() for c in self.clients.values()))
+
+
+# ---------------------------------------------------------
+# Open-loop Runner
+# ---------------------------------------------------------
+
+async def run_open_loop(
+    target,
+    workload: Workload,
+    rate: float,
+    duration_s: float,
+    warmup_s: float = 0.0,
+    max_in_flight: int = 1000,
+    arrival: str = "constant"
+) -> Recorder:
+    """
+    Issue requests on a fixed schedule; each latency is measured from the
+    request's scheduled start, not from when it was actually sent.
+    """
+    loop = asyncio.get_running_loop()
+    recorder = Recorder()
+    slots = asyncio.Semaphore(max_in_flight)
+    tasks = set()
+    start = loop.time()
+    measure_from = start + warmup_s
+    end = measure_from + duration_s
+
+    async def fire(request: Dict[str, Any], intended: float):
+        async with slots:
+            sent = loop.time()
+            try:
+                error = await target.send(request)
+            except Exception as ex:
+                error = type(ex).__name__
+        done = loop.time()
+        if intended >= measure_from:
+            recorder.record(request["intent"], (done - intended) * 1000, (done - sent) * 1000, error)
+
+    scheduled = start
+    count = 0
+    while scheduled < end:
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.ensure_future(fire(workload.next_request(), scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+        count += 1
+        if arrival == "poisson":
+            scheduled += workload.rng.expovariate(rate)
+        else:
+            scheduled = start + count / rate
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    return recorder
+
+
+# ---------------------------------------------------------
+# In-process Dependencies
+# ---------------------------------------------------------
+
+def start_simulator(products: int = 10000, orders: int = 50000, faults: Optional[str] = None) -> str:
+    """
+    Run the commerce simulator on a free local port in a daemon thread and
+    point the commerce client at it (before the client is imported).
+    """
+    import uvicorn
+
+    from simulator.dataset import CommerceDataset
+    from simulator.faults import FaultInjector
+    from simulator.server import create_app
+
+    profiles = None
+    if faults:
+        with open(faults) as f:
+            profiles = json.load(f)
+    app = create_app(
+        CommerceDataset.from_files("data", products=products, orders=orders),
+        FaultInjector(profiles),
+    )
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="commerce-simulator", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    os.environ["JAVA_COMMERCE_BASE_URL"] = base_url
+    return base_url
+
+
+# ---------------------------------------------------------
+# Reports
+# ---------------------------------------------------------
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def print_report(report: Dict[str, Any]):
+    header = f"{'intent':<20}{'count':>8}{'rps':>8}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["intents"].items()) + [("OVERALL", report["overall"])]
+    for name, stats in rows:
+        lat = stats["latency_ms"]
+        print(
+            f"{name:<20}{stats['count']:>8}{stats['throughput_rps']:>8.1f}"
+            f"{stats['error_rate'] * 100:>7.1f}{lat['p50']:>9.1f}{lat['p95']:>9.1f}"
+            f"{lat['p99']:>9.1f}{lat['max']:>9.1f}"
+        )
+
+
+def compare_reports(baseline: Dict[str, Any], candidate: Dict[str, Any]):
+    """
+    Per-intent p50/p95/p99 and throughput change (candidate vs baseline).
+    """
+    def pct(new, old):
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    print(f"{'intent':<20}{'p50':>10}{'p95':>10}{'p99':>10}{'rps':>10}{'err%':>10}")
+    names = sorted(set(baseline["intents"]) | set(candidate["intents"])) + ["OVERALL"]
+    for name in names:
+        old = baseline["overall"] if name == "OVERALL" else baseline["intents"].get(name)
+        new = candidate["overall"] if name == "OVERALL" else candidate["intents"].get(name)
+        if not old or not new:
+            print(f"{name:<20}{'only in ' + ('candidate' if new else 'baseline'):>50}")
+            continue
+        cells = [pct(new["latency_ms"][p], old["latency_ms"][p]) for p in ("p50", "p95", "p99")]
+        cells.append(pct(new["throughput_rps"], old["throughput_rps"]))
+        cells.append(f"{(new['error_rate'] - old['error_rate']) * 100:+.2f}")
+        print(f"{name:<20}" + "".join(f"{c:>10}" for c in cells))
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+async def _run(args) -> Dict[str, Any]:
+    if args.mode == "in-process":
+        if not args.no_simulator:
+            start_simulator(args.sim_products, args.sim_orders, args.sim_faults)
+        from load_tests.stub_llm import StubLLM, install_stub_llm
+        install_stub_llm(StubLLM(args.llm_median_ms, seed=args.seed))
+        target = InProcessTarget(args.timeout_s, args.api_key)
+    else:
+        target = HttpTarget(args.gateway_url, args.ai_url, args.timeout_s, args.api_key)
+
+    workload = Workload(Workload.parse_mix(args.mix) if args.mix else DEFAULT_MIX, seed=args.seed)
+    try:
+        recorder = await run_open_loop(
+            target, workload, args.rate, args.duration, args.warmup, args.max_in_flight, args.arrival
+        )
+    finally:
+        await target.aclose()
+
+    report = recorder.report(args.duration)
+    report["run"] = {
+        "mode": args.mode,
+        "rate": args.rate,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+        "arrival": args.arrival,
+        "mix": workload.mix,
+        "git": _git_revision(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load test harness")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run")
+    run.add_argument("--mode", choices=["http", "in-process"], default="http")
+    run.add_argument("--gateway-url", default="http://localhost:8001")
+    run.add_argument("--ai-url", default="http://localhost:8000")
+    run.add_argument("--rate", type=float, default=10.0, help="requests per second")
+    run.add_argument("--duration", type=float, default=60.0, help="measured seconds")
+    run.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before")
+    run.add_argument("--arrival", choices=["constant", "poisson"], default="constant")
+    run.add_argument("--max-in-flight", type=int, default=1000)
+    run.add_argument("--timeout-s", type=float, default=30.0)
+    run.add_argument("--mix", help='e.g. "catalog_search=50,faq=20,order_status=30"')
+    run.add_argument("--seed", type=int, default=11)
+    run.add_argument("--api-key", default="AI_INTERNAL_KEY_12345", help="client the gateway attributes load to")
+    run.add_argument("--llm-median-ms", type=float, default=400.0)
+    run.add_argument("--no-simulator", action="store_true")
+    run.add_argument("--sim-products", type=int, default=10000)
+    run.add_argument("--sim-orders", type=int, default=50000)
+    run.add_argument("--sim-faults")
+    run.add_argument("--out", help="write the JSON report here")
+
+    compare = sub.add_parser("compare")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline) as f, open(args.candidate) as g:
+            compare_reports(json.load(f), json.load(g))
+        return
+
+    report = asyncio.run(_run(args))
+    print_report(report)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
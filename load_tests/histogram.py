@@ -0,0 +1,80 @@
+"""
+histogram.py
+------------
+
+Log-bucketed latency histogram (HDR-style, ~1% relative precision).
+
+Constant memory per series, mergeable across runs / workers, and
+serialisable into the JSON report so percentiles can be recomputed later.
+"""
+
+import math
+from typing import Any, Dict, List, Optional
+
+PRECISION = 0.01
+_LOG_BASE = math.log1p(PRECISION)
+MIN_VALUE_MS = 0.01
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: Optional[Dict[int, int]] = None,
+                 total_ms: float = 0.0, max_ms: Optional[float] = None):
+        self.buckets: Dict[int, int] = dict(buckets or {})
+        self.count = sum(self.buckets.values())
+        # Without the exact max, the top bucket's upper bound
+        self.max_ms = max_ms if max_ms is not None else max((self._upper(b) for b in self.buckets), default=0.0)
+        self.total_ms = total_ms
+
+    @staticmethod
+    def _index(value_ms: float) -> int:
+        return int(math.log(max(value_ms, MIN_VALUE_MS) / MIN_VALUE_MS) / _LOG_BASE)
+
+    @staticmethod
+    def _upper(index: int) -> float:
+        return MIN_VALUE_MS * math.exp((index + 1) * _LOG_BASE)
+
+    def record(self, value_ms: float):
+        index = self._index(value_ms)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q-th percentile (0-100).
+        """
+        if not self.count:
+            return 0.0
+        rank = max(math.ceil(self.count * q / 100), 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self._upper(index), self.max_ms)
+        return self.max_ms
+
+    def summary(self, percentiles: List[float] = (50, 95, 99, 99.9)) -> Dict[str, float]:
+        stats = {f"p{q:g}": round(self.percentile(q), 2) for q in percentiles}
+        stats["max"] = round(self.max_ms, 2)
+        stats["mean"] = round(self.total_ms / self.count, 2) if self.count else 0.0
+        return stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "buckets": {str(index): count for index, count in sorted(self.buckets.items())},
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        buckets = {int(index): count for index, count in data["buckets"].items()}
+        return cls(buckets, total_ms=data["total_ms"], max_ms=data["max_ms"])
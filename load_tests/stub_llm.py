@@ -0,0 +1,64 @@
+"""
+stub_llm.py
+-----------
+
+Load-test flavour of the llm_backend stub: the same deterministic
+answers (keyword intents for classification prompts), with a lognormal
+latency distribution so load tests measure the service and not the
+model provider.
+"""
+
+import asyncio
+import importlib
+import logging
+import random
+from typing import List, Optional
+
+from ai_service.llm_backend import StubChatModel
+
+logger = logging.getLogger(__name__)
+
+# Modules that own an `llm_policy`
+POLICY_MODULES = [
+    "agent_service.agent_graph",
+    "agents.catalog_agent",
+    "agents.order_agent",
+    "agents.return_agent",
+    "agents.cancel_agent",
+    "ai_service.rag_pipeline",
+]
+
+
+class StubLLM(StubChatModel):
+    def __init__(self, median_ms: float = 400.0, sigma: float = 0.5, seed: Optional[int] = None):
+        super().__init__("stub", ttft_ms=0, tokens_per_s=0)
+        self.model_name = "stub"
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.rng = random.Random(seed)
+
+    async def ainvoke(self, prompt):
+        message, _ = self._respond(prompt)
+        delay_ms = self.rng.lognormvariate(0, self.sigma) * self.median_ms if self.median_ms else 0
+        await asyncio.sleep(delay_ms / 1000)
+        return message
+
+    def invoke(self, prompt):
+        return asyncio.run(self.ainvoke(prompt))
+
+
+def install_stub_llm(stub: StubLLM, modules: List[str] = POLICY_MODULES) -> List[str]:
+    """
+    Replace every tier of each module's llm_policy with `stub`.
+    Returns the modules that were patched.
+    """
+    patched = []
+    for name in modules:
+        try:
+            module = importlib.import_module(name)
+        except Exception as ex:
+            logger.warning("Stub LLM not installed in %s: %s", name, ex)
+            continue
+        module.llm_policy.tiers = [stub]
+        patched.append(name)
+    return patched
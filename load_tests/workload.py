@@ -0,0 +1,107 @@
+"""
+workload.py
+-----------
+
+Intent mix and query generation for load tests.
+
+Queries are built from data/*.json (real SKUs, product names, order IDs)
+so the entity extractor, agents and commerce calls see realistic input.
+"""
+
+import json
+import os
+import random
+from typing import Any, Dict, List, Tuple
+
+# (intent, channel, weight); channel: agent graph, /chat or /ask
+DEFAULT_MIX: List[Tuple[str, str, float]] = [
+    ("catalog_search", "agent", 30),
+    ("order_status", "agent", 22),
+    ("return_request", "agent", 8),
+    ("order_cancellation", "agent", 6),
+    ("pricing_query", "agent", 6),
+    ("faq", "ask", 18),
+    ("legacy_chat", "chat", 10),
+]
+
+TEMPLATES = {
+    "catalog_search": [
+        "Do you have {product} in stock?",
+        "Compare {product} with similar {category} items",
+        "Show me {brand} products under 5000",
+    ],
+    "order_status": [
+        "Where is my order {order_id}?",
+        "Track order {order_id} please",
+        "When will {order_id} be delivered?",
+    ],
+    "return_request": [
+        "I want to return {sku} from order {order_id}",
+        "Return the {product} in {order_id}, it is damaged",
+    ],
+    "order_cancellation": [
+        "Cancel my order {order_id}",
+        "Please cancel {order_id}, I ordered by mistake",
+    ],
+    "pricing_query": [
+        "Quote {qty} x {sku} for our account",
+        "What is the price for {qty} units of {sku}?",
+    ],
+    "faq": [
+        "What is the return policy for {category}?",
+        "How long do refunds take?",
+        "Which carriers do you ship with?",
+    ],
+    "legacy_chat": [
+        "What is the status of my order?",
+        "Show my recent orders",
+    ],
+}
+
+
+class Workload:
+    def __init__(self, mix: List[Tuple[str, str, float]] = DEFAULT_MIX, data_dir: str = "data", seed: int = 11):
+        self.mix = list(mix)
+        self.rng = random.Random(seed)
+
+        def load(name):
+            with open(os.path.join(data_dir, name)) as f:
+                return json.load(f)
+
+        self.products = load("products.json")
+        self.orders = load("orders.json")
+        self.customers = load("customer.json")
+
+    @classmethod
+    def parse_mix(cls, spec: str) -> List[Tuple[str, str, float]]:
+        """
+        "catalog_search=30,faq:ask=10" -> [(intent, channel, weight)];
+        the channel defaults to the one in DEFAULT_MIX.
+        """
+        channels = {intent: channel for intent, channel, _ in DEFAULT_MIX}
+        mix = []
+        for part in spec.split(","):
+            name, weight = part.split("=")
+            intent, _, channel = name.partition(":")
+            mix.append((intent, channel or channels.get(intent, "agent"), float(weight)))
+        return mix
+
+    def next_request(self) -> Dict[str, Any]:
+        intent, channel, _ = self.rng.choices(self.mix, weights=[w for _, _, w in self.mix])[0]
+        product = self.rng.choice(self.products)
+        order = self.rng.choice(self.orders)
+        customer = self.rng.choice(self.customers)
+        query = self.rng.choice(TEMPLATES[intent]).format(
+            product=product["name"],
+            brand=product.get("brand", ""),
+            category=product.get("category", ""),
+            sku=product["sku"],
+            order_id=order["order_id"],
+            qty=self.rng.choice([1, 5, 20, 100]),
+        )
+        return {
+            "intent": intent,
+            "channel": channel,
+            "query": query,
+            "customer_id": customer["customer_id"],
+        }
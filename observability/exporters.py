@@ -0,0 +1,146 @@
+"""
+exporters.py
+------------
+Pluggable trace exporters:
+✔ InMemoryExporter   -> tests
+✔ JsonlExporter      -> one JSON trace per line on disk
+✔ PrometheusExporter -> latency histograms + token / cost / cache counters
+                        served from GET /metrics
+
+Every exporter implements:
+    export(trace)             finished graph invocation
+    observe_span(span)        finished span (streaming metrics)
+    observe_cache(cache, hit) cache lookup
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from observability.tracer import Span, Trace, configure_exporters
+
+
+class InMemoryExporter:
+    def __init__(self):
+        self.traces: List[Dict[str, Any]] = []
+
+    def export(self, trace: Trace):
+        self.traces.append(trace.to_dict())
+
+    def observe_span(self, span: Span):
+        pass
+
+    def observe_cache(self, cache: str, hit: bool):
+        pass
+
+
+class JsonlExporter:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace):
+        line = json.dumps(trace.to_dict(), default=str)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    def observe_span(self, span: Span):
+        pass
+
+    def observe_cache(self, cache: str, hit: bool):
+        pass
+
+
+# Seconds; tuned for sub-ms tool calls up to multi-second LLM calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class PrometheusExporter:
+    """
+    Aggregates spans into Prometheus-style histograms and counters and
+    renders them in the text exposition format.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # (kind, name) -> [bucket counts..., +Inf], sum, count
+        self._histograms: Dict[Tuple[str, str], List[Any]] = {}
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = defaultdict(float)
+        self._gauges: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+    def export(self, trace: Trace):
+        pass
+
+    def observe_span(self, span: Span):
+        seconds = (span.duration_ms or 0.0) / 1000
+        key = (span.kind, span.name)
+        with self._lock:
+            hist = self._histograms.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            hist[0][bisect_left(self.buckets, seconds)] += 1
+            hist[1] += seconds
+            hist[2] += 1
+
+            labels = (("kind", span.kind), ("name", span.name))
+            if span.error:
+                self._counters[("agent_span_errors_total", labels)] += 1
+            if span.kind == "llm":
+                model = (("model", span.attrs.get("model", "unknown")),)
+                self._counters[("llm_prompt_tokens_total", model)] += span.attrs.get("prompt_tokens", 0)
+                self._counters[("llm_completion_tokens_total", model)] += span.attrs.get("completion_tokens", 0)
+                self._counters[("llm_cost_usd_total", model)] += span.attrs.get("cost_usd", 0.0)
+
+    def observe_cache(self, cache: str, hit: bool):
+        name = "cache_hits_total" if hit else "cache_misses_total"
+        with self._lock:
+            self._counters[(name, (("cache", cache),))] += 1
+
+    def set_gauge(self, name: str, value: float, **labels: str):
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def render(self) -> str:
+        lines = ["# TYPE agent_span_duration_seconds histogram"]
+        with self._lock:
+            for (kind, name), (counts, total, count) in sorted(self._histograms.items()):
+                labels = f'kind="{kind}",name="{name}"'
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f'agent_span_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'agent_span_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"agent_span_duration_seconds_sum{{{labels}}} {total:.6f}")
+                lines.append(f"agent_span_duration_seconds_count{{{labels}}} {count}")
+
+            for kind, series in (("counter", self._counters), ("gauge", self._gauges)):
+                seen = set()
+                for (metric, labels), value in sorted(series.items()):
+                    if metric not in seen:
+                        lines.append(f"# TYPE {metric} {kind}")
+                        seen.add(metric)
+                    label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                    lines.append(f"{metric}{{{label_text}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def exporters_from_env() -> List[Any]:
+    """
+    TRACE_EXPORTERS=prometheus,jsonl (default: prometheus)
+    TRACE_JSONL_PATH=traces.jsonl
+    """
+    exporters: List[Any] = []
+    for kind in os.getenv("TRACE_EXPORTERS", "prometheus").split(","):
+        kind = kind.strip()
+        if kind == "prometheus":
+            exporters.append(PrometheusExporter())
+        elif kind == "jsonl":
+            exporters.append(JsonlExporter(os.getenv("TRACE_JSONL_PATH", "traces.jsonl")))
+        elif kind == "memory":
+            exporters.append(InMemoryExporter())
+    return exporters
+
+
+configure_exporters(exporters_from_env())
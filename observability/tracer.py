@@ -0,0 +1,275 @@
+"""
+tracer.py
+---------
+Per-invocation tracing for the agent graph.
+
+Each graph invocation opens a trace; graph nodes, tool calls and LLM
+calls open spans inside it. Spans record:
+✔ Timing
+✔ Prompt / completion tokens and cost (LLM spans)
+✔ Cache hits / misses
+✔ Errors
+
+Finished traces are handed to the configured exporters
+(see observability/exporters.py).
+"""
+
+import functools
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+# USD per 1M tokens: (prompt, completion)
+MODEL_PRICING = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+
+
+# -----------------------------
+# Trace Model
+# -----------------------------
+class Span:
+    def __init__(self, name: str, kind: str, parent: Optional["Span"] = None, **attrs: Any):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.kind = kind              # graph | node | tool | llm
+        self.attrs: Dict[str, Any] = dict(attrs)
+        self.start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def finish(self):
+        self.duration_ms = round((time.perf_counter() - self.start) * 1000, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+            **self.attrs,
+        }
+
+
+class Trace:
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.spans: List[Span] = []
+        self.cache_hits: Dict[str, int] = {}
+        self.cache_misses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def count_cache(self, cache: str, hit: bool):
+        with self._lock:
+            counter = self.cache_hits if hit else self.cache_misses
+            counter[cache] = counter.get(cache, 0) + 1
+
+    def totals(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "prompt_tokens": sum(s.attrs.get("prompt_tokens", 0) for s in spans),
+            "completion_tokens": sum(s.attrs.get("completion_tokens", 0) for s in spans),
+            "cost_usd": round(sum(s.attrs.get("cost_usd", 0.0) for s in spans), 6),
+            "llm_calls": sum(1 for s in spans if s.kind == "llm"),
+            "tool_calls": sum(1 for s in spans if s.kind == "tool"),
+            "errors": sum(1 for s in spans if s.error),
+            "cache_hits": sum(self.cache_hits.values()),
+            "cache_misses": sum(self.cache_misses.values()),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = [s.to_dict() for s in self.spans]
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "spans": spans,
+            "cache_hits": dict(self.cache_hits),
+            "cache_misses": dict(self.cache_misses),
+            "totals": self.totals(),
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+# Per-request LLM token meter (see meter_llm_usage)
+_usage_meter: ContextVar[Optional[Dict[str, int]]] = ContextVar("llm_usage_meter", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+# -----------------------------
+# Spans
+# -----------------------------
+@contextmanager
+def span(name: str, kind: str, **attrs: Any):
+    """
+    Open a span under the current one. Spans outside an active trace
+    are still timed but not exported.
+    """
+    trace = _current_trace.get()
+    current = Span(name, kind, parent=_current_span.get(), **attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as ex:
+        current.error = type(ex).__name__ if not str(ex) else f"{type(ex).__name__}: {ex}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+        if trace is not None:
+            trace.add(current)
+            for exporter in _exporters:
+                exporter.observe_span(current)
+
+
+@contextmanager
+def trace_invocation(name: str = "agent_graph"):
+    """
+    Open a trace for one graph invocation and export it on exit.
+    """
+    trace = Trace(name)
+    trace_token = _current_trace.set(trace)
+    try:
+        with span(name, "graph"):
+            yield trace
+    finally:
+        _current_trace.reset(trace_token)
+        for exporter in _exporters:
+            exporter.export(trace)
+
+
+@contextmanager
+def meter_llm_usage():
+    """
+    Sum the LLM tokens used inside the block (across nested traces and
+    the CallPolicy loop), e.g. for per-client quota accounting.
+    """
+    usage = {"prompt_tokens": 0, "completion_tokens": 0}
+    token = _usage_meter.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage_meter.reset(token)
+
+
+def traced_node(name: str) -> Callable:
+    """
+    Decorator for LangGraph node functions.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(state, *args, **kwargs):
+            with span(name, "node"):
+                return fn(state, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def traced_tool(fn: Callable) -> Callable:
+    """
+    Decorator for tool functions; place it below @tool.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(fn.__name__, "tool"):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+# -----------------------------
+# LLM Usage & Cache Accounting
+# -----------------------------
+def record_llm_usage(current: Span, response: Any, model: str):
+    """
+    Copy token usage from a chat model response onto an LLM span.
+    """
+    usage = getattr(response, "usage_metadata", None) or {}
+    metadata = getattr(response, "response_metadata", None) or {}
+    token_usage = metadata.get("token_usage") or {}
+
+    prompt_tokens = usage.get("input_tokens", token_usage.get("prompt_tokens", 0)) or 0
+    completion_tokens = usage.get("output_tokens", token_usage.get("completion_tokens", 0)) or 0
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+
+    prompt_price, completion_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    current.attrs.update({
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_prompt_tokens": cached_tokens,
+        "cost_usd": (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1e6,
+    })
+    meter = _usage_meter.get()
+    if meter is not None:
+        meter["prompt_tokens"] += prompt_tokens
+        meter["completion_tokens"] += completion_tokens
+    if prompt_tokens:
+        record_cache("llm_prompt_prefix", hit=cached_tokens > 0)
+
+
+def record_cache(cache: str, hit: bool):
+    """
+    Count a cache lookup against the current trace and exporters.
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.count_cache(cache, hit)
+    for exporter in _exporters:
+        exporter.observe_cache(cache, hit)
+
+
+# -----------------------------
+# Exporter Registry
+# -----------------------------
+_exporters: List[Any] = []
+
+
+def configure_exporters(exporters: List[Any]):
+    """
+    Replace the active exporters.
+    """
+    _exporters[:] = list(exporters)
+
+
+def get_exporter(kind: type) -> Optional[Any]:
+    return next((e for e in _exporters if isinstance(e, kind)), None)
+
+
+# -----------------------------
+# Graph Wrapper
+# -----------------------------
+class TracedGraph:
+    """
+    Wraps a compiled graph so every invoke() runs inside its own trace.
+    """
+
+    def __init__(self, compiled: Any, name: str = "agent_graph"):
+        self._compiled = compiled
+        self._name = name
+
+    def invoke(self, state: Dict[str, Any], *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        with trace_invocation(self._name):
+            return self._compiled.invoke(state, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._compiled, name)
@@ -0,0 +1,177 @@
+"""
+app.py
+------
+Unified single-process service: the gateway (/chat, /quote, /usage,
+/health, /metrics) and the RAG service (/ask, /prompts/tokens) on one
+ASGI app.
+
+✔ One copy of every heavy resource per process: embedding model and
+  FAISS index, the compiled multi-agent graph (build_agent_graph), LLM clients and call-policy loop, commerce
+  HTTP pools, response / LLM / token caches, admission and rate limits
+✔ Lifespan warm-up: resources load before the first request instead of
+  on it (a failing warm-up is logged, the rest of the service still runs);
+  with service/server.py they are preloaded once before forking workers
+✔ Heavy modules (agent graph / LangChain, torch, FAISS) are imported
+  lazily (service/lazy.py), so importing the app stays cheap; the
+  warm-up pulls them in unless SERVICE_WARMUP=lazy (scale-to-zero
+  deployments that prefer a fast first byte over a fast first answer)
+✔ Graceful drain on SIGTERM: /health turns 503 and new work is shed
+  while the listener is still open, in-flight requests finish
+  (SERVICE_DRAIN_TIMEOUT_S), and only then does uvicorn shut down and
+  the lifespan close the pools. The drain has to start from the signal
+  (service/server.py DrainingServer): uvicorn runs lifespan shutdown
+  after it has closed the socket and waited for connections
+
+    PYTHONPATH=.:agent_service python -m service.server --workers 1 --port 8000
+"""
+
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi import FastAPI
+
+from ai_service.main import router as ai_router
+from api_gateway.admission import admission, shutdown_worker_pool
+from api_gateway.routes import router as gateway_router
+
+logger = logging.getLogger(__name__)
+
+DRAIN_TIMEOUT_S = float(os.getenv("SERVICE_DRAIN_TIMEOUT_S", "30"))
+# Minimum time /health reports 503 before the listener closes, so load
+# balancers notice even when nothing is in flight
+PRESTOP_DELAY_S = float(os.getenv("SERVICE_PRESTOP_DELAY_S", "0"))
+# eager: warm up in the lifespan hook | lazy: load on first request
+SERVICE_WARMUP = os.getenv("SERVICE_WARMUP", "eager").lower()
+
+
+# -----------------------------
+# Warm-up
+# -----------------------------
+def _warm_rag():
+    from ai_service.rag_pipeline import warm_up
+    warm_up()
+
+
+def _warm_entities():
+    from agents.entity_extractor import extract_entities
+    extract_entities("warm-up ORD1001 SKU1001")
+
+
+def _warm_pricing():
+    from agents.pricing_engine import get_pricing_engine
+    get_pricing_engine()
+
+
+def _warm_llm_cache():
+    from ai_service.llm_cache import get_llm_cache
+    get_llm_cache()
+
+
+def _load_agents():
+    # Compiles build_agent_graph() (get_agent_graph) and binds /chat to it
+    from api_gateway.routes import agent_executor
+    agent_executor.resolve()
+
+
+def _load_rag():
+    from ai_service.rag_pipeline import rag_resources
+    rag_resources()
+
+
+# Loaded once in the pre-fork master (service/server.py) and shared
+# copy-on-write by the workers. Only data and weights: no sockets or
+# SQLite handles; modules owning threads re-arm them after fork.
+PRELOADS: List[Tuple[str, Callable[[], Any]]] = [
+    ("entity_extractor", _warm_entities),
+    ("pricing_engine", _warm_pricing),
+    ("agent_graph", _load_agents),
+    ("rag", _load_rag),
+]
+
+# Per process (every worker): first inference, LLM cache connection
+WARMUPS: List[Tuple[str, Callable[[], Any]]] = [
+    ("entity_extractor", _warm_entities),
+    ("pricing_engine", _warm_pricing),
+    ("llm_cache", _warm_llm_cache),
+    ("agent_graph", _load_agents),
+    ("rag", _warm_rag),
+]
+
+
+def warm_up(warmups: List[Tuple[str, Callable[[], Any]]] = WARMUPS) -> Dict[str, Any]:
+    """
+    Run each warm-up once; returns {name: seconds | "failed: ..."}.
+    """
+    results: Dict[str, Any] = {}
+    for name, fn in warmups:
+        started = time.perf_counter()
+        try:
+            fn()
+        except Exception as ex:
+            logger.warning("Warm-up %s failed: %s", name, ex)
+            results[name] = f"failed: {type(ex).__name__}: {ex}"
+            continue
+        results[name] = round(time.perf_counter() - started, 3)
+    return results
+
+
+# -----------------------------
+# Drain
+# -----------------------------
+def begin_drain():
+    """
+    Called from the signal handler: shed new work, /health -> 503.
+    """
+    admission.draining = True
+
+
+def wait_drained(timeout_s: float = DRAIN_TIMEOUT_S, min_wait_s: float = PRESTOP_DELAY_S) -> bool:
+    """
+    Block (off the event loop) until admitted / queued requests finish.
+    """
+    started = time.monotonic()
+    while time.monotonic() - started < timeout_s:
+        if not admission.pending and time.monotonic() - started >= min_wait_s:
+            return True
+        time.sleep(0.05)
+    logger.warning("Drain timed out with %s requests pending", admission.pending)
+    return False
+
+
+async def drain(timeout_s: float = DRAIN_TIMEOUT_S) -> bool:
+    from integration.async_commerce_client import get_async_client
+    from integration.java_commerce_client import session
+
+    drained = await admission.drain(timeout_s)
+    if not drained:
+        logger.warning("Drain timed out with %s requests in flight", admission.in_flight)
+    await get_async_client().aclose()
+    session.close()
+    shutdown_worker_pool()
+    return drained
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.warmup = warm_up() if SERVICE_WARMUP != "lazy" else {}
+    logger.info("Service warm-up: %s", app.state.warmup)
+    yield
+    await drain()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="Enterprise AI Commerce Service", lifespan=lifespan)
+    app.include_router(gateway_router)
+    app.include_router(ai_router)
+
+    @app.get("/warmup")
+    async def warmup_report():
+        return getattr(app.state, "warmup", {})
+
+    return app
+
+
+app = create_app()
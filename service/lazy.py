@@ -0,0 +1,60 @@
+"""
+lazy.py
+-------
+Deferred imports for heavy dependencies.
+
+✔ `lazy_import(module, name)` stands in for `from module import name`;
+  the import runs on first attribute access or call, once, thread-safely
+✔ `lazy_import(module, factory, call=True)` stands in for the object
+  `factory()` returns (e.g. a compiled graph), built on first use
+✔ Lets the gateway start without langgraph / langchain / openai / torch
+  and pay for them on the first request that needs them (or during
+  warm-up / preload in long-running deployments)
+
+Attributes set on the proxy shadow the target's (tests monkeypatch
+`routes.agent_executor.invoke` this way).
+"""
+
+import importlib
+import threading
+from typing import Any
+
+
+class LazyImport:
+    def __init__(self, module: str, name: str, call: bool = False):
+        self.__dict__["_module"] = module
+        self.__dict__["_name"] = name
+        self.__dict__["_call"] = call
+        self.__dict__["_target"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def resolve(self) -> Any:
+        target = self.__dict__["_target"]
+        if target is None:
+            with self.__dict__["_lock"]:
+                target = self.__dict__["_target"]
+                if target is None:
+                    module = importlib.import_module(self.__dict__["_module"])
+                    target = getattr(module, self.__dict__["_name"])
+                    if self.__dict__["_call"]:
+                        target = target()
+                    self.__dict__["_target"] = target
+        return target
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_target"] is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.resolve(), attr)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy {self.__dict__['_module']}.{self.__dict__['_name']} ({state})>"
+
+
+def lazy_import(module: str, name: str, call: bool = False) -> LazyImport:
+    return LazyImport(module, name, call)
@@ -0,0 +1,295 @@
+"""
+server.py
+---------
+Preload-then-fork server for the unified service (service/app.py).
+
+✔ The master imports the app and loads the embedding model, FAISS index,
+  gazetteer, pricing tables and compiled agent graph once
+  (app.PRELOADS); forked workers share
+  those pages copy-on-write instead of each loading its own copy
+✔ gc.freeze() before fork moves preloaded objects out of the collector's
+  reach, so GC passes in workers do not dirty (and un-share) their pages
+✔ OpenMP / torch / FAISS thread pools are not fork-safe: the master runs
+  single-threaded (OMP_NUM_THREADS=1) and each worker sizes its own pools
+  after fork (WORKER_TORCH_THREADS); modules owning threads, loops, pools
+  or SQLite handles re-create them through os.register_at_fork
+✔ Workers run uvicorn on the master's listening socket; crashed workers
+  are restarted, SIGTERM is forwarded for a graceful drain
+✔ DrainingServer: on SIGTERM a worker first drains (/health 503, new
+  work shed, in-flight requests finish) with the listener still open,
+  then hands over to uvicorn's own shutdown
+✔ Per-worker RSS / PSS / private / shared memory logged periodically
+✔ --profile-startup: import-time breakdown of the entrypoints plus the
+  warm-up timings, then exit (service/startup.py)
+
+    PYTHONPATH=.:agent_service python -m service.server --workers 8 --port 8000
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("service.server")
+
+WORKERS = int(os.getenv("WEB_WORKERS", "4"))
+WORKER_TORCH_THREADS = int(os.getenv("WORKER_TORCH_THREADS", "1"))
+MEMORY_REPORT_INTERVAL_S = float(os.getenv("MEMORY_REPORT_INTERVAL_S", "60"))
+# Worker drain (service/app.py) runs before uvicorn's graceful timeout
+DRAIN_BUDGET_S = (
+    float(os.getenv("SERVICE_DRAIN_TIMEOUT_S", "30")) + float(os.getenv("SERVICE_PRESTOP_DELAY_S", "0"))
+)
+
+# Must be set before torch / numpy / faiss are imported in the master
+SINGLE_THREADED_ENV = {
+    "OMP_NUM_THREADS": "1",
+    "MKL_NUM_THREADS": "1",
+    "OPENBLAS_NUM_THREADS": "1",
+    "TOKENIZERS_PARALLELISM": "false",
+}
+
+
+# -----------------------------
+# Memory Reporting
+# -----------------------------
+SMAPS_FIELDS = {
+    "Rss": "rss_mb",
+    "Pss": "pss_mb",
+    "Shared_Clean": "shared_mb",
+    "Shared_Dirty": "shared_mb",
+    "Private_Clean": "private_mb",
+    "Private_Dirty": "private_mb",
+}
+
+
+def process_memory(pid: int) -> Dict[str, float]:
+    """
+    RSS, PSS (shared pages split across sharers), shared and private
+    memory of one process in MB, from /proc/<pid>/smaps_rollup.
+    """
+    memory = {name: 0.0 for name in SMAPS_FIELDS.values()}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                field, _, rest = line.partition(":")
+                name = SMAPS_FIELDS.get(field)
+                if name:
+                    memory[name] += int(rest.split()[0]) / 1024
+    except (OSError, ValueError, IndexError):
+        return {}
+    return {name: round(value, 1) for name, value in memory.items()}
+
+
+def log_memory(workers: Dict[int, int]):
+    master = process_memory(os.getpid())
+    logger.info("master pid=%s %s", os.getpid(), master)
+    total_pss = master.get("pss_mb", 0.0)
+    for pid, index in sorted(workers.items(), key=lambda item: item[1]):
+        memory = process_memory(pid)
+        total_pss += memory.get("pss_mb", 0.0)
+        logger.info("worker %s pid=%s %s", index, pid, memory)
+    logger.info("total pss=%.1fMB across %s workers", total_pss, len(workers))
+
+
+# -----------------------------
+# Master
+# -----------------------------
+def preload():
+    """
+    Import the app and load shared resources in the master.
+    """
+    from service import app as service_app
+
+    results = service_app.warm_up(service_app.PRELOADS)
+    logger.info("Preloaded before fork: %s", results)
+
+    # Threads alive now will not exist in the workers
+    others = [t.name for t in threading.enumerate() if t is not threading.main_thread()]
+    if others:
+        logger.info("Threads re-created after fork: %s", others)
+
+    gc.collect()
+    gc.freeze()
+    return service_app.app
+
+
+def bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+# -----------------------------
+# Worker
+# -----------------------------
+def configure_worker_threads(threads: int = WORKER_TORCH_THREADS):
+    """
+    Size the numeric thread pools in a freshly forked worker. Only
+    libraries the master already imported are touched.
+    """
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+    if "faiss" in sys.modules:
+        sys.modules["faiss"].omp_set_num_threads(threads)
+
+
+def draining_server(config):
+    """
+    uvicorn.Server that drains the app before starting its own shutdown.
+    Stock uvicorn closes the listener first and runs lifespan shutdown
+    last, so a drain started there sees no traffic at all.
+    """
+    import uvicorn
+
+    from service import app as service_app
+
+    class DrainingServer(uvicorn.Server):
+        _drain_thread: Optional[threading.Thread] = None
+
+        def handle_exit(self, sig, frame):
+            if self._drain_thread is not None or self.should_exit:
+                # Second signal: fall back to uvicorn (SIGINT twice forces exit)
+                return super().handle_exit(sig, frame)
+            service_app.begin_drain()
+            self._drain_thread = threading.Thread(
+                target=self._exit_when_drained, args=(sig, frame), name="drain", daemon=True
+            )
+            self._drain_thread.start()
+
+        def _exit_when_drained(self, sig, frame):
+            service_app.wait_drained()
+            super().handle_exit(sig, frame)
+
+    return DrainingServer(config)
+
+
+def run_worker(app, sock: socket.socket, args: argparse.Namespace):
+    import uvicorn
+
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+        signal.signal(sig, signal.SIG_DFL)
+    gc.enable()
+    configure_worker_threads(args.worker_threads)
+
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    draining_server(config).run(sockets=[sock])
+
+
+def serve(args: argparse.Namespace) -> int:
+    for name, value in SINGLE_THREADED_ENV.items():
+        os.environ.setdefault(name, value)
+    gc.disable()
+
+    app = preload()
+    sock = bind(args.host, args.port)
+    logger.info("Listening on %s:%s with %s workers", args.host, args.port, args.workers)
+
+    workers: Dict[int, int] = {}
+    stopping = threading.Event()
+
+    def spawn(index: int):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(app, sock, args)
+            except BaseException:
+                logger.exception("Worker %s crashed", index)
+                code = 1
+            finally:
+                os._exit(code)
+        workers[pid] = index
+
+    def stop(signum, frame):
+        stopping.set()
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for index in range(args.workers):
+        spawn(index)
+
+    next_report = time.monotonic() + args.report_interval
+    kill_at = None
+    while workers:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid:
+            index = workers.pop(pid)
+            if not stopping.is_set():
+                logger.warning("Worker %s (pid %s) exited with %s; restarting", index, pid, status)
+                time.sleep(1.0)
+                spawn(index)
+            continue
+
+        now = time.monotonic()
+        if stopping.is_set():
+            kill_at = kill_at or now + DRAIN_BUDGET_S + args.graceful_timeout + 5
+            if now >= kill_at:
+                for pid in list(workers):
+                    os.kill(pid, signal.SIGKILL)
+        elif args.report_interval > 0 and now >= next_report:
+            log_memory(workers)
+            next_report = now + args.report_interval
+        time.sleep(0.2)
+
+    sock.close()
+    return 0
+
+
+def profile(args: argparse.Namespace) -> int:
+    from service import startup
+
+    startup.profile_startup()
+
+    from service import app as service_app
+
+    print("\nwarm-up (s):")
+    for name, result in service_app.warm_up(service_app.WARMUPS).items():
+        print(f"  {name:<48}{result:>10}")
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Preload-then-fork server for service.app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--worker-threads", type=int, default=WORKER_TORCH_THREADS)
+    parser.add_argument("--graceful-timeout", type=float, default=30.0)
+    parser.add_argument("--report-interval", type=float, default=MEMORY_REPORT_INTERVAL_S,
+                        help="seconds between per-worker memory reports (0 = off)")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print import-time and warm-up breakdown, then exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s %(message)s")
+    if args.profile_startup:
+        return profile(args)
+    return serve(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+startup.py
+----------
+Cold-start profiling for the service entrypoints.
+
+✔ Import-time breakdown from `python -X importtime` in a fresh
+  interpreter: total, slowest modules (cumulative) and self time per
+  top-level package
+✔ HEAVY_MODULES: dependencies that must stay out of the import path of
+  the gateway / RAG apps (loaded lazily, see service/lazy.py)
+
+    PYTHONPATH=.:agent_service python -m service.server --profile-startup
+"""
+
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+# Budget for importing service.app in a fresh interpreter (seconds)
+IMPORT_BUDGET_S = float(os.getenv("STARTUP_IMPORT_BUDGET_S", "1.5"))
+
+HEAVY_MODULES = (
+    "langgraph",
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "openai",
+    "torch",
+    "sentence_transformers",
+    "faiss",
+    "numpy",
+)
+
+ENTRYPOINTS = ("api_gateway.routes", "ai_service.main", "service.app")
+
+
+def _child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    paths = [".", "agent_service"] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else [])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    env.setdefault("OPENAI_API_KEY", "profile-startup")
+    return env
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int, int]]:
+    """
+    `-X importtime` lines -> [(module, self_us, cumulative_us, depth)].
+    """
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def import_breakdown(module: str, top: int = 15) -> Dict[str, Any]:
+    """
+    Import `module` in a fresh interpreter and summarise where the time went.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_child_env()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = parse_importtime(result.stderr)
+
+    packages: Dict[str, int] = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    total_us = sum(cumulative for name, _, cumulative, depth in rows if depth == 0)
+    return {
+        "module": module,
+        "total_s": round(total_us / 1e6, 3),
+        "modules": len(rows),
+        "slowest": [
+            (name, round(cumulative / 1e3, 1))
+            for name, _, cumulative, _ in sorted(rows, key=lambda r: -r[2])[:top]
+        ],
+        "packages": sorted(
+            ((package, round(us / 1e3, 1)) for package, us in packages.items()),
+            key=lambda item: -item[1]
+        )[:top],
+        "heavy_loaded": sorted({
+            name.split(".", 1)[0] for name, _, _, _ in rows
+            if name.split(".", 1)[0] in HEAVY_MODULES
+        }),
+    }
+
+
+def print_breakdown(report: Dict[str, Any]):
+    print(f"\nimport {report['module']}: {report['total_s']:.3f}s ({report['modules']} modules)")
+    print(f"  heavy modules loaded: {', '.join(report['heavy_loaded']) or 'none'}")
+    print(f"  {'slowest (cumulative)':<48}{'ms':>10}")
+    for name, ms in report["slowest"]:
+        print(f"  {name:<48}{ms:>10}")
+    print(f"  {'by package (self)':<48}{'ms':>10}")
+    for package, ms in report["packages"]:
+        print(f"  {package:<48}{ms:>10}")
+
+
+def profile_startup(modules=ENTRYPOINTS):
+    for module in modules:
+        print_breakdown(import_breakdown(module))
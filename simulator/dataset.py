@@ -0,0 +1,243 @@
+"""
+dataset.py
+----------
+
+In-memory commerce data for the simulator: the records in data/*.json,
+optionally scaled up with deterministic synthetic products, customers,
+orders, contracts and shipments.
+"""
+
+import json
+import os
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+ORDER_STATUSES = ["ORDER_PLACED", "PROCESSING", "SHIPPED", "DELIVERED", "CANCELLED"]
+CANCELLABLE_STATUSES = {"ORDER_PLACED", "PROCESSING"}
+WAREHOUSES = ["BLR-1", "DEL-2", "MUM-1"]
+
+_ADJECTIVES = ["Pro", "Lite", "Max", "Ultra", "Classic", "Smart", "Compact", "Ergo"]
+_NOUNS = {
+    "Electronics": ["Headphones", "Earbuds", "Speaker", "Charger", "Keyboard", "Mouse", "Monitor"],
+    "Furniture": ["Chair", "Desk", "Bookshelf", "Cabinet", "Stool", "Table"],
+}
+_BRANDS = ["SoundMax", "EarTech", "ErgoLine", "HomeCraft", "VoltEdge", "Nordic", "Acme", "Zenith"]
+
+
+class CommerceDataset:
+    def __init__(
+        self,
+        products: List[Dict[str, Any]],
+        customers: List[Dict[str, Any]],
+        orders: List[Dict[str, Any]],
+        pricing_rules: Dict[str, Any],
+        carriers: Dict[str, Any]
+    ):
+        self.products = {p["sku"]: p for p in products}
+        self.customers = {c["customer_id"]: c for c in customers}
+        self.orders = {o["order_id"]: o for o in orders}
+        self.tier_pricing = pricing_rules.get("tier_pricing", {})
+        self.contracts: Dict[Tuple[str, str], Dict[str, Any]] = {
+            (a["customer_id"], a["sku"]): a
+            for a in pricing_rules.get("contract_pricing", {}).get("ACCOUNTS", [])
+        }
+        self.carriers = carriers
+        self.shipments = {
+            o["tracking_number"]: o for o in orders if o.get("tracking_number")
+        }
+        self._search_index = self._build_search_index()
+
+    # -----------------------------
+    # Loading
+    # -----------------------------
+    @classmethod
+    def from_files(
+        cls,
+        data_dir: str = "data",
+        products: int = 0,
+        customers: int = 0,
+        orders: int = 0,
+        seed: int = 7
+    ) -> "CommerceDataset":
+        """
+        Load data/*.json and append the requested number of synthetic
+        products / customers / orders.
+        """
+        def load(name):
+            with open(os.path.join(data_dir, name)) as f:
+                return json.load(f)
+
+        base_products = load("products.json")
+        base_customers = load("customer.json")
+        base_orders = load("orders.json")
+        pricing_rules = load("pricing_rules.json")
+        carriers = load("shipping_carriers.json")
+
+        rng = random.Random(seed)
+        all_products = base_products + synthetic_products(rng, products)
+        all_customers = base_customers + synthetic_customers(rng, customers, list(pricing_rules.get("tier_pricing", {})))
+        all_orders = base_orders + synthetic_orders(rng, orders, all_products, all_customers, list(carriers))
+
+        accounts = pricing_rules.setdefault("contract_pricing", {}).setdefault("ACCOUNTS", [])
+        accounts.extend(synthetic_contracts(rng, all_customers[len(base_customers):], all_products))
+
+        return cls(all_products, all_customers, all_orders, pricing_rules, carriers)
+
+    # -----------------------------
+    # Search
+    # -----------------------------
+    def _build_search_index(self) -> Dict[str, List[str]]:
+        index: Dict[str, List[str]] = {}
+        for sku, product in self.products.items():
+            text = f"{product.get('name', '')} {product.get('brand', '')} {product.get('category', '')}"
+            for token in set(text.lower().split()):
+                index.setdefault(token, []).append(sku)
+        return index
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Products containing every query token (name, brand or category).
+        """
+        tokens = query.lower().split()
+        if not tokens:
+            return []
+        candidates = set(self._search_index.get(tokens[0], []))
+        for token in tokens[1:]:
+            candidates &= set(self._search_index.get(token, []))
+        return [self.products[sku] for sku in sorted(candidates)[:limit]]
+
+    # -----------------------------
+    # Derived records
+    # -----------------------------
+    def inventory(self, sku: str) -> Optional[Dict[str, Any]]:
+        if sku not in self.products:
+            return None
+        seed = sum(map(ord, sku))
+        return {
+            "sku": sku,
+            "available": seed * 7 % 250,
+            "warehouse": WAREHOUSES[seed % len(WAREHOUSES)],
+        }
+
+    def shipping_eta(self, tracking_no: str) -> Optional[Dict[str, Any]]:
+        order = self.shipments.get(tracking_no)
+        if order is None:
+            return None
+        carrier = order.get("carrier")
+        shipped = date.fromisoformat(order.get("shipment_date") or order["order_date"])
+        days = self.carriers.get(carrier, {}).get("avg_delivery_days", 5)
+        return {
+            "tracking_no": tracking_no,
+            "order_id": order["order_id"],
+            "carrier": carrier,
+            "status": order["status"],
+            "eta": order.get("delivery_date") or (shipped + timedelta(days=days)).isoformat(),
+        }
+
+    def bulk_price(self, sku: str, quantity: int) -> Optional[Dict[str, Any]]:
+        product = self.products.get(sku)
+        if product is None:
+            return None
+        # Best tier whose minimum order quantity is met
+        eligible = [
+            t for t in self.tier_pricing.values() if quantity >= t.get("min_order_qty", 0)
+        ]
+        discount = max((t["discount_percent"] for t in eligible), default=0)
+        unit_price = round(product["price"] * (1 - discount / 100), 2)
+        return {
+            "sku": sku,
+            "quantity": quantity,
+            "discount_percent": discount,
+            "unit_price": unit_price,
+            "total": round(unit_price * quantity, 2),
+        }
+
+
+# ---------------------------------------------------------
+# Synthetic data (deterministic for a given seed)
+# ---------------------------------------------------------
+
+def synthetic_products(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    products = []
+    for i in range(count):
+        category = rng.choice(list(_NOUNS))
+        brand = rng.choice(_BRANDS)
+        products.append({
+            "sku": f"SKU{100000 + i}",
+            "name": f"{brand} {rng.choice(_NOUNS[category])} {rng.choice(_ADJECTIVES)} {i}",
+            "brand": brand,
+            "category": category,
+            "price": rng.randrange(199, 49999),
+            "description": "Synthetic catalog item.",
+            "features": [],
+            "returnable": rng.random() > 0.1,
+        })
+    return products
+
+
+def synthetic_customers(rng: random.Random, count: int, tiers: List[str]) -> List[Dict[str, Any]]:
+    customers = []
+    for i in range(count):
+        b2b = rng.random() < 0.3
+        customers.append({
+            "customer_id": f"B2B{100000 + i}" if b2b else f"U{100000 + i}",
+            "name": f"Customer {i}",
+            "type": "B2B" if b2b else "B2C",
+            "email": f"customer{i}@example.com",
+            "tier": rng.choice(tiers) if tiers else None,
+        })
+    return customers
+
+
+def synthetic_orders(
+    rng: random.Random,
+    count: int,
+    products: List[Dict[str, Any]],
+    customers: List[Dict[str, Any]],
+    carriers: List[str]
+) -> List[Dict[str, Any]]:
+    orders = []
+    start = date(2024, 1, 1)
+    for i in range(count):
+        status = rng.choice(ORDER_STATUSES)
+        ordered = start + timedelta(days=rng.randrange(0, 600))
+        order = {
+            "order_id": f"ORD{100000 + i}",
+            "user_id": rng.choice(customers)["customer_id"],
+            "order_date": ordered.isoformat(),
+            "delivery_date": (ordered + timedelta(days=rng.randrange(2, 7))).isoformat()
+            if status == "DELIVERED" else None,
+            "status": status,
+            "payment_status": "PAID",
+            "items": [
+                {"sku": p["sku"], "quantity": rng.randrange(1, 5), "price": p["price"]}
+                for p in rng.sample(products, k=min(len(products), rng.randrange(1, 6)))
+            ],
+        }
+        if status in ("SHIPPED", "DELIVERED") and carriers:
+            order["shipment_date"] = (ordered + timedelta(days=1)).isoformat()
+            order["carrier"] = rng.choice(carriers)
+            order["tracking_number"] = f"TRK{100000 + i}"
+        orders.append(order)
+    return orders
+
+
+def synthetic_contracts(
+    rng: random.Random,
+    customers: List[Dict[str, Any]],
+    products: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    contracts = []
+    for customer in customers:
+        if customer["type"] != "B2B":
+            continue
+        for product in rng.sample(products, k=min(len(products), 3)):
+            contracts.append({
+                "customer_id": customer["customer_id"],
+                "sku": product["sku"],
+                "contract_price": round(product["price"] * 0.85),
+                "currency": "INR",
+                "valid_until": "2099-12-31",
+            })
+    return contracts
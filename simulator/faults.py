@@ -0,0 +1,111 @@
+"""
+faults.py
+---------
+
+Per-endpoint latency, error and timeout injection for the simulator.
+
+Profiles are looked up by endpoint ("oms.order"), then by service ("oms"),
+then "*":
+
+    {
+      "*":          {"latency_ms": {"dist": "lognormal", "median": 15, "p99": 120}},
+      "pricing":    {"latency_ms": {"dist": "uniform", "min": 50, "max": 400},
+                     "error_rate": 0.05, "error_status": 503},
+      "oms.order":  {"timeout_rate": 0.01}
+    }
+
+Latency distributions: fixed (value), uniform (min, max),
+lognormal (median, p99). A timed-out request sleeps `timeout_s` before
+answering 504, so the client's own timeout fires first.
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import threading
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+DEFAULT_PROFILES = {"*": {"latency_ms": {"dist": "fixed", "value": 0}}}
+Z_99 = 2.326
+
+
+def sample_latency_ms(spec: Optional[Dict[str, Any]], rng: random.Random) -> float:
+    if not spec:
+        return 0.0
+    dist = spec.get("dist", "fixed")
+    if dist == "uniform":
+        return rng.uniform(spec["min"], spec["max"])
+    if dist == "lognormal":
+        median = spec["median"]
+        sigma = math.log(spec["p99"] / median) / Z_99 if spec.get("p99", median) > median else 0.0
+        return rng.lognormvariate(math.log(median), sigma)
+    return float(spec.get("value", 0))
+
+
+class FaultInjector:
+    def __init__(
+        self,
+        profiles: Optional[Dict[str, Dict[str, Any]]] = None,
+        timeout_s: float = 30.0,
+        seed: Optional[int] = None
+    ):
+        self.profiles = profiles or dict(DEFAULT_PROFILES)
+        self.timeout_s = timeout_s
+        self.rng = random.Random(seed)
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "FaultInjector":
+        """
+        SIM_FAULTS=path/to/faults.json, SIM_TIMEOUT_S=30, SIM_SEED=...
+        """
+        profiles = None
+        path = os.getenv("SIM_FAULTS")
+        if path:
+            with open(path) as f:
+                profiles = json.load(f)
+        seed = os.getenv("SIM_SEED")
+        return cls(profiles, float(os.getenv("SIM_TIMEOUT_S", "30")), int(seed) if seed else None)
+
+    def profile(self, endpoint: str) -> Dict[str, Any]:
+        service = endpoint.split(".", 1)[0]
+        return self.profiles.get(endpoint) or self.profiles.get(service) or self.profiles.get("*", {})
+
+    def _count(self, endpoint: str, outcome: str):
+        with self._lock:
+            counts = self._counts.setdefault(endpoint, {"requests": 0, "errors": 0, "timeouts": 0})
+            counts[outcome] += 1
+
+    async def inject(self, endpoint: str):
+        """
+        Await at the start of every simulated endpoint.
+        """
+        profile = self.profile(endpoint)
+        self._count(endpoint, "requests")
+
+        delay = sample_latency_ms(profile.get("latency_ms"), self.rng) / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        roll = self.rng.random()
+        timeout_rate = profile.get("timeout_rate", 0.0)
+        if roll < timeout_rate:
+            self._count(endpoint, "timeouts")
+            await asyncio.sleep(self.timeout_s)
+            raise HTTPException(status_code=504, detail="Simulated timeout")
+        if roll < timeout_rate + profile.get("error_rate", 0.0):
+            self._count(endpoint, "errors")
+            raise HTTPException(status_code=profile.get("error_status", 503), detail="Simulated failure")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._counts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
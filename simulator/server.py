@@ -0,0 +1,226 @@
+"""
+server.py
+---------
+
+Local stand-in for the Java commerce microservices. Serves every URL used
+by integration/java_commerce_client.py (catalog, OMS, pricing, inventory,
+shipping, including the bulk endpoints) from data/*.json plus synthetic
+data, with per-endpoint latency / error / timeout injection.
+
+Run:
+    python -m simulator.server --port 8080 --products 100000 --orders 500000 \
+        --faults simulator/faults.example.json
+
+then point the client at it with JAVA_COMMERCE_BASE_URL=http://localhost:8080.
+
+Control endpoints:
+    GET  /_sim/stats    request / error / timeout counts per endpoint
+    PUT  /_sim/faults   replace fault profiles at runtime
+    POST /_sim/reset    reset counters
+"""
+
+import argparse
+import json
+import os
+import uuid
+from typing import Any, Dict, List
+
+from fastapi import Body, FastAPI, HTTPException
+
+from simulator.dataset import CANCELLABLE_STATUSES, CommerceDataset
+from simulator.faults import FaultInjector
+
+
+def _not_found(kind: str, key: str):
+    raise HTTPException(status_code=404, detail=f"{kind} {key} not found")
+
+
+def create_app(dataset: CommerceDataset, faults: FaultInjector) -> FastAPI:
+    app = FastAPI(title="commerce-simulator")
+    app.state.dataset = dataset
+    app.state.faults = faults
+
+    # -----------------------------
+    # Catalog
+    # -----------------------------
+    @app.get("/catalog/product/{sku}")
+    async def get_product(sku: str):
+        await faults.inject("catalog.product")
+        return dataset.products.get(sku) or _not_found("Product", sku)
+
+    @app.get("/catalog/search")
+    async def search_catalog(q: str = ""):
+        await faults.inject("catalog.search")
+        return {"query": q, "results": dataset.search(q)}
+
+    @app.post("/catalog/products/bulk")
+    async def get_products(body: Dict[str, List[str]] = Body(...)):
+        await faults.inject("catalog.bulk")
+        skus = body.get("skus", [])
+        return {"products": {s: dataset.products[s] for s in skus if s in dataset.products}}
+
+    # -----------------------------
+    # Order management (OMS)
+    # -----------------------------
+    @app.get("/oms/order/{order_id}")
+    async def get_order(order_id: str):
+        await faults.inject("oms.order")
+        return dataset.orders.get(order_id) or _not_found("Order", order_id)
+
+    @app.get("/oms/order/{order_id}/items")
+    async def get_order_items(order_id: str):
+        await faults.inject("oms.items")
+        order = dataset.orders.get(order_id) or _not_found("Order", order_id)
+        return {"order_id": order_id, "items": order["items"]}
+
+    @app.get("/oms/order/{order_id}/exceptions")
+    async def get_order_exceptions(order_id: str):
+        await faults.inject("oms.exceptions")
+        order = dataset.orders.get(order_id) or _not_found("Order", order_id)
+        exceptions = []
+        if order["status"] == "SHIPPED" and not order.get("delivery_date"):
+            exceptions.append({"type": "DELAYED", "carrier": order.get("carrier")})
+        return {"order_id": order_id, "exceptions": exceptions}
+
+    @app.post("/oms/order/{order_id}/cancel")
+    async def cancel_order(order_id: str):
+        await faults.inject("oms.cancel")
+        order = dataset.orders.get(order_id) or _not_found("Order", order_id)
+        if order["status"] not in CANCELLABLE_STATUSES:
+            raise HTTPException(status_code=409, detail=f"Order in status {order['status']} cannot be cancelled")
+        order["status"] = "CANCELLED"
+        return {"order_id": order_id, "status": "CANCELLED"}
+
+    @app.post("/oms/orders/bulk")
+    async def get_orders(body: Dict[str, List[str]] = Body(...)):
+        await faults.inject("oms.bulk_orders")
+        ids = body.get("order_ids", [])
+        return {"orders": {i: dataset.orders[i] for i in ids if i in dataset.orders}}
+
+    @app.post("/oms/orders/cancel/bulk")
+    async def cancel_orders(body: Dict[str, List[str]] = Body(...)):
+        await faults.inject("oms.bulk_cancel")
+        cancelled, rejected = [], []
+        for order_id in body.get("order_ids", []):
+            order = dataset.orders.get(order_id)
+            if order is not None and order["status"] in CANCELLABLE_STATUSES:
+                order["status"] = "CANCELLED"
+                cancelled.append(order_id)
+            else:
+                rejected.append(order_id)
+        return {"cancelled": cancelled, "rejected": rejected}
+
+    @app.post("/oms/returns/bulk")
+    async def create_returns(body: Dict[str, List[Dict[str, Any]]] = Body(...)):
+        await faults.inject("oms.bulk_returns")
+        lines = body.get("lines", [])
+        return {
+            "accepted": len(lines),
+            "returns": [{**line, "return_id": f"RET-{uuid.uuid4().hex[:8]}"} for line in lines],
+        }
+
+    # -----------------------------
+    # Pricing
+    # -----------------------------
+    @app.get("/pricing/contract/{customer_id}/{sku}")
+    async def get_contract_price(customer_id: str, sku: str):
+        await faults.inject("pricing.contract")
+        return dataset.contracts.get((customer_id, sku)) or _not_found("Contract", f"{customer_id}/{sku}")
+
+    @app.get("/pricing/bulk")
+    async def get_bulk_price(sku: str, qty: int = 1):
+        await faults.inject("pricing.bulk")
+        return dataset.bulk_price(sku, qty) or _not_found("Product", sku)
+
+    # -----------------------------
+    # Inventory
+    # -----------------------------
+    @app.get("/inventory/{sku}")
+    async def get_inventory(sku: str):
+        await faults.inject("inventory.sku")
+        return dataset.inventory(sku) or _not_found("Product", sku)
+
+    @app.post("/inventory/bulk")
+    async def get_inventory_bulk(body: Dict[str, List[str]] = Body(...)):
+        await faults.inject("inventory.bulk")
+        levels = {s: dataset.inventory(s) for s in body.get("skus", [])}
+        return {"inventory": {s: level for s, level in levels.items() if level is not None}}
+
+    # -----------------------------
+    # Shipping
+    # -----------------------------
+    @app.get("/shipping/eta/{tracking_no}")
+    async def get_shipping_eta(tracking_no: str):
+        await faults.inject("shipping.eta")
+        return dataset.shipping_eta(tracking_no) or _not_found("Shipment", tracking_no)
+
+    # -----------------------------
+    # Simulator control
+    # -----------------------------
+    @app.get("/_sim/stats")
+    def stats():
+        return {
+            "endpoints": faults.stats(),
+            "products": len(dataset.products),
+            "orders": len(dataset.orders),
+            "customers": len(dataset.customers),
+        }
+
+    @app.put("/_sim/faults")
+    def set_faults(profiles: Dict[str, Dict[str, Any]] = Body(...)):
+        faults.profiles = profiles
+        return {"profiles": profiles}
+
+    @app.post("/_sim/reset")
+    def reset():
+        faults.reset()
+        return {"reset": True}
+
+    return app
+
+
+def app_from_env() -> FastAPI:
+    """
+    uvicorn --factory simulator.server:app_from_env
+
+    SIM_DATA_DIR, SIM_PRODUCTS, SIM_CUSTOMERS, SIM_ORDERS, SIM_SEED,
+    SIM_FAULTS, SIM_TIMEOUT_S
+    """
+    dataset = CommerceDataset.from_files(
+        os.getenv("SIM_DATA_DIR", "data"),
+        products=int(os.getenv("SIM_PRODUCTS", "0")),
+        customers=int(os.getenv("SIM_CUSTOMERS", "0")),
+        orders=int(os.getenv("SIM_ORDERS", "0")),
+        seed=int(os.getenv("SIM_SEED", "7")),
+    )
+    return create_app(dataset, FaultInjector.from_env())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local commerce-service simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--products", type=int, default=0, help="synthetic products to add")
+    parser.add_argument("--customers", type=int, default=0, help="synthetic customers to add")
+    parser.add_argument("--orders", type=int, default=0, help="synthetic orders to add")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--faults", help="JSON file with per-endpoint fault profiles")
+    parser.add_argument("--timeout-s", type=float, default=30.0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    profiles = None
+    if args.faults:
+        with open(args.faults) as f:
+            profiles = json.load(f)
+    dataset = CommerceDataset.from_files(
+        args.data_dir, args.products, args.customers, args.orders, args.seed
+    )
+    app = create_app(dataset, FaultInjector(profiles, args.timeout_s, args.seed))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
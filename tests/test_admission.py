@@ -0,0 +1,140 @@
+"""
+Tests for gateway admission control:
+- Bounded in-flight requests
+- Priority lanes (CSR before mobile customers)
+- 503 + Retry-After when the queue wait budget is exceeded
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api_gateway import admission as admission_module
+from api_gateway.admission import AdmissionController, Overloaded, lane_for_headers
+from api_gateway.auth import generate_jwt
+
+LANES = {"csr": (0, 1.0), "internal": (1, 1.0), "customer": (2, 1.0)}
+
+
+def test_lanes_follow_role_map():
+    assert lane_for_headers("CSR_KEY_67890", None) == "csr"
+    assert lane_for_headers("AI_INTERNAL_KEY_12345", None) == "internal"
+    assert lane_for_headers("MOBILE_KEY_24680", None) == "customer"
+    assert lane_for_headers(None, f"Bearer {generate_jwt('U1', 'CSR')}") == "csr"
+    assert lane_for_headers(None, "Bearer garbage") == "customer"
+    assert lane_for_headers(None, None) == "customer"
+
+
+def test_in_flight_is_bounded_and_slot_goes_to_highest_priority():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=10, lanes=LANES)
+        order = []
+
+        async def request(lane, name):
+            async with controller.admit(lane):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await controller.acquire("customer")
+        waiters = [
+            asyncio.create_task(request("customer", "mobile")),
+            asyncio.create_task(request("csr", "csr")),
+        ]
+        await asyncio.sleep(0.01)
+        assert controller.stats()["queued"] == 2
+        controller.release()
+        await asyncio.gather(*waiters)
+        return order, controller.stats()
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["csr", "mobile"]
+    assert stats["in_flight"] == 0
+
+
+def test_queue_wait_budget_sheds_with_retry_after():
+    async def scenario():
+        lanes = {"csr": (0, 1.0), "customer": (2, 0.05)}
+        controller = AdmissionController(max_in_flight=1, max_queue=10, lanes=lanes)
+        await controller.acquire("csr")
+        with pytest.raises(Overloaded) as info:
+            await controller.acquire("customer")
+        controller.release()
+        return info.value, controller.stats()
+
+    error, stats = asyncio.run(scenario())
+    assert error.retry_after >= 1
+    assert stats["shed"]["customer"] == 1
+    assert stats["queued"] == 0 and stats["in_flight"] == 0
+
+
+def test_full_queue_rejects_immediately():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=0, lanes=LANES)
+        await controller.acquire("csr")
+        with pytest.raises(Overloaded):
+            await controller.acquire("csr")
+
+    asyncio.run(scenario())
+
+
+def test_chat_returns_503_when_saturated(monkeypatch):
+    from api_gateway import routes
+
+    controller = AdmissionController(max_in_flight=1, max_queue=0, lanes=LANES)
+    monkeypatch.setattr(admission_module, "admission", controller)
+    monkeypatch.setattr(routes, "admission", controller)
+    started, finish = threading.Event(), threading.Event()
+
+    def slow_workflow(payload):
+        started.set()
+        finish.wait(5)
+        return {"result": "done"}
+
+    monkeypatch.setattr(routes.agent_executor, "invoke", slow_workflow)
+    client = TestClient(routes.app)
+
+    first = threading.Thread(target=client.post, args=("/chat",), kwargs={"json": {"user_query": "hi"}})
+    first.start()
+    assert started.wait(5)
+
+    shed = client.post("/chat", json={"user_query": "hi"})
+    health = client.get("/health")
+    finish.set()
+    first.join(5)
+
+    assert shed.status_code == 503
+    assert int(shed.headers["Retry-After"]) >= 1
+    assert health.status_code == 200
+    assert health.json()["admission"]["in_flight"] == 1
+
+
+def test_quote_is_admitted_like_chat(monkeypatch):
+    from api_gateway import routes
+
+    controller = AdmissionController(max_in_flight=1, max_queue=0, lanes=LANES)
+    monkeypatch.setattr(admission_module, "admission", controller)
+    monkeypatch.setattr(routes, "admission", controller)
+    started, finish = threading.Event(), threading.Event()
+
+    class SlowEngine:
+        def quote(self, customer_id, skus, quantities, include_lines=True):
+            started.set()
+            finish.wait(5)
+            return {"line_count": len(skus)}
+
+    monkeypatch.setattr(routes, "get_pricing_engine", lambda: SlowEngine())
+    client = TestClient(routes.app, headers={"X-API-Key": "AI_INTERNAL_KEY_12345"})
+    body = {"lines": [{"sku": "SKU1001", "quantity": 2}]}
+
+    first = threading.Thread(target=client.post, args=("/quote",), kwargs={"json": body})
+    first.start()
+    assert started.wait(5)
+
+    shed = client.post("/quote", json=body)
+    finish.set()
+    first.join(5)
+
+    assert shed.status_code == 503
+    assert int(shed.headers["Retry-After"]) >= 1
@@ -0,0 +1,95 @@
+"""
+Tests for the async pooled commerce client.
+"""
+
+import asyncio
+
+import httpx
+
+from integration.async_commerce_client import AsyncCommerceClient, service_for
+
+BASE = "http://commerce.test"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_service_for_maps_url_prefix():
+    assert service_for(f"{BASE}/oms/order/ORD1001") == "oms"
+    assert service_for(f"{BASE}/catalog/search?q=x") == "catalog"
+    assert service_for(f"{BASE}/unknown/thing") == "default"
+
+
+def test_same_response_contract_as_sync_client():
+    def handler(request):
+        if request.url.path == "/oms/order/ORD1001":
+            return httpx.Response(200, json={"order_id": "ORD1001"})
+        if request.url.path == "/inventory/SKU1":
+            raise httpx.ConnectError("refused", request=request)
+        if request.url.path == "/shipping/eta/T1":
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(404, json={})
+
+    async def scenario():
+        client = AsyncCommerceClient(BASE, transport=httpx.MockTransport(handler))
+        results = await asyncio.gather(
+            client.fetch_order("ORD1001"),
+            client.fetch_inventory("SKU1"),
+            client.fetch_shipping_eta("T1"),
+            client.fetch_product_by_sku("MISSING"),
+        )
+        await client.aclose()
+        return results
+
+    order, inventory, eta, missing = run(scenario())
+    assert order == {"order_id": "ORD1001"}
+    assert inventory == {"error": "ConnectionError", "url": f"{BASE}/inventory/SKU1"}
+    assert eta == {"error": "Timeout", "url": f"{BASE}/shipping/eta/T1"}
+    assert "404" in missing["error"]
+
+
+def test_in_flight_limit_is_per_service(monkeypatch):
+    monkeypatch.setenv("COMMERCE_OMS_MAX_IN_FLIGHT", "2")
+    active = {"oms": 0, "catalog": 0}
+    peak = {"oms": 0, "catalog": 0}
+
+    async def handler(request):
+        service = request.url.path.split("/")[1]
+        active[service] += 1
+        peak[service] = max(peak[service], active[service])
+        await asyncio.sleep(0.01)
+        active[service] -= 1
+        return httpx.Response(200, json={})
+
+    async def scenario():
+        client = AsyncCommerceClient(BASE, transport=httpx.MockTransport(handler))
+        await asyncio.gather(
+            *(client.fetch_order(f"ORD{i}") for i in range(8)),
+            *(client.fetch_product_by_sku(f"SKU{i}") for i in range(8)),
+        )
+        await client.aclose()
+
+    run(scenario())
+    assert peak["oms"] == 2
+    assert peak["catalog"] == 8
+
+
+def test_retries_server_errors(monkeypatch):
+    monkeypatch.setattr("integration.async_commerce_client.BACKOFF_FACTOR", 0)
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        client = AsyncCommerceClient(BASE, transport=httpx.MockTransport(handler))
+        result = await client.cancel_order("ORD1")
+        await client.aclose()
+        return result
+
+    assert run(scenario()) == {"ok": True}
+    assert len(calls) == 3
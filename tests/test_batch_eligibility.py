@@ -0,0 +1,174 @@
+"""
+Tests for whole-order batch return and cancellation evaluation.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+import agents.return_agent as return_agent
+from agents.batch_eligibility import get_batch_engine
+from agents.cancel_agent import handle_bulk_cancellation
+from agents.return_agent import handle_bulk_return_request
+
+
+def b2b_order(order_id, lines, status="DELIVERED", delivery_date="2025-03-05"):
+    return {
+        "order_id": order_id,
+        "order_date": "2025-03-01",
+        "delivery_date": delivery_date,
+        "status": status,
+        "payment_status": "PAID",
+        "items": [
+            {"sku": sku, "quantity": 2, "price": 1000} for sku in lines
+        ]
+    }
+
+
+def test_every_line_is_evaluated_in_one_pass():
+    order = b2b_order("ORD5000", ["SKU1001"] * 150 + ["SKU2001"] * 150)
+
+    decision = get_batch_engine().evaluate_returns([order], on=date(2025, 3, 10))
+
+    assert decision["line_count"] == 300
+    assert decision["by_reason"] == {"eligible": 150, "damage_only": 150}
+    assert decision["refund_total"] == 150 * 2000 * 0.95
+
+
+def test_window_status_and_b2b_rules():
+    engine = get_batch_engine()
+    orders = [
+        b2b_order("ORD1", ["SKU1001"], delivery_date="2025-01-01"),
+        b2b_order("ORD2", ["SKU1001"], status="SHIPPED", delivery_date=None),
+    ]
+
+    b2c = engine.evaluate_returns(orders, on=date(2025, 3, 10))
+    assert [l["reason"] for l in b2c["lines"]] == ["outside_return_window", "status_not_eligible"]
+
+    recent = [b2b_order("ORD3", ["SKU1001"])]
+    assert engine.evaluate_returns(recent, tier="GOLD", on=date(2025, 3, 6))["eligible_lines"] == 0
+    defective = engine.evaluate_returns(recent, reason="defective", tier="GOLD", on=date(2025, 3, 6))
+    assert defective["refund_total"] == 2000
+
+
+def test_bulk_return_issues_single_oms_request(monkeypatch):
+    monkeypatch.setattr(return_agent.llm_policy, "tiers", [])
+    orders = {
+        "ORD7": b2b_order("ORD7", ["SKU1001"] * 3, delivery_date=date.today().isoformat()),
+        "ORD8": b2b_order("ORD8", ["SKU1002"] * 2, delivery_date=date.today().isoformat()),
+    }
+
+    with patch("agents.return_agent.fetch_orders") as fetch, \
+         patch("agents.return_agent.create_bulk_return_request") as bulk:
+        fetch.return_value = orders
+        bulk.run.return_value = "BULK-1"
+        result = handle_bulk_return_request(["ORD7", "ORD8"], tier="BRONZE")
+
+    fetch.assert_called_once_with(["ORD7", "ORD8"])
+    bulk.run.assert_called_once()
+    assert len(bulk.run.call_args.args[0]["lines"]) == 5
+    assert result["eligible_lines"] == 5
+    assert "BULK-1" in result["message"]
+
+
+def test_bulk_cancellation_only_cancels_open_orders(monkeypatch):
+    import agents.cancel_agent as cancel_agent
+    monkeypatch.setattr(cancel_agent.llm_policy, "tiers", [])
+    orders = {
+        "ORD1": b2b_order("ORD1", ["SKU1001"] * 4, status="PROCESSING"),
+        "ORD2": b2b_order("ORD2", ["SKU1001"], status="SHIPPED"),
+    }
+
+    with patch("agents.cancel_agent.fetch_orders") as fetch:
+        fetch.return_value = {**orders, "ORD3": {"error": "404 Not Found", "status": 404}}
+        result = handle_bulk_cancellation(["ORD1", "ORD2", "ORD3"])
+
+    fetch.assert_called_once_with(["ORD1", "ORD2", "ORD3"])
+    assert result["cancelled_orders"] == ["ORD1"]
+    assert result["unavailable_orders"] == ["ORD3"]
+    assert result["refund_total"] == 8000
+    assert "Orders not found: ORD3." in result["message"]
+
+
+class EchoLLM:
+    model_name = "echo"
+
+    async def ainvoke(self, prompt):
+        from langchain.schema import AIMessage
+        return AIMessage(content=prompt)
+
+
+def test_bulk_summary_separates_missing_from_failed_orders(monkeypatch):
+    import agents.cancel_agent as cancel_agent
+    from ai_service import call_policy
+
+    monkeypatch.setattr(call_policy, "get_llm_cache", lambda: None)
+    fetched = {
+        "ORD1": b2b_order("ORD1", ["SKU1001"], status="PROCESSING"),
+        "ORD3": {"error": "404 Not Found", "status": 404},
+        "ORD4": {"error": "503 Service Unavailable", "status": 503},
+        "ORD5": {"error": "Connection refused"},
+    }
+
+    # LLM path: the prompt carries the unavailable orders
+    monkeypatch.setattr(cancel_agent.llm_policy, "tiers", [EchoLLM()])
+    with patch("agents.cancel_agent.fetch_orders", return_value=fetched):
+        prompted = handle_bulk_cancellation(list(fetched))
+    assert prompted["not_found_orders"] == ["ORD3"]
+    assert prompted["failed_orders"] == ["ORD4", "ORD5"]
+    assert "Unavailable Orders: Orders not found: ORD3. Orders that could not be retrieved" in prompted["message"]
+
+    # Renderer: transport errors and 5xx are not reported as "not found"
+    monkeypatch.setattr(cancel_agent.llm_policy, "tiers", [])
+    with patch("agents.cancel_agent.fetch_orders", return_value=fetched):
+        rendered = handle_bulk_cancellation(list(fetched))["message"]
+    assert "Orders not found: ORD3." in rendered
+    assert "could not be retrieved right now (please try again): ORD4, ORD5." in rendered
+
+
+def test_graph_routes_multiple_orders_to_bulk_handlers(monkeypatch):
+    from agent_service import agent_graph
+
+    calls = []
+    monkeypatch.setattr(agent_graph, "handle_bulk_cancellation", lambda ids: calls.append(("cancel", ids)) or {})
+    monkeypatch.setattr(
+        agent_graph, "handle_bulk_return_request",
+        lambda ids, skus=None: calls.append(("return", ids, skus)) or {}
+    )
+    monkeypatch.setattr(agent_graph, "handle_order_cancellation", lambda order_id: calls.append(("single", order_id)) or {})
+
+    agent_graph.cancel_agent({"user_query": "cancel ORD1, ORD2 and ORD1"})
+    agent_graph.return_agent({"user_query": "return SKU1001 from ORD7 and ORD8"})
+    agent_graph.cancel_agent({"user_query": "cancel ORD9"})
+
+    assert calls == [
+        ("cancel", ["ORD1", "ORD2"]),
+        ("return", ["ORD7", "ORD8"], ["SKU1001"]),
+        ("single", "ORD9"),
+    ]
+
+
+def test_bulk_handlers_render_degraded_oms(monkeypatch):
+    import agents.cancel_agent as cancel_agent
+    from integration.circuit_breaker import Degraded
+
+    monkeypatch.setattr(cancel_agent.llm_policy, "tiers", [])
+    monkeypatch.setattr(return_agent.llm_policy, "tiers", [])
+    degraded = Degraded("oms", "CircuitOpen", "http://commerce.test/oms/orders/bulk", retry_after=12)
+    fetched = {"ORD1": degraded, "ORD2": degraded}
+
+    with patch("agents.cancel_agent.fetch_orders", return_value=fetched), \
+         patch("agents.cancel_agent.cancel_orders_in_oms_bulk") as bulk_cancel:
+        cancelled = handle_bulk_cancellation(["ORD1", "ORD2"])
+    with patch("agents.return_agent.fetch_orders", return_value=fetched), \
+         patch("agents.return_agent.create_bulk_return_request") as bulk_return:
+        returned = handle_bulk_return_request(["ORD1", "ORD2"])
+
+    bulk_cancel.run.assert_not_called()
+    bulk_return.run.assert_not_called()
+    for result in (cancelled, returned):
+        assert result["degraded"] is True
+        assert result["failed_orders"] == ["ORD1", "ORD2"]
+        assert "order management service is temporarily unavailable" in result["message"]
+        assert "retry in 12s" in result["message"]
+        assert "not found" not in result["message"]
+    assert "0 of 2" not in cancelled["message"]
@@ -0,0 +1,157 @@
+"""
+Tests for DataLoader-style batching of per-key commerce lookups.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import integration.async_commerce_client as async_client
+import integration.java_commerce_client as client
+from integration.async_commerce_client import AsyncCommerceClient
+from integration.batch_loader import DataLoader
+from integration.circuit_breaker import reset_breakers
+from integration.response_cache import LocalBackend, ReadThroughCache
+
+BASE = "http://commerce.test"
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(monkeypatch):
+    cache = ReadThroughCache(LocalBackend())
+    monkeypatch.setattr(client, "response_cache", cache)
+    monkeypatch.setattr(async_client, "response_cache", cache)
+    monkeypatch.setattr(client, "_bulk_supported", {})
+    reset_breakers()
+    return cache
+
+
+def test_keys_requested_in_one_tick_form_one_batch():
+    batches = []
+
+    async def batch_fn(keys):
+        batches.append(keys)
+        return {key: key.lower() for key in keys}
+
+    async def scenario():
+        loader = DataLoader(batch_fn, max_batch_size=3)
+        return await asyncio.gather(*(loader.load(k) for k in ["A", "B", "A", "C", "D"]))
+
+    assert asyncio.run(scenario()) == ["a", "b", "a", "c", "d"]
+    assert batches == [["A", "B", "C"], ["D"]]
+
+
+def test_batch_errors_reach_every_caller():
+    async def batch_fn(keys):
+        raise RuntimeError("down")
+
+    async def scenario():
+        loader = DataLoader(batch_fn)
+        return await asyncio.gather(loader.load("A"), loader.load("B"), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(scenario()))
+
+
+def test_async_client_issues_one_bulk_request_and_primes_cache(isolated_state):
+    requests = []
+
+    def handler(request):
+        requests.append((request.method, request.url.path))
+        skus = json.loads(request.content)["skus"]
+        return httpx.Response(200, json={"products": {s: {"sku": s} for s in skus if s != "SKU404"}})
+
+    async def scenario():
+        c = AsyncCommerceClient(BASE, transport=httpx.MockTransport(handler))
+        results = await asyncio.gather(*(c.load_product(s) for s in ["SKU1", "SKU2", "SKU404", "SKU1"]))
+        again = await c.fetch_product_by_sku("SKU2")
+        await c.aclose()
+        return results, again
+
+    results, again = asyncio.run(scenario())
+    assert [r.get("sku") for r in results] == ["SKU1", "SKU2", None, "SKU1"]
+    assert results[2]["status"] == 404
+    assert again == {"sku": "SKU2"}
+    assert requests == [("POST", "/catalog/products/bulk")]
+
+
+def test_async_client_falls_back_to_parallel_single_calls():
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        if request.url.path == "/oms/orders/bulk":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"order_id": request.url.path.rsplit("/", 1)[1]})
+
+    async def scenario():
+        c = AsyncCommerceClient(BASE, transport=httpx.MockTransport(handler))
+        first = await asyncio.gather(c.load_order("ORD1"), c.load_order("ORD2"))
+        second = await c.load_order("ORD3")
+        await c.aclose()
+        return first + [second]
+
+    assert [r["order_id"] for r in asyncio.run(scenario())] == ["ORD1", "ORD2", "ORD3"]
+    # The bulk endpoint is only probed once
+    assert requests.count("/oms/orders/bulk") == 1
+    assert sorted(p for p in requests if p != "/oms/orders/bulk") == [
+        "/oms/order/ORD1", "/oms/order/ORD2", "/oms/order/ORD3"
+    ]
+
+
+def test_sync_fetch_many_uses_bulk_endpoint(monkeypatch):
+    calls = []
+
+    def fake_http_call(method, url, payload=None):
+        calls.append((method, url, payload))
+        return {"inventory": {sku: {"sku": sku, "available": 5} for sku in payload["skus"]}}
+
+    monkeypatch.setattr(client, "http_call", fake_http_call)
+    results = client.fetch_inventory_many(["SKU1", "SKU2", "SKU1"])
+
+    assert set(results) == {"SKU1", "SKU2"}
+    assert calls == [("POST", f"{client.BASE_URL}/inventory/bulk", {"skus": ["SKU1", "SKU2"]})]
+
+
+def test_sync_fetch_many_refreshes_stale_hits(monkeypatch):
+    cache = ReadThroughCache(LocalBackend(), ttls={"inventory": (0.0, 60.0)})
+    monkeypatch.setattr(client, "response_cache", cache)
+    url = f"{client.BASE_URL}/inventory/SKU1"
+    cache.prime("inventory", url, {"sku": "SKU1", "available": 1})
+    calls = []
+
+    def fake_http_call(method, url, payload=None):
+        calls.append((method, url))
+        return {"sku": "SKU1", "available": 7}
+
+    monkeypatch.setattr(client, "http_call", fake_http_call)
+    # The stale value is served; a single background refresh replaces it
+    assert client.fetch_inventory_many(["SKU1"])["SKU1"]["available"] == 1
+    cache._executor.shutdown(wait=True)
+    assert calls == [("GET", url)]
+    assert cache.backend.get(url)["value"]["available"] == 7
+
+
+def test_async_load_refreshes_stale_hits(monkeypatch):
+    cache = ReadThroughCache(LocalBackend(), ttls={"product": (0.0, 60.0)})
+    monkeypatch.setattr(async_client, "response_cache", cache)
+    requests = []
+
+    def handler(request):
+        requests.append((request.method, request.url.path))
+        return httpx.Response(200, json={"sku": "SKU1", "version": 2})
+
+    async def scenario():
+        c = AsyncCommerceClient(BASE, transport=httpx.MockTransport(handler))
+        url = c.base_url + async_client.BULK_ENDPOINTS["product"][3].format("SKU1")
+        cache.prime("product", url, {"sku": "SKU1", "version": 1})
+        served = await c.load_product("SKU1")
+        await asyncio.gather(*cache._tasks)
+        await c.aclose()
+        return served, cache.backend.get(url)["value"]
+
+    served, stored = asyncio.run(scenario())
+    assert served["version"] == 1
+    assert stored["version"] == 2
+    assert requests == [("GET", "/catalog/product/SKU1")]
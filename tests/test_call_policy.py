@@ -0,0 +1,82 @@
+"""
+Tests for the deadline-aware LLM call policy:
+- Hedged request after the p95 latency
+- Fallback tier near the deadline
+- Deterministic renderer as last resort
+"""
+
+import asyncio
+import time
+
+from langchain.schema import AIMessage
+
+from ai_service import call_policy
+from ai_service.call_policy import CallPolicy, node_budget, remaining_budget
+
+
+class FakeLLM:
+    def __init__(self, name, delays, content="ok"):
+        self.model_name = name
+        self.delays = list(delays)
+        self.content = content
+        self.calls = 0
+        self.cancelled = 0
+
+    async def ainvoke(self, prompt):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return AIMessage(content=f"{self.content}-{self.calls}")
+
+
+class FailingLLM(FakeLLM):
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        raise RuntimeError("provider error")
+
+
+def test_hedged_request_wins_and_loser_is_cancelled(monkeypatch):
+    monkeypatch.setattr(call_policy, "DEFAULT_HEDGE_AFTER_S", 0.05)
+    llm = FakeLLM("hedge-test", [2.0, 0.01])
+
+    started = time.monotonic()
+    with node_budget("order_agent", time.monotonic() + 1.0):
+        response = CallPolicy("test", [llm]).invoke("hello")
+
+    assert response.content == "ok-2"
+    assert llm.calls == 2
+    assert time.monotonic() - started < 0.5
+    time.sleep(0.05)
+    assert llm.cancelled == 1
+
+
+def test_falls_back_to_next_tier_near_deadline(monkeypatch):
+    monkeypatch.setattr(call_policy, "DEFAULT_HEDGE_AFTER_S", 5.0)
+    monkeypatch.setattr(call_policy, "FALLBACK_RESERVE_S", 0.3)
+    slow = FakeLLM("slow-tier", [5.0], content="slow")
+    fast = FakeLLM("fast-tier", [0.01], content="fast")
+
+    with node_budget("order_agent", time.monotonic() + 0.8):
+        response = CallPolicy("test", [slow, fast]).invoke("hello")
+
+    assert response.content == "fast-1"
+
+
+def test_renderer_used_when_all_tiers_fail():
+    policy = CallPolicy("test", [FailingLLM("broken", [0])])
+
+    with node_budget("order_agent", time.monotonic() + 0.5):
+        response = policy.invoke("hello", renderer=lambda: "deterministic")
+
+    assert response.content == "deterministic"
+    assert response.response_metadata["fallback"] == "renderer"
+
+
+def test_node_budget_takes_share_of_remaining_time():
+    deadline_at = time.monotonic() + 4.0
+    with node_budget("classify_intent", deadline_at):
+        assert remaining_budget() <= 1.0
@@ -0,0 +1,152 @@
+"""
+Tests for per-service circuit breakers and bulkheads.
+"""
+
+import threading
+import time
+
+import pytest
+
+from integration.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    Bulkhead,
+    CircuitBreaker,
+    breaker_for,
+    is_degraded,
+    protected_call,
+    reset_breakers,
+)
+from observability.exporters import PrometheusExporter
+from observability.tracer import configure_exporters
+
+URL = "http://commerce.test/pricing/contract/B2B001/SKU1001"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
+def test_breaker_opens_on_error_rate_and_recovers_through_half_open():
+    clock = FakeClock()
+    breaker = CircuitBreaker("pricing", min_calls=4, error_rate=0.5, open_for_s=10,
+                             half_open_probes=1, clock=clock)
+
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(ok)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+    clock.now += 10
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()      # only one probe at a time
+    breaker.record(True)
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker("oms", min_calls=1, open_for_s=5, clock=clock)
+    breaker.record(False)
+    clock.now += 5
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == 5
+
+
+def test_old_failures_leave_the_rolling_window():
+    clock = FakeClock()
+    breaker = CircuitBreaker("catalog", window_s=10, min_calls=3, clock=clock)
+    breaker.record(False)
+    breaker.record(False)
+    clock.now += 11
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker.state == CLOSED
+
+
+def test_protected_call_fails_fast_when_open():
+    calls = []
+
+    def failing():
+        calls.append(1)
+        return {"error": "Timeout", "url": URL}
+
+    for _ in range(10):
+        protected_call(URL, failing)
+    assert breaker_for("pricing").state == OPEN
+
+    result = protected_call(URL, failing)
+    assert is_degraded(result)
+    assert result["error"] == "CircuitOpen"
+    assert result["service"] == "pricing"
+    assert len(calls) == 10
+
+    # Other services are unaffected
+    ok = protected_call("http://commerce.test/catalog/product/SKU1", lambda: {"sku": "SKU1"})
+    assert ok == {"sku": "SKU1"}
+
+
+def test_client_errors_do_not_trip_breaker():
+    for _ in range(20):
+        protected_call(URL, lambda: {"error": "404", "status": 404, "url": URL})
+    assert breaker_for("pricing").state == CLOSED
+
+
+def test_bulkhead_rejects_when_saturated():
+    bulkhead = Bulkhead(1, wait_s=0.01)
+    assert bulkhead.try_acquire()
+    assert not bulkhead.try_acquire()
+    bulkhead.release()
+    assert bulkhead.try_acquire()
+
+
+def test_saturated_service_returns_degraded(monkeypatch):
+    monkeypatch.setenv("COMMERCE_SHIPPING_MAX_IN_FLIGHT", "1")
+    monkeypatch.setattr("integration.circuit_breaker.BULKHEAD_WAIT_S", 0.01)
+    url = "http://commerce.test/shipping/eta/T1"
+    inside, release = threading.Event(), threading.Event()
+
+    def slow():
+        inside.set()
+        release.wait()
+        return {"eta": "tomorrow"}
+
+    worker = threading.Thread(target=protected_call, args=(url, slow))
+    worker.start()
+    inside.wait()
+    started = time.monotonic()
+    result = protected_call(url, slow)
+    waited = time.monotonic() - started
+    release.set()
+    worker.join()
+
+    assert result["error"] == "BulkheadFull"
+    # The patched wait applies to bulkheads created with the default
+    assert waited < 0.25
+
+
+def test_breaker_state_is_exported_as_gauge():
+    exporter = PrometheusExporter()
+    configure_exporters([exporter])
+    try:
+        breaker = CircuitBreaker("inventory", min_calls=1)
+        breaker.record(False)
+        assert 'commerce_circuit_state{service="inventory"} 2' in exporter.render()
+    finally:
+        configure_exporters([])
@@ -0,0 +1,66 @@
+"""
+Tests for the in-memory contract-price index.
+"""
+
+import json
+import os
+from datetime import date
+from unittest.mock import patch
+
+from integration.contract_index import ContractIndex
+from integration.java_commerce_client import fetch_price
+
+
+def write_snapshot(path, accounts):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"contract_pricing": {"ACCOUNTS": accounts}}, f)
+    os.replace(tmp, path)
+
+
+def test_lookup_respects_validity_intervals(tmp_path):
+    path = str(tmp_path / "contracts.json")
+    write_snapshot(path, [
+        {"customer_id": "B2B001", "sku": "SKU1001", "contract_price": 2499,
+         "valid_from": "2025-01-01", "valid_until": "2025-06-30"},
+        {"customer_id": "B2B001", "sku": "SKU1001", "contract_price": 2399,
+         "valid_from": "2025-07-01", "valid_until": "2025-12-31"},
+    ])
+    index = ContractIndex(path)
+    assert index.load()
+
+    assert index.lookup("B2B001", "SKU1001", date(2025, 3, 1))["contract_price"] == 2499
+    assert index.lookup("B2B001", "SKU1001", date(2025, 8, 1))["contract_price"] == 2399
+    assert index.lookup("B2B001", "SKU1001", date(2026, 1, 1)) is None
+    assert index.lookup("B2B002", "SKU1001", date(2025, 3, 1)) is None
+
+
+def test_reload_swaps_in_new_snapshot_and_ignores_broken_files(tmp_path):
+    path = str(tmp_path / "contracts.json")
+    write_snapshot(path, [{"customer_id": "C1", "sku": "S1", "contract_price": 10}])
+    index = ContractIndex(path)
+    index.load()
+
+    write_snapshot(path, [{"customer_id": "C1", "sku": "S1", "contract_price": 12, "note": "v2"}])
+    assert index.reload_if_changed()
+    assert index.lookup("C1", "S1")["contract_price"] == 12
+
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert not index.reload_if_changed()
+    assert index.lookup("C1", "S1")["contract_price"] == 12
+
+
+def test_fetch_price_skips_network_on_index_hit():
+    index = ContractIndex()
+    index.load()
+    hit = index.lookup("B2B001", "SKU1001", date(2025, 1, 1))
+
+    with patch("integration.java_commerce_client.get_contract_index") as get_index, \
+         patch("integration.java_commerce_client.http_call") as remote:
+        get_index.return_value.lookup.return_value = hit
+        result = fetch_price("B2B001", "SKU1001")
+
+    remote.assert_not_called()
+    assert result["contract_price"] == 2499
+    assert result["source"] == "contract_index"
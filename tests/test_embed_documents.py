@@ -0,0 +1,95 @@
+import io
+import json
+import os
+
+import numpy as np
+import pytest
+
+from ai_service import embedding_backend
+from ai_service.embedding_backend import StubEncoder, load_encoder
+from embeddings import embed_documents
+from embeddings.embed_documents import (
+    WORKER_THREAD_ENV, child_environ, encode_corpus, iter_chunks, iter_documents, iter_json_array
+)
+
+
+def write_catalog(tmp_path, records):
+    path = tmp_path / "catalog.jsonl"
+    with open(path, "w") as f:
+        for i in range(records):
+            f.write(json.dumps({"sku": f"SKU{i}", "name": f"product {i} colour {i % 7}"}) + "\n")
+    return str(path)
+
+
+def test_documents_stream_in_source_order(tmp_path):
+    catalog = write_catalog(tmp_path, 10)
+    policy = tmp_path / "policy.txt"
+    policy.write_text("30 day returns")
+
+    docs = list(iter_documents([catalog, str(policy)]))
+    chunks = list(iter_chunks([catalog, str(policy)], chunk_size=4))
+
+    assert docs[0]["sku"] == "SKU0" and docs[-1] == {"content": "30 day returns"}
+    assert [(start, len(texts)) for start, texts in chunks] == [(0, 4), (4, 4), (8, 3)]
+
+
+def test_serial_ingestion_writes_memmap(tmp_path):
+    catalog = write_catalog(tmp_path, 50)
+
+    embeddings = encode_corpus([catalog], str(tmp_path / "emb.f32"), backend="stub", chunk_size=16)
+
+    assert isinstance(embeddings, np.memmap)
+    assert embeddings.shape == (50, 384)
+    expected = StubEncoder().encode([str(doc) for doc in iter_documents([catalog])])
+    np.testing.assert_allclose(embeddings, expected)
+
+
+def test_parallel_ingestion_matches_serial(tmp_path):
+    catalog = write_catalog(tmp_path, 1000)
+
+    serial = encode_corpus([catalog], str(tmp_path / "serial.f32"), backend="stub", chunk_size=64)
+    parallel = encode_corpus(
+        [catalog], str(tmp_path / "parallel.f32"), backend="stub", workers=3, chunk_size=37
+    )
+
+    assert parallel.shape == serial.shape
+    np.testing.assert_allclose(parallel, serial)
+
+
+def test_json_arrays_stream_across_read_blocks():
+    records = [{"sku": f"SKU{i}", "tags": ["a", "b,]"], "price": 1000 + i} for i in range(50)]
+    records += [12345, "tail", None]
+    text = json.dumps(records, indent=2)
+
+    assert list(iter_json_array(io.StringIO(text), block_size=7)) == records
+    assert list(iter_json_array(io.StringIO("[]"), block_size=1)) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"sku": 1}, {"sku"'), block_size=4))
+
+
+def test_json_sources_are_parsed_once(tmp_path, monkeypatch):
+    catalog = tmp_path / "catalog.json"
+    catalog.write_text(json.dumps([{"sku": f"SKU{i}"} for i in range(20)]))
+    calls = []
+    real = embed_documents.iter_documents
+    monkeypatch.setattr(embed_documents, "iter_documents", lambda sources: calls.append(1) or real(sources))
+
+    embeddings = encode_corpus([str(catalog)], str(tmp_path / "emb.f32"), backend="stub", chunk_size=8)
+
+    assert embeddings.shape == (20, 384)
+    assert len(calls) == 1
+
+
+def test_workers_start_with_single_threaded_env(monkeypatch):
+    monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+    with child_environ(WORKER_THREAD_ENV):
+        assert os.environ["OMP_NUM_THREADS"] == "1"
+        assert os.environ["EMBEDDING_ONNX_THREADS"] == "1"
+    assert "OMP_NUM_THREADS" not in os.environ
+
+
+def test_onnx_thread_cap_is_passed_explicitly(monkeypatch):
+    monkeypatch.setattr(embedding_backend, "OnnxEncoder", lambda threads: threads)
+
+    assert load_encoder("onnx", threads=1) == 1
+    assert load_encoder("onnx") == embedding_backend.EMBEDDING_ONNX_THREADS
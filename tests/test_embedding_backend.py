@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pytest
+
+from ai_service.embedding_backend import (
+    EMBEDDING_ONNX_DIR, ONNX_CONFIG_FILE, cosine_parity, l2_normalize, load_encoder, mean_pool
+)
+
+# int8 quantization costs a little accuracy; retrieval ranks stay stable above this
+PARITY_MIN_COSINE = 0.98
+
+
+def test_mean_pool_ignores_padding():
+    hidden = np.array([[[1.0, 2.0], [3.0, 4.0], [100.0, 100.0]]], dtype=np.float32)
+    mask = np.array([[1, 1, 0]])
+
+    np.testing.assert_allclose(mean_pool(hidden, mask), [[2.0, 3.0]])
+
+
+def test_l2_normalize_and_cosine_parity():
+    vectors = np.array([[3.0, 4.0], [0.0, 2.0]], dtype=np.float32)
+    normalized = l2_normalize(vectors)
+
+    np.testing.assert_allclose(np.linalg.norm(normalized, axis=1), [1.0, 1.0])
+    assert cosine_parity(vectors, normalized * 7) == {"min": 1.0, "mean": 1.0}
+    assert cosine_parity(vectors, vectors[::-1])["min"] == pytest.approx(0.8)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        load_encoder("tensorflow")
+
+
+def test_onnx_encoder_matches_torch_encoder():
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("sentence_transformers")
+    if not os.path.exists(os.path.join(EMBEDDING_ONNX_DIR, ONNX_CONFIG_FILE)):
+        pytest.skip("no ONNX export; run python -m embeddings.export_onnx")
+    from embeddings.export_onnx import catalog_texts, load_sentence_transformer
+
+    texts = catalog_texts()
+    onnx_encoder = load_encoder("onnx")
+    reference = load_sentence_transformer(onnx_encoder.config["model"]).encode(texts)
+    candidate = onnx_encoder.encode(texts, batch_size=4)
+
+    assert candidate.shape == reference.shape
+    assert candidate.dtype == np.float32
+    assert cosine_parity(reference, candidate)["min"] >= PARITY_MIN_COSINE
+    # Single-string calls agree with batched ones
+    np.testing.assert_allclose(onnx_encoder.encode(texts[0]), candidate[0], atol=1e-5)
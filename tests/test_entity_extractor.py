@@ -0,0 +1,115 @@
+"""
+Tests for the single-pass entity extractor.
+"""
+
+import threading
+import time
+
+import agents.entity_extractor as entity_extractor
+from agents.entity_extractor import (
+    AhoCorasick,
+    EntityExtractor,
+    Gazetteer,
+    catalog_entries,
+    extract_entities,
+)
+
+PRODUCTS = [
+    {"sku": "SKU1001", "name": "Noise Cancelling Headphones", "brand": "SoundMax"},
+    {"sku": "SKU1003", "name": "Headphones", "brand": "SoundMax"},
+]
+CUSTOMERS = [{"customer_id": "B2B001"}]
+
+
+def make_extractor(products=PRODUCTS, customers=CUSTOMERS):
+    return EntityExtractor(Gazetteer(catalog_entries(products, customers)))
+
+
+def test_automaton_reports_overlapping_matches():
+    automaton = AhoCorasick()
+    for word in ("he", "she", "hers"):
+        automaton.add(word, ("word", word, None))
+    automaton.build()
+
+    found = sorted((start, end) for start, end, _ in automaton.iter_matches("ushers"))
+    assert found == [(1, 4), (2, 4), (2, 6)]
+
+
+def test_extracts_ids_and_catalog_names_with_spans():
+    text = "Return noise cancelling headphones from ord1001 for B2B001 please"
+    entities = make_extractor().extract(text)
+
+    by_type = {e["type"]: e for e in entities}
+    assert by_type["order_id"]["value"] == "ORD1001"
+    assert by_type["customer_id"]["value"] == "B2B001"
+
+    # Longest match wins over the nested "Headphones"
+    product = by_type["product"]
+    assert product["ref"] == "SKU1001"
+    assert text[product["start"]:product["end"]] == "noise cancelling headphones"
+    assert [e["start"] for e in entities] == sorted(e["start"] for e in entities)
+
+
+def test_names_only_match_on_word_boundaries():
+    assert make_extractor().extract("soundmaxheadphones") == []
+
+
+def test_incremental_update_adds_and_removes_names():
+    gazetteer = Gazetteer(catalog_entries(PRODUCTS, CUSTOMERS))
+    extractor = EntityExtractor(gazetteer)
+
+    gazetteer.update(catalog_entries(
+        [PRODUCTS[0], {"sku": "SKU2001", "name": "Office Chair", "brand": "ErgoLine"}], CUSTOMERS
+    ))
+    entities = extractor.extract("an office chair and headphones")
+    assert [e["ref"] for e in entities if e["type"] == "product"] == ["SKU2001"]
+
+    gazetteer.compact()
+    entities = extractor.extract("an office chair and headphones")
+    assert [e["ref"] for e in entities if e["type"] == "product"] == ["SKU2001"]
+
+
+def test_large_update_compacts_in_background(monkeypatch):
+    monkeypatch.setattr(entity_extractor, "COMPACT_AFTER", 2)
+    gazetteer = Gazetteer(catalog_entries(PRODUCTS, CUSTOMERS))
+    extractor = EntityExtractor(gazetteer)
+    release = threading.Event()
+    build = AhoCorasick.build
+
+    def slow_build(self):
+        release.wait(5)
+        build(self)
+
+    products = [PRODUCTS[0]] + [
+        {"sku": f"SKU{2000 + i}", "name": f"Office Chair {i}", "brand": "ErgoLine"} for i in range(5)
+    ]
+    monkeypatch.setattr(AhoCorasick, "build", slow_build)
+    # Returns while the rebuild is blocked; the old automata keep serving
+    gazetteer.update(catalog_entries(products, CUSTOMERS))
+    assert [e["ref"] for e in extractor.extract("headphones")] == ["SKU1003"]
+
+    release.set()
+    gazetteer.compact_in_background().join(5)
+    entities = extractor.extract("office chair 3 and headphones")
+    assert [e["ref"] for e in entities if e["type"] == "product"] == ["SKU2003"]
+    assert gazetteer._delta_entries == set()
+
+
+def test_scan_time_does_not_grow_with_catalog_size():
+    products = [
+        {"sku": f"SKU{i}", "name": f"Catalog Item {i}", "brand": f"Brand{i % 500}"}
+        for i in range(50_000)
+    ]
+    extractor = make_extractor(products)
+    text = "Is Catalog Item 4242 from Brand17 in stock for order ORD1001?"
+
+    start = time.perf_counter()
+    for _ in range(100):
+        entities = extractor.extract(text)
+    assert (time.perf_counter() - start) / 100 < 0.001
+    assert {"product", "brand", "order_id"} <= {e["type"] for e in entities}
+
+
+def test_default_extractor_uses_catalog_files():
+    entities = extract_entities("Do you have Wireless Earbuds Pro?")
+    assert entities[0]["ref"] == "SKU1002"
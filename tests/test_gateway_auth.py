@@ -0,0 +1,77 @@
+"""
+Tests for gateway auth: verified-token cache, API-key index, RBAC bitsets.
+"""
+
+import time
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from api_gateway import auth
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    auth.verified_tokens.clear()
+    yield
+    auth.verified_tokens.clear()
+
+
+def test_verified_token_is_served_from_cache(monkeypatch):
+    token = auth.generate_jwt("U1001", "CSR")
+    first = auth.decode_jwt(token)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("signature re-verified")
+
+    monkeypatch.setattr(auth.jwt, "decode", fail)
+    assert auth.decode_jwt(token) == first
+
+
+def test_cached_claims_expire_with_the_token():
+    token = jwt.encode(
+        {"user_id": "U1", "role": "CUSTOMER", "exp": int(time.time()) + 1},
+        auth.JWT_SECRET, algorithm=auth.JWT_ALGORITHM
+    )
+    auth.decode_jwt(token)
+
+    time.sleep(1.1)
+
+    with pytest.raises(HTTPException) as info:
+        auth.decode_jwt(token)
+    assert info.value.detail == "Token expired"
+
+
+def test_invalid_tokens_are_not_cached():
+    with pytest.raises(HTTPException):
+        auth.decode_jwt("not-a-token")
+    assert auth.verified_tokens.get("not-a-token") is None
+
+
+def test_cache_is_bounded():
+    cache = auth.VerifiedTokenCache(max_entries=2)
+    for i in range(3):
+        cache.put(f"t{i}", {"user_id": i})
+
+    assert cache.get("t0") is None
+    assert cache.get("t2") == {"user_id": 2}
+
+
+def test_api_key_index():
+    assert auth.validate_api_key("CSR_KEY_67890") == "csr-portal"
+    with pytest.raises(HTTPException):
+        auth.validate_api_key("CSR_KEY_6789")
+    with pytest.raises(HTTPException):
+        auth.validate_api_key(None)
+
+
+def test_rbac_bitsets_match_role_map():
+    for client, roles in auth.ROLE_MAP.items():
+        for role in auth.ROLE_BITS:
+            assert auth.has_role(client, role) == (role in roles)
+
+    auth.authorize_role("csr-portal", "ADMIN")
+    with pytest.raises(HTTPException):
+        auth.authorize_role("mobile-app", "ADMIN")
+    assert not auth.has_role("unknown", "CSR")
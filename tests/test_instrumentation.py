@@ -0,0 +1,68 @@
+"""
+Tests for per-node latency, token and cost instrumentation.
+"""
+
+import pytest
+from langchain.schema import AIMessage
+
+import agent_service.agent_graph as agent_graph
+import agents.catalog_agent as catalog_agent
+from agent_service.agent_graph import build_agent_graph
+from observability.exporters import InMemoryExporter, PrometheusExporter
+from observability.tracer import configure_exporters, record_cache, span, trace_invocation
+
+
+class FakeLLM:
+    model_name = "gpt-4o-mini"
+
+    def __init__(self, content):
+        self.content = content
+
+    async def ainvoke(self, prompt):
+        return AIMessage(
+            content=self.content,
+            usage_metadata={"input_tokens": 120, "output_tokens": 8, "total_tokens": 128}
+        )
+
+
+@pytest.fixture
+def exporters():
+    memory, prometheus = InMemoryExporter(), PrometheusExporter()
+    configure_exporters([memory, prometheus])
+    yield memory, prometheus
+    configure_exporters([])
+
+
+def test_graph_invocation_records_nodes_tools_and_llm_calls(exporters, monkeypatch):
+    memory, prometheus = exporters
+    monkeypatch.setattr(agent_graph.llm_policy, "tiers", [FakeLLM("catalog_search")])
+    monkeypatch.setattr(catalog_agent.llm_policy, "tiers", [FakeLLM("Here you go")])
+
+    build_agent_graph().invoke({"user_query": "noise cancelling headphones"})
+
+    trace = memory.traces[0]
+    kinds = {(s["kind"], s["name"]) for s in trace["spans"]}
+    assert ("node", "classify_intent") in kinds
+    assert ("node", "catalog_agent") in kinds
+    assert ("tool", "semantic_catalog_search") in kinds
+    assert trace["totals"]["llm_calls"] == 2
+    assert trace["totals"]["prompt_tokens"] == 240
+    assert trace["totals"]["cost_usd"] > 0
+
+    metrics = prometheus.render()
+    assert 'agent_span_duration_seconds_count{kind="node",name="catalog_agent"} 1' in metrics
+    assert 'llm_completion_tokens_total{model="gpt-4o-mini"} 16' in metrics
+
+
+def test_errors_and_cache_hits_are_recorded(exporters):
+    memory, _ = exporters
+
+    with trace_invocation("manual"):
+        record_cache("catalog", hit=True)
+        with pytest.raises(ValueError):
+            with span("broken_tool", "tool"):
+                raise ValueError("boom")
+
+    totals = memory.traces[0]["totals"]
+    assert totals["errors"] == 1
+    assert totals["cache_hits"] == 1
@@ -0,0 +1,97 @@
+"""
+Tests for the pluggable LLM backend (stub, record, replay).
+"""
+
+import asyncio
+import time
+
+import pytest
+from langchain.schema import AIMessage
+
+from ai_service import llm_backend
+from ai_service.llm_backend import (
+    Cassette,
+    CassetteMiss,
+    RecordingChatModel,
+    ReplayChatModel,
+    StubChatModel,
+    chat_model,
+    request_key,
+)
+
+
+def test_stub_is_deterministic_and_reports_usage():
+    stub = chat_model("gpt-4o-mini", temperature=0.2, backend="stub")
+
+    first = stub.invoke("Summarise order ORD1001")
+    second = asyncio.run(stub.ainvoke("Summarise order ORD1001"))
+
+    assert isinstance(stub, StubChatModel)
+    assert first.content == second.content
+    assert first.usage_metadata["output_tokens"] > 0
+    assert stub.invoke("Something else").content != first.content
+
+
+def test_stub_latency_follows_ttft_and_token_rate():
+    stub = StubChatModel(ttft_ms=20, tokens_per_s=2000, output_tokens=40)
+
+    started = time.monotonic()
+    message = asyncio.run(stub.ainvoke("hello"))
+    elapsed = time.monotonic() - started
+
+    expected = 0.02 + message.usage_metadata["output_tokens"] / 2000
+    assert elapsed >= expected * 0.9
+
+
+def test_stub_uses_registered_responder(monkeypatch):
+    monkeypatch.setattr(llm_backend, "_stub_responders", [])
+    llm_backend.register_stub_responder("Classify:\n", lambda rest: rest.strip().upper())
+
+    assert StubChatModel().invoke("Classify:\nfaq").content == "FAQ"
+
+
+class FakeModel:
+    model_name = "gpt-4o-mini"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        return AIMessage(
+            content=f"answer to {prompt}",
+            usage_metadata={"input_tokens": 3, "output_tokens": 4, "total_tokens": 7},
+        )
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    path = str(tmp_path / "llm.jsonl")
+    params = {"model": "gpt-4o-mini", "temperature": 0.2, "max_tokens": None}
+    inner = FakeModel()
+
+    recorder = RecordingChatModel(inner, params, Cassette(path))
+    recorded = asyncio.run(recorder.ainvoke("Where is ORD1001?"))
+
+    replay = ReplayChatModel(params, Cassette(path))
+    replayed = asyncio.run(replay.ainvoke("Where is ORD1001?"))
+
+    assert inner.calls == 1
+    assert replayed.content == recorded.content
+    assert replayed.usage_metadata["total_tokens"] == 7
+    assert replayed.response_metadata["replayed"] is True
+
+
+def test_replay_miss_raises(tmp_path):
+    params = {"model": "gpt-4o-mini", "temperature": 0, "max_tokens": None}
+    replay = ReplayChatModel(params, Cassette(str(tmp_path / "empty.jsonl")))
+
+    with pytest.raises(CassetteMiss):
+        replay.invoke("never recorded")
+
+
+def test_request_key_covers_params():
+    base = {"model": "gpt-4o-mini", "temperature": 0, "max_tokens": None}
+
+    assert request_key("gpt-4o-mini", base, "q") == request_key("gpt-4o-mini", dict(base), "q")
+    assert request_key("gpt-4o-mini", base, "q") != request_key("gpt-4o-mini", {**base, "temperature": 0.2}, "q")
+    assert request_key("gpt-4o-mini", base, "q") != request_key("gpt-4o-mini", base, "q2")
@@ -0,0 +1,132 @@
+"""
+Tests for the persistent LLM completion cache:
+- Exact-match hits skip the model
+- Data version change invalidates entries
+- Size-bounded LRU eviction and TTL
+"""
+
+import asyncio
+
+from langchain.schema import AIMessage
+
+from ai_service import call_policy, llm_cache
+from ai_service.call_policy import CallPolicy
+from ai_service.llm_cache import LLMCache
+
+
+class CountingLLM:
+    model_name = "gpt-4o-mini"
+    temperature = 0.2
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        return AIMessage(content=f"answer-{self.calls}")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(tmp_path, version="v1", **kwargs):
+    state = {"version": version}
+    cache = LLMCache(str(tmp_path / "llm.sqlite3"), version_fn=lambda: state["version"], **kwargs)
+    return cache, state
+
+
+def test_repeated_prompt_costs_one_call(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path)
+    monkeypatch.setattr(call_policy, "get_llm_cache", lambda: cache)
+    llm = CountingLLM()
+    policy = CallPolicy("order_agent", [llm])
+
+    first = asyncio.run(policy.ainvoke("Order ORD1001 is SHIPPED", budget=2.0))
+    second = asyncio.run(policy.ainvoke("Order ORD1001 is SHIPPED", budget=2.0))
+    changed = asyncio.run(policy.ainvoke("Order ORD1001 is DELIVERED", budget=2.0))
+
+    assert llm.calls == 2
+    assert second.content == first.content
+    assert second.response_metadata["cache"] == "hit"
+    assert changed.content == "answer-2"
+
+
+def test_cache_persists_across_instances(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    cache.put("k", "gpt-4o-mini", "hello")
+
+    reopened, _ = make_cache(tmp_path)
+    assert reopened.get("k") == "hello"
+
+
+def test_data_version_change_invalidates(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "VERSION_CHECK_INTERVAL_S", 0)
+    cache, state = make_cache(tmp_path)
+    cache.put("k", "gpt-4o-mini", "hello")
+
+    state["version"] = "v2"
+
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_bounds_size(tmp_path):
+    clock = Clock()
+    cache, _ = make_cache(tmp_path, max_entries=3, clock=clock)
+    for key in "abc":
+        clock.now += 1
+        cache.put(key, "m", key)
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.put("d", "m", "d")
+
+    assert cache.stats()["entries"] == 3
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+
+
+def test_ttl_expires_entries(tmp_path):
+    clock = Clock()
+    cache, _ = make_cache(tmp_path, ttl_s=60, clock=clock)
+    cache.put("k", "m", "hello")
+
+    clock.now += 61
+
+    assert cache.get("k") is None
+
+
+class FailingLLM:
+    model_name = "gpt-4o"
+    temperature = 0.2
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        raise ConnectionError("primary down")
+
+
+def test_fallback_and_renderer_answers_not_cached(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path)
+    monkeypatch.setattr(call_policy, "get_llm_cache", lambda: cache)
+    primary, fallback = FailingLLM(), CountingLLM()
+    policy = CallPolicy("order_agent", [primary, fallback], renderer=lambda: "rendered")
+
+    answer = asyncio.run(policy.ainvoke("prompt", budget=2.0))
+
+    # The cache lookup ran against the primary tier, the fallback answered
+    assert primary.calls >= 1 and fallback.calls == 1
+    assert answer.content == "answer-1"
+    assert cache.stats()["entries"] == 0
+
+    rendered = asyncio.run(CallPolicy("order_agent", [primary], renderer=lambda: "rendered")
+                           .ainvoke("prompt", budget=1.0))
+    assert rendered.content == "rendered"
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,82 @@
+"""
+Tests for the open-loop load-test harness.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from load_tests.harness import _chat_error, _chat_payload, run_open_loop
+from load_tests.histogram import LatencyHistogram
+from load_tests.workload import Workload
+
+
+class SlowTarget:
+    def __init__(self, delay_s):
+        self.delay_s = delay_s
+
+    async def send(self, request):
+        await asyncio.sleep(self.delay_s)
+        return None if request["intent"] != "faq" else "HTTP 500"
+
+
+def test_histogram_percentiles_within_one_percent():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(float(value))
+
+    assert abs(histogram.percentile(50) - 500) <= 5
+    assert abs(histogram.percentile(99) - 990) <= 10
+    assert histogram.percentile(100) == 1000
+
+    restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+    assert restored.percentile(95) == histogram.percentile(95)
+    assert restored.percentile(100) == 1000
+    assert restored.total_ms == histogram.total_ms
+    assert restored.max_ms == histogram.max_ms
+    assert restored.summary() == histogram.summary()
+    # Bucket-only dicts would restore a 0.0 mean; they are rejected
+    with pytest.raises(KeyError):
+        LatencyHistogram.from_dict(histogram.to_dict()["buckets"])
+
+
+def test_latency_includes_queueing_behind_slow_requests():
+    # One slot and 20ms service time at 100 rps: requests queue up, and the
+    # corrected latency must grow while service time stays flat
+    workload = Workload(Workload.parse_mix("order_status=1"))
+    recorder = asyncio.run(run_open_loop(SlowTarget(0.02), workload, rate=100, duration_s=0.5, max_in_flight=1))
+
+    stats = recorder.intents["order_status"]
+    assert stats.service.percentile(50) < 40
+    assert stats.response.percentile(99) > 200
+
+
+def test_report_has_per_intent_errors_and_throughput():
+    workload = Workload(Workload.parse_mix("faq=1,catalog_search=1"))
+    recorder = asyncio.run(run_open_loop(SlowTarget(0), workload, rate=200, duration_s=0.25))
+    report = recorder.report(0.25)
+
+    assert report["intents"]["faq"]["error_rate"] == 1.0
+    assert report["intents"]["faq"]["errors"] == {"HTTP 500": report["intents"]["faq"]["count"]}
+    assert report["intents"]["catalog_search"]["error_rate"] == 0.0
+    assert report["overall"]["count"] == 50
+    assert set(report["overall"]["latency_ms"]) >= {"p50", "p95", "p99"}
+
+
+def test_workload_builds_queries_from_catalog_data():
+    workload = Workload(Workload.parse_mix("order_cancellation=1"))
+    request = workload.next_request()
+    assert request["channel"] == "agent"
+    assert "ORD" in request["query"]
+
+
+def test_chat_requests_use_the_agent_state_contract():
+    request = {"query": "Where is my order ORD1001?", "customer_id": "B2B001"}
+    assert _chat_payload(request) == {"user_query": request["query"], "customer_id": "B2B001"}
+
+    graph_answer = httpx.Response(200, json={"intent": "order_status", "result": {"message": "ok"}})
+    assert _chat_error(graph_answer) is None
+    assert _chat_error(httpx.Response(200, json={"result": {"status": "SHIPPED"}})).startswith("unexpected")
+    assert _chat_error(httpx.Response(422, json={})) == "HTTP 422"
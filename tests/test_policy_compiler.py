@@ -0,0 +1,101 @@
+"""
+Tests for the compiled return / cancellation policy table.
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from agents import policy_compiler
+from agents.policy_compiler import compile_policy, load_policy_table, spec_version
+from embeddings import embed_documents
+
+SPEC_PATH = "data/return_policy.json"
+
+
+def load_spec():
+    with open(SPEC_PATH) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    """
+    Index build outputs (manifest, compiled table) under tmp_path, for both
+    the build script and the runtime loader (one policy_compiler module).
+    """
+    manifest, table = str(tmp_path / "manifest.json"), str(tmp_path / "policy_table.json")
+    monkeypatch.setattr(embed_documents, "INDEX_MANIFEST_PATH", manifest)
+    monkeypatch.setattr(policy_compiler, "INDEX_MANIFEST_PATH", manifest)
+    monkeypatch.setattr(policy_compiler, "POLICY_TABLE_PATH", table)
+    load_policy_table.cache_clear()
+    yield tmp_path
+    load_policy_table.cache_clear()
+
+
+def build_index(tmp_path):
+    source = tmp_path / "catalog.jsonl"
+    source.write_text('{"sku": "SKU1"}\n')
+    embed_documents.write_manifest([str(source)], np.zeros((1, 4), dtype=np.float32), "stub")
+    with open(tmp_path / "manifest.json") as f:
+        return json.load(f)
+
+
+def test_lookup_by_category_tier_and_status():
+    table = compile_policy(load_spec())
+
+    electronics = table.lookup("Electronics", "BRONZE", "DELIVERED")
+    assert electronics["returnable"] is True
+    assert electronics["return_window_days"] == 10
+    assert electronics["restocking_fee_percent"] == 5
+    assert electronics["damage_only"] is False
+
+    assert table.lookup("Furniture", "BRONZE", "DELIVERED")["damage_only"] is True
+    assert table.lookup("Electronics", "GOLD", "DELIVERED")["damage_only"] is True
+    assert table.lookup("Electronics", "BRONZE", "SHIPPED")["returnable"] is False
+
+
+def test_unknown_values_fall_back_to_wildcard_rules():
+    table = compile_policy(load_spec())
+
+    decision = table.lookup("Toys", "PLATINUM", "DELIVERED")
+    assert decision["returnable"] is True
+    assert decision["rules"] == ["returns-after-delivery"]
+    assert table.statuses_where("cancellable") == ["ORDER_PLACED", "PROCESSING"]
+
+
+def test_table_round_trips_with_version(index_dir):
+    manifest = build_index(index_dir)
+    loaded = load_policy_table()
+
+    # The shipped table is used, not a fresh compile of the spec
+    assert loaded.version == manifest["version"]
+    assert loaded.version != spec_version(load_spec())
+    restored = type(loaded).from_dict(json.loads(json.dumps(loaded.to_dict())))
+    assert restored.version == manifest["version"]
+    assert restored.lookup("Furniture", "GOLD", "DELIVERED") == loaded.lookup("Furniture", "GOLD", "DELIVERED")
+
+
+def test_stale_table_is_rejected(index_dir):
+    build_index(index_dir)
+    with open(index_dir / "policy_table.json") as f:
+        stale = json.load(f)
+    stale["version"] = "0" * 12
+    for *_, decision in stale["decisions"]:
+        decision["returnable"] = not decision["returnable"]
+    with open(index_dir / "policy_table.json", "w") as f:
+        json.dump(stale, f)
+
+    loaded = load_policy_table()
+
+    assert loaded.version == spec_version(load_spec())
+    assert loaded.lookup("Electronics", "BRONZE", "DELIVERED")["returnable"] is True
+
+
+def test_build_script_and_agents_share_one_compiler_module():
+    assert embed_documents.write_policy_table is policy_compiler.write_policy_table
+
+
+def test_runtime_loader_compiles_spec_without_index_build():
+    assert load_policy_table().lookup("Electronics", None, "PROCESSING")["cancellable"] is True
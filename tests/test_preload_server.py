@@ -0,0 +1,122 @@
+"""
+Tests for the preload-then-fork server:
+- Per-process memory report
+- Threads, loops and pools are re-created in forked workers
+- Master serves through forked workers and shuts down on SIGTERM
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+from langchain.schema import AIMessage
+
+from ai_service import call_policy
+from api_gateway import admission
+from service.server import process_memory
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="fork-based server")
+
+
+class EchoLLM:
+    model_name = "echo"
+
+    async def ainvoke(self, prompt):
+        return AIMessage(content=prompt)
+
+
+def test_process_memory_reports_shared_and_private():
+    if not os.path.exists(f"/proc/{os.getpid()}/smaps_rollup"):
+        pytest.skip("needs /proc smaps_rollup")
+    memory = process_memory(os.getpid())
+
+    assert memory["rss_mb"] > 0
+    assert memory["pss_mb"] <= memory["rss_mb"]
+    assert process_memory(-1) == {}
+
+
+def test_forked_child_recreates_llm_loop_and_worker_pool():
+    policy = call_policy.CallPolicy("fork", [EchoLLM()])
+    assert policy.invoke("parent").content == "parent"
+    asyncio.run(admission.run_blocking(lambda: None))
+    parent_loop = call_policy._loop
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        ok = (
+            call_policy._loop is None
+            and admission._executor is None
+            and policy.invoke("child").content == "child"
+            and call_policy._loop is not parent_loop
+        )
+        os.write(write_fd, b"1" if ok else b"0")
+        os._exit(0)
+
+    os.close(write_fd)
+    result = os.read(read_fd, 1)
+    os.waitpid(pid, 0)
+    assert result == b"1"
+
+
+def test_preloaded_agent_graph_is_shared_with_workers():
+    from agent_service.agent_graph import get_agent_graph
+    from api_gateway import routes
+    from service import app as service_app
+
+    assert isinstance(service_app.warm_up([("agent_graph", service_app._load_agents)])["agent_graph"], float)
+    graph = get_agent_graph()
+    assert routes.agent_executor.resolve() is graph
+    builds = get_agent_graph.cache_info().misses
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # The worker serves /chat from the master's graph without compiling its own
+        ok = routes.agent_executor.resolve() is graph and get_agent_graph.cache_info().misses == builds
+        os.write(write_fd, b"1" if ok else b"0")
+        os._exit(0)
+
+    os.close(write_fd)
+    result = os.read(read_fd, 1)
+    os.waitpid(pid, 0)
+    assert result == b"1"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_master_serves_through_workers_and_stops_on_sigterm():
+    port = free_port()
+    env = dict(os.environ, OPENAI_API_KEY="x", PYTHONPATH=os.pathsep.join([".", "agent_service"]))
+    master = subprocess.Popen(
+        [sys.executable, "-m", "service.server", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", "2", "--report-interval", "0", "--graceful-timeout", "5", "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                assert time.monotonic() < deadline, "server did not start"
+                assert master.poll() is None, "master exited"
+                time.sleep(0.3)
+        assert response.status_code == 200
+
+        master.send_signal(signal.SIGTERM)
+        assert master.wait(timeout=20) == 0
+    finally:
+        if master.poll() is None:
+            master.kill()
@@ -0,0 +1,83 @@
+"""
+Tests for the vectorized B2B pricing engine and Pricing Agent.
+"""
+
+import time
+from datetime import date
+
+from agents.pricing_agent import extract_quote_lines, handle_pricing_query
+from agents.pricing_engine import get_pricing_engine
+
+
+def test_contract_tier_and_moq_rules():
+    quote = get_pricing_engine().quote(
+        "B2B001",
+        ["SKU1001", "SKU2001", "SKU1002", "NOPE"],
+        [10, 5, 2, 1],
+        on=date(2025, 6, 1)
+    )
+    lines = {line["sku"]: line for line in quote["lines"]}
+
+    assert lines["SKU1001"]["pricing"] == "contract"
+    assert lines["SKU1001"]["unit_price"] == 2499
+    assert lines["SKU2001"]["pricing"] == "tier"
+    assert lines["SKU2001"]["unit_price"] == round(7999 * 0.85, 2)
+    assert lines["SKU1002"]["below_moq"] is True
+    assert lines["SKU1002"]["unit_price"] == 1999
+    assert quote["unknown_skus"] == ["NOPE"]
+
+
+def test_expired_contract_falls_back_to_tier_pricing():
+    quote = get_pricing_engine().quote("B2B001", ["SKU1001"], [10], on=date(2026, 1, 1))
+    assert quote["lines"][0]["pricing"] == "tier"
+
+
+def test_large_cart_is_priced_in_milliseconds():
+    skus = ["SKU1001", "SKU1002", "SKU2001"] * 3334
+    quantities = [5] * len(skus)
+
+    started = time.perf_counter()
+    quote = get_pricing_engine().quote("B2B002", skus, quantities, include_lines=False)
+    elapsed = time.perf_counter() - started
+
+    assert quote["line_count"] == len(skus)
+    assert elapsed < 0.05
+
+
+def test_pricing_agent_quotes_lines_from_query():
+    assert extract_quote_lines("20 x SKU1001 and SKU2001 x 3") == (["SKU1001", "SKU2001"], [20, 3])
+
+    result = handle_pricing_query("quote 20 x SKU1001", "B2B002")
+    assert result["quote"]["line_count"] == 1
+    assert "Total" in result["message"]
+
+
+def test_quote_lines_do_not_borrow_digits_from_neighbouring_skus():
+    assert extract_quote_lines("quote SKU1001 SKU1002") == (["SKU1001", "SKU1002"], [1, 1])
+    assert extract_quote_lines("5 x SKU1001, SKU2001 and 7 pcs of SKU3001") == (
+        ["SKU1001", "SKU2001", "SKU3001"], [5, 1, 7]
+    )
+
+
+def test_bare_sku_quotes_quantity_one():
+    assert extract_quote_lines("price for SKU1001") == (["SKU1001"], [1])
+
+
+def test_quote_route_rejects_malformed_lines():
+    from fastapi.testclient import TestClient
+
+    from api_gateway.routes import app
+
+    client = TestClient(app, headers={"X-API-Key": "AI_INTERNAL_KEY_12345"})
+    ok = client.post("/quote", json={"customer_id": "B2B002", "lines": [{"sku": "SKU1001", "quantity": 2}]})
+    assert ok.status_code == 200 and ok.json()["line_count"] == 1
+
+    for lines in (
+        [{"quantity": 2}],
+        [{"sku": "SKU1001", "quantity": 0}],
+        [{"sku": "SKU1001", "quantity": -3}],
+        [{"sku": "SKU1001", "quantity": "ten"}],
+        [{"sku": "SKU1001", "quantity": "5"}],
+        [],
+    ):
+        assert client.post("/quote", json={"lines": lines}).status_code == 422, lines
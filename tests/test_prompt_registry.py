@@ -0,0 +1,69 @@
+"""
+Tests for the precompiled prompt registry:
+- Static instructions form a byte-identical prefix
+- Token counts are reported per template
+"""
+
+import pytest
+
+from ai_service.prompt_registry import PromptRegistry
+from ai_service.prompt_templates import PROMPTS
+
+
+def test_all_prompts_share_static_prefix_across_requests():
+    for name in PROMPTS.names():
+        prompt = PROMPTS.get(name)
+        first = prompt.format(**{v: "A" for v in prompt.input_variables})
+        second = prompt.format(**{v: "B" * 40 for v in prompt.input_variables})
+
+        assert first.startswith(prompt.prefix)
+        assert second.startswith(prompt.prefix)
+
+
+def test_order_prompt_puts_variables_after_instructions():
+    rendered = PROMPTS.get("order_agent").format(
+        order_id="ORD1001",
+        status="SHIPPED",
+        carrier="BlueDart",
+        tracking_number="BD123",
+        eta="2024-10-15",
+        exception="None"
+    )
+
+    assert rendered.index("professional tone") < rendered.index("ORD1001")
+
+
+def test_variables_in_prefix_are_rejected():
+    with pytest.raises(ValueError):
+        PromptRegistry().register("bad", "Order {order_id}", "{query}")
+
+
+def test_token_report_per_template():
+    registry = PromptRegistry()
+    prompt = registry.register("demo", "Answer briefly.", "Question: {question}")
+    prompt.format(question="where is my order?")
+
+    report = registry.token_report()["demo"]
+    assert report["prefix_tokens"] > 0
+    assert report["renders"] == 1
+    assert report["avg_prompt_tokens"] > report["prefix_tokens"]
+
+
+def test_renders_tokenize_only_a_sample(monkeypatch):
+    from ai_service import prompt_registry
+
+    calls = []
+    real = prompt_registry.count_tokens
+    monkeypatch.setattr(prompt_registry, "count_tokens", lambda text: calls.append(text) or real(text))
+    registry = PromptRegistry()
+    prompt = registry.register("demo", "Answer briefly.", "Question: {question}")
+
+    for i in range(100):
+        prompt.format(question=f"where is my order ORD{1000 + i}?")
+    assert len(calls) == -(-100 // prompt_registry.TOKEN_SAMPLE_EVERY)
+    report = registry.token_report()["demo"]
+
+    exact = real(prompt.format(question="where is my order ORD1050?")) - real(prompt.prefix)
+    assert report["renders"] == 100
+    assert report["sampled_renders"] == -(-100 // prompt_registry.TOKEN_SAMPLE_EVERY)
+    assert abs(report["avg_prompt_tokens"] - report["prefix_tokens"] - exact) <= 2
@@ -0,0 +1,169 @@
+"""
+Tests for gateway rate limiting and daily LLM-token quotas.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from langchain.schema import AIMessage
+
+from api_gateway import admission as admission_module
+from api_gateway.auth import generate_jwt, identify_caller
+from api_gateway.rate_limit import LocalStore, RateLimited, RateLimiter
+from observability.tracer import meter_llm_usage, record_llm_usage, span
+
+MOBILE = {"client_name": "mobile-app", "user_id": None, "roles": ["CUSTOMER"]}
+CSR = {"client_name": "csr-portal", "user_id": None, "roles": ["CSR", "ADMIN"]}
+CHAT = {"user_query": "Where is my order ORD1001?"}
+
+
+class Clock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_at_rate(monkeypatch):
+    monkeypatch.setenv("GATEWAY_RATE_MOBILE_APP", "2,3")
+    clock = Clock()
+    limiter = RateLimiter(LocalStore(), clock)
+
+    for _ in range(3):
+        limiter.check(MOBILE)
+    with pytest.raises(RateLimited) as info:
+        limiter.check(MOBILE)
+    assert info.value.retry_after == 1
+
+    clock.now += 0.5
+    limiter.check(MOBILE)
+
+
+def test_clients_have_independent_buckets(monkeypatch):
+    monkeypatch.setenv("GATEWAY_RATE_MOBILE_APP", "1,1")
+    limiter = RateLimiter(LocalStore(), Clock())
+
+    limiter.check(MOBILE)
+    with pytest.raises(RateLimited):
+        limiter.check(MOBILE)
+    limiter.check(CSR)
+
+
+def test_per_user_limit_applies_within_a_client():
+    limiter = RateLimiter(LocalStore(), Clock())
+    alice = {"client_name": "mobile-app", "user_id": "U1", "roles": ["CUSTOMER"]}
+    bob = {"client_name": "mobile-app", "user_id": "U2", "roles": ["CUSTOMER"]}
+
+    for _ in range(5):
+        limiter.check(alice)
+    with pytest.raises(RateLimited, match="user:U1"):
+        limiter.check(alice)
+    limiter.check(bob)
+
+
+def test_throttled_user_does_not_drain_client_bucket(monkeypatch):
+    monkeypatch.setenv("GATEWAY_RATE_MOBILE_APP", "0.001,7")
+    limiter = RateLimiter(LocalStore(), Clock())
+    alice = {"client_name": "mobile-app", "user_id": "U1", "roles": ["CUSTOMER"]}
+    bob = {"client_name": "mobile-app", "user_id": "U2", "roles": ["CUSTOMER"]}
+
+    for _ in range(5):
+        limiter.check(alice)
+    for _ in range(20):
+        with pytest.raises(RateLimited, match="user:U1"):
+            limiter.check(alice)
+    # 7 - 5 client tokens left for everyone else
+    limiter.check(bob)
+    limiter.check(bob)
+    with pytest.raises(RateLimited, match="client:mobile-app"):
+        limiter.check(bob)
+
+
+def test_local_store_expires_idle_buckets_and_old_counters():
+    clock = Clock()
+    store = LocalStore()
+    limiter = RateLimiter(store, clock)
+
+    for user in range(100):
+        caller = {"client_name": "mobile-app", "user_id": f"U{user}", "roles": ["CUSTOMER"]}
+        limiter.check(caller)
+        limiter.charge(caller, 10)
+        clock.now += 0.1
+    assert len(store) > 200
+
+    # Next day: every bucket has refilled and yesterday's counters expired
+    clock.now += 86400 + LocalStore.SWEEP_INTERVAL_S
+    limiter.check(MOBILE)
+    assert len(store) == 1
+
+
+def test_daily_quota_blocks_until_midnight(monkeypatch):
+    monkeypatch.setenv("GATEWAY_QUOTA_MOBILE_APP", "1000")
+    clock = Clock()
+    limiter = RateLimiter(LocalStore(), clock)
+
+    limiter.charge(MOBILE, 1200)
+    with pytest.raises(RateLimited, match="quota") as info:
+        limiter.check(MOBILE)
+    assert 0 < info.value.retry_after <= 86400
+
+    usage = limiter.usage(MOBILE)["client:mobile-app"]
+    assert usage["llm_tokens_used"] == 1200
+    assert usage["llm_tokens_remaining"] == 0
+
+    clock.now += info.value.retry_after + 1
+    limiter.check(MOBILE)
+
+
+def test_identify_caller_maps_jwt_roles_to_clients():
+    caller = identify_caller(None, f"Bearer {generate_jwt('U42', 'CUSTOMER')}")
+
+    assert caller["client_name"] == "mobile-app"
+    assert caller["user_id"] == "U42"
+    assert identify_caller("CSR_KEY_67890")["client_name"] == "csr-portal"
+
+
+def test_meter_counts_llm_tokens_across_the_llm_loop():
+    from ai_service.call_policy import CallPolicy
+
+    class LLM:
+        model_name = "gpt-4o-mini"
+
+        async def ainvoke(self, prompt):
+            return AIMessage(content="ok", usage_metadata={
+                "input_tokens": 30, "output_tokens": 12, "total_tokens": 42
+            })
+
+    with meter_llm_usage() as usage:
+        CallPolicy("test", [LLM()]).invoke("prompt")
+
+    assert usage == {"prompt_tokens": 30, "completion_tokens": 12}
+
+
+def test_chat_charges_quota_and_returns_429(monkeypatch):
+    from api_gateway import routes
+
+    limiter = RateLimiter(LocalStore())
+    monkeypatch.setattr(admission_module, "rate_limiter", limiter)
+    monkeypatch.setattr(routes, "rate_limiter", limiter)
+    monkeypatch.setenv("GATEWAY_QUOTA_CSR_PORTAL", "100")
+
+    def workflow(payload):
+        with span("gpt-4o-mini", "llm") as llm_span:
+            record_llm_usage(llm_span, AIMessage(content="ok", usage_metadata={
+                "input_tokens": 90, "output_tokens": 20, "total_tokens": 110
+            }), "gpt-4o-mini")
+        return {"result": "ok"}
+
+    monkeypatch.setattr(routes.agent_executor, "invoke", workflow)
+    client = TestClient(routes.app)
+    headers = {"X-API-Key": "CSR_KEY_67890"}
+
+    assert client.post("/chat", json=CHAT, headers=headers).status_code == 200
+    blocked = client.post("/chat", json=CHAT, headers=headers)
+    usage = client.get("/usage", headers=headers).json()
+
+    assert blocked.status_code == 429
+    assert "Retry-After" in blocked.headers
+    assert usage["client_name"] == "csr-portal"
+    assert usage["client:csr-portal"]["llm_tokens_used"] == 110
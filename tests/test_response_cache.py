@@ -0,0 +1,92 @@
+"""
+Tests for the read-through commerce response cache.
+"""
+
+import asyncio
+import time
+
+from integration.response_cache import LocalBackend, ReadThroughCache
+
+
+def make_cache(ttl=60.0, swr=60.0, max_entries=100):
+    return ReadThroughCache(LocalBackend(max_entries), ttls={"product": (ttl, swr)})
+
+
+def test_fresh_entries_are_served_without_calling_backend():
+    cache = make_cache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"sku": "SKU1001"}
+
+    assert cache.get_or_load("product", "k", loader) == {"sku": "SKU1001"}
+    assert cache.get_or_load("product", "k", loader) == {"sku": "SKU1001"}
+    assert len(calls) == 1
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    cache = make_cache(ttl=0.0, swr=60.0)
+    versions = iter([{"v": 1}, {"v": 2}])
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return next(versions)
+
+    assert cache.get_or_load("product", "k", loader) == {"v": 1}
+    # Both stale reads return immediately; only one refresh is started
+    assert cache.get_or_load("product", "k", loader) == {"v": 1}
+    assert cache.get_or_load("product", "k", loader) == {"v": 1}
+    cache._executor.shutdown(wait=True)
+    assert len(calls) == 2
+    assert cache.backend.get("k")["value"] == {"v": 2}
+
+
+def test_not_found_is_cached_but_other_errors_are_not():
+    cache = make_cache()
+    calls = []
+
+    def not_found():
+        calls.append("404")
+        return {"error": "404 Not Found", "status": 404, "url": "u"}
+
+    def timeout():
+        calls.append("timeout")
+        return {"error": "Timeout", "url": "u"}
+
+    cache.get_or_load("product", "missing", not_found)
+    cache.get_or_load("product", "missing", not_found)
+    cache.get_or_load("product", "slow", timeout)
+    cache.get_or_load("product", "slow", timeout)
+    assert calls == ["404", "timeout", "timeout"]
+
+
+def test_local_backend_evicts_least_recently_used():
+    cache = make_cache(max_entries=2)
+    for key in ("a", "b"):
+        cache.get_or_load("product", key, lambda: {"k": key})
+    cache.get_or_load("product", "a", lambda: None)   # touch "a"
+    cache.get_or_load("product", "c", lambda: {"k": "c"})
+
+    assert len(cache.backend) == 2
+    assert cache.backend.get("b") is None
+    assert cache.backend.get("a") is not None
+
+
+def test_async_path_refreshes_in_background():
+    cache = make_cache(ttl=0.0, swr=60.0)
+    versions = iter([{"v": 1}, {"v": 2}])
+
+    async def loader():
+        return next(versions)
+
+    async def scenario():
+        first = await cache.aget_or_load("product", "k", loader)
+        stale = await cache.aget_or_load("product", "k", loader)
+        await asyncio.gather(*cache._tasks)
+        return first, stale
+
+    assert asyncio.run(scenario()) == ({"v": 1}, {"v": 1})
+    assert cache.backend.get("k")["value"] == {"v": 2}
@@ -0,0 +1,105 @@
+"""
+Tests for the local commerce-service simulator.
+"""
+
+import asyncio
+import random
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import integration.async_commerce_client as async_client
+from integration.async_commerce_client import AsyncCommerceClient
+from integration.circuit_breaker import reset_breakers
+from integration.response_cache import LocalBackend, ReadThroughCache
+from simulator.dataset import CommerceDataset
+from simulator.faults import FaultInjector, sample_latency_ms
+from simulator.server import create_app
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    return CommerceDataset.from_files("data", products=500, customers=50, orders=1000)
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(monkeypatch):
+    monkeypatch.setattr(async_client, "response_cache", ReadThroughCache(LocalBackend()))
+    reset_breakers()
+
+
+def test_synthetic_scale_up_is_deterministic(dataset):
+    again = CommerceDataset.from_files("data", products=500, customers=50, orders=1000)
+    assert len(dataset.products) == 503
+    assert dataset.orders["ORD100042"] == again.orders["ORD100042"]
+    assert "ORD1001" in dataset.orders
+    assert any(key[0].startswith("B2B1") for key in dataset.contracts)
+
+
+def test_serves_every_client_endpoint(dataset):
+    app = create_app(dataset, FaultInjector())
+    order = next(o for o in dataset.orders.values() if o.get("tracking_number"))
+
+    async def scenario():
+        client = AsyncCommerceClient("http://sim", transport=httpx.ASGITransport(app=app))
+        results = await asyncio.gather(
+            client.fetch_product_by_sku("SKU1001"),
+            client.search_catalog("headphones"),
+            client.fetch_order("ORD1001"),
+            client.fetch_order_items("ORD1001"),
+            client.fetch_order_exceptions("ORD1002"),
+            client.fetch_price("B2B999", "SKU1001"),
+            client.fetch_bulk_pricing("SKU1001", 10),
+            client.fetch_inventory("SKU1001"),
+            client.fetch_shipping_eta(order["tracking_number"]),
+            client.load_product("SKU1002"),
+            client.fetch_product_by_sku("SKU0"),
+        )
+        await client.aclose()
+        return results
+
+    (product, search, fetched, items, exceptions, price,
+     bulk_price, inventory, eta, loaded, missing) = asyncio.run(scenario())
+    assert product["name"] == "Noise Cancelling Headphones"
+    assert any(p["sku"] == "SKU1001" for p in search["results"])
+    assert fetched["order_id"] == "ORD1001"
+    assert items["items"][0]["sku"] == "SKU1001"
+    assert exceptions["exceptions"][0]["type"] == "DELAYED"
+    assert price["status"] == 404
+    assert bulk_price["discount_percent"] == 15
+    assert inventory["sku"] == "SKU1001"
+    assert eta["order_id"] == order["order_id"]
+    assert loaded["sku"] == "SKU1002"
+    assert missing["status"] == 404
+
+
+def test_cancellation_respects_order_status(dataset):
+    client = TestClient(create_app(dataset, FaultInjector()))
+    placed = next(i for i, o in dataset.orders.items() if o["status"] == "ORDER_PLACED")
+    delivered = next(i for i, o in dataset.orders.items() if o["status"] == "DELIVERED")
+
+    response = client.post("/oms/orders/cancel/bulk", json={"order_ids": [placed, delivered]})
+    assert response.json() == {"cancelled": [placed], "rejected": [delivered]}
+    assert client.post(f"/oms/order/{placed}/cancel").status_code == 409
+
+
+def test_injected_errors_and_stats(dataset):
+    faults = FaultInjector({"*": {}, "inventory": {"error_rate": 1.0, "error_status": 503}}, seed=1)
+    client = TestClient(create_app(dataset, faults))
+
+    assert client.get("/inventory/SKU1001").status_code == 503
+    assert client.get("/catalog/product/SKU1001").status_code == 200
+    stats = client.get("/_sim/stats").json()["endpoints"]
+    assert stats["inventory.sku"] == {"requests": 1, "errors": 1, "timeouts": 0}
+
+    client.put("/_sim/faults", json={"*": {}})
+    assert client.get("/inventory/SKU1001").status_code == 200
+
+
+def test_lognormal_latency_matches_configured_percentiles():
+    rng = random.Random(3)
+    spec = {"dist": "lognormal", "median": 20, "p99": 200}
+    samples = sorted(sample_latency_ms(spec, rng) for _ in range(20000))
+    assert 18 < samples[10000] < 22
+    assert 170 < samples[19800] < 235
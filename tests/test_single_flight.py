@@ -0,0 +1,82 @@
+"""
+Tests for single-flight request coalescing.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from integration.async_commerce_client import AsyncCommerceClient
+from integration.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_sync_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    gate = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        gate.wait()
+        return {"order_id": "ORD1001"}
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(flight.do, "ORD1001", fetch) for _ in range(8)]
+        while flight.in_flight() == 0:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        gate.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert all(r == {"order_id": "ORD1001"} for r in results)
+    assert flight.in_flight() == 0
+
+
+def test_sync_error_is_shared_and_key_released():
+    flight = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flight.do("k", lambda: (_ for _ in ()).throw(RuntimeError("down")))
+    assert flight.do("k", lambda: "ok") == "ok"
+
+
+def test_async_callers_share_one_call_and_survive_cancellation():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "eta"
+
+    async def scenario():
+        first = asyncio.ensure_future(flight.do("T1", fetch))
+        others = [asyncio.ensure_future(flight.do("T1", fetch)) for _ in range(5)]
+        await asyncio.sleep(0)
+        first.cancel()
+        return await asyncio.gather(*others)
+
+    assert asyncio.run(scenario()) == ["eta"] * 5
+    assert len(calls) == 1
+
+
+def test_async_client_coalesces_identical_gets():
+    hits = []
+
+    async def handler(request):
+        hits.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"order_id": "ORD7"})
+
+    async def scenario():
+        client = AsyncCommerceClient("http://commerce.test", transport=httpx.MockTransport(handler))
+        results = await asyncio.gather(*(client.fetch_order("ORD7") for _ in range(20)))
+        await client.aclose()
+        return results
+
+    assert all(r == {"order_id": "ORD7"} for r in asyncio.run(scenario()))
+    assert hits == ["/oms/order/ORD7"]
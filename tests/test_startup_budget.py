@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+from service.lazy import lazy_import
+from service.startup import (
+    ENTRYPOINTS, HEAVY_MODULES, IMPORT_BUDGET_S, _child_env, import_breakdown, parse_importtime
+)
+
+
+def test_lazy_import_defers_until_use():
+    dumps = lazy_import("json", "dumps")
+    assert not dumps.loaded
+    assert dumps({"a": 1}) == '{"a": 1}'
+    assert dumps.loaded
+
+
+def test_lazy_import_attributes_shadow_target():
+    decoder = lazy_import("json", "JSONDecoder")
+    decoder.decode = lambda self, s: "patched"
+    assert decoder.decode(None, "{}") == "patched"
+    assert not decoder.loaded
+
+
+def test_lazy_import_can_stand_in_for_a_factory_result():
+    decoder = lazy_import("json", "JSONDecoder", call=True)
+    assert not decoder.loaded
+    assert decoder.decode('{"a": 1}') == {"a": 1}
+    assert decoder.resolve() is decoder.resolve()
+
+
+def test_parse_importtime():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |   _io",
+        "import time:       300 |       5000 | api_gateway.routes",
+    ])
+    assert parse_importtime(output) == [("_io", 120, 120, 1), ("api_gateway.routes", 300, 5000, 0)]
+
+
+def test_entrypoints_do_not_import_heavy_modules():
+    code = (
+        "import sys\n"
+        f"for m in {ENTRYPOINTS!r}: __import__(m)\n"
+        f"print(','.join(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=_child_env()
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_service_import_within_budget():
+    report = import_breakdown("service.app")
+    assert report["heavy_loaded"] == []
+    assert report["total_s"] <= IMPORT_BUDGET_S, report["slowest"]
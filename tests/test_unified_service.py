@@ -0,0 +1,139 @@
+"""
+Tests for the unified single-process service:
+- Both routers mounted on one app
+- Lifespan warm-up runs once and tolerates failing resources
+- Graceful drain sheds new work and flips /health to 503
+"""
+
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from api_gateway import admission as admission_module
+from api_gateway import routes
+from api_gateway.admission import AdmissionController
+from service import app as service_app
+
+CHAT = {"user_query": "Where is my order ORD1001?"}
+
+
+def isolated_admission(monkeypatch):
+    controller = AdmissionController(max_in_flight=2, max_queue=2)
+    for module in (admission_module, routes, service_app):
+        monkeypatch.setattr(module, "admission", controller)
+    return controller
+
+
+def test_unified_app_serves_gateway_and_rag_routes(monkeypatch):
+    isolated_admission(monkeypatch)
+    calls = []
+    monkeypatch.setattr(service_app, "WARMUPS", [])
+    app = service_app.create_app()
+    paths = set(app.openapi()["paths"])
+
+    assert {"/chat", "/ask", "/health", "/quote", "/prompts/tokens"} <= paths
+
+    monkeypatch.setattr(routes.agent_executor, "invoke", lambda payload: calls.append(payload) or {"ok": True})
+    with TestClient(app) as client:
+        assert client.post("/chat", json={"user_query": "hi"}).json() == {"ok": True}
+    assert calls == [{"user_query": "hi", "customer_id": None}]
+
+
+def test_chat_runs_the_multi_agent_graph(monkeypatch):
+    from agent_service import agent_graph
+    from observability.tracer import TracedGraph
+
+    isolated_admission(monkeypatch)
+    monkeypatch.setattr(service_app, "WARMUPS", [])
+    # Keyword intent instead of an LLM call; the bulk handler is the graph's own node target
+    monkeypatch.setattr(agent_graph.llm_policy, "tiers", [])
+    monkeypatch.setattr(agent_graph, "handle_bulk_cancellation", lambda ids: {"cancelled": ids})
+
+    with TestClient(service_app.create_app(), headers={"X-API-Key": "AI_INTERNAL_KEY_12345"}) as client:
+        response = client.post("/chat", json={"user_query": "cancel ORD1 and ORD2", "customer_id": "B2B001"})
+        assert client.post("/chat", json={"query": "cancel ORD1"}).status_code == 422
+
+    body = response.json()
+    assert body["intent"] == "order_cancellation"
+    assert body["customer_id"] == "B2B001"
+    assert body["result"] == {"cancelled": ["ORD1", "ORD2"]}
+    assert isinstance(routes.agent_executor.resolve(), TracedGraph)
+
+
+def test_warm_up_reports_failures_without_raising():
+    def broken():
+        raise RuntimeError("no index")
+
+    results = service_app.warm_up([("ok", lambda: None), ("rag", broken)])
+
+    assert isinstance(results["ok"], float)
+    assert results["rag"].startswith("failed: RuntimeError")
+
+
+def test_shutdown_drains_in_flight_work(monkeypatch):
+    controller = isolated_admission(monkeypatch)
+    monkeypatch.setattr(service_app, "WARMUPS", [])
+
+    async def scenario():
+        await controller.acquire("csr")
+        drain = asyncio.create_task(service_app.drain(timeout_s=2))
+        await asyncio.sleep(0.05)
+        assert not drain.done()
+        controller.release()
+        return await drain
+
+    assert asyncio.run(scenario()) is True
+    assert controller.draining
+
+    client = TestClient(service_app.create_app())
+    assert client.get("/health").status_code == 503
+    assert client.post("/chat", json=CHAT).status_code == 503
+
+
+def test_sigterm_drains_before_listener_closes(monkeypatch):
+    import signal
+    import socket
+    import threading
+    import time
+
+    import httpx
+    import uvicorn
+
+    from service.server import draining_server
+
+    controller = isolated_admission(monkeypatch)
+    monkeypatch.setattr(service_app, "WARMUPS", [])
+    release = threading.Event()
+    monkeypatch.setattr(routes.agent_executor, "invoke", lambda payload: release.wait(5) and {"ok": True})
+
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    base = f"http://127.0.0.1:{sock.getsockname()[1]}"
+    server = draining_server(uvicorn.Config(service_app.create_app(), log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    with httpx.Client(base_url=base, timeout=5) as client:
+        while not server.started:
+            time.sleep(0.01)
+        headers = {"x-api-key": "AI_INTERNAL_KEY_12345"}
+        responses = []
+        chat = threading.Thread(
+            target=lambda: responses.append(client.post("/chat", json=CHAT, headers=headers))
+        )
+        chat.start()
+        while not controller.in_flight:
+            time.sleep(0.01)
+
+        server.handle_exit(signal.SIGTERM, None)
+
+        # Listener still open: load balancers see 503, new work is shed
+        assert client.get("/health").status_code == 503
+        assert client.post("/chat", json=CHAT, headers=headers).status_code == 503
+        assert not server.should_exit
+
+        release.set()
+        chat.join(5)
+        thread.join(5)
+
+    assert responses[0].status_code == 200 and responses[0].json() == {"ok": True}
+    assert not thread.is_alive()